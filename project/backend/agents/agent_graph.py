@@ -1,35 +1,43 @@
 """
 LangGraph를 사용한 에이전트 그래프 구현
 """
+import uuid
 import asyncio
-from typing import Dict, Any, List, Optional, TypedDict, Callable, Awaitable
+import contextlib
+from typing import Dict, Any, Optional, AsyncIterator
 from loguru import logger
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from backend.agents.base_agent import BaseAgent
 from backend.agents.supervisor_agent import SupervisorAgent
 from backend.agents.planning_agent import PlanningAgent
 from backend.agents.code_generation_agent import CodeGenerationAgent
-
-# 상태 타입 정의
-class AgentState(TypedDict, total=False):
-    user_request: str
-    task: Optional[str]
-    analysis: Optional[Dict[str, Any]]
-    plan: Optional[str]
-    generated_code: Optional[Dict[str, Any]]
-    results: Optional[Dict[str, Any]]
-    error: Optional[str]
-    save_path: Optional[str]
+from backend.agents.graph_state import AgentState, NodeExecutionError, build_initial_state, next_allocated_agent
+from backend.agents.graph_run import cancellable, cancel_pending_nodes, collect, stream_run
+from backend.utils.streaming import StreamEmitter, node_scope, emit_event
+from backend.utils.metrics import RequestStats, current_request_stats, metrics
+from backend.utils.checkpoint_store import SQLiteCheckpointSaver
+from backend.utils.deadline import DeadlineExceeded, deadline_after, deadline_scope, loop_deadline
+from backend.config.settings import (
+    REQUEST_DEADLINE_SECONDS,
+    SPECULATIVE_PLANNING,
+    CHECKPOINT_ENABLED,
+    CHECKPOINT_PATH,
+    CHECKPOINT_MAX_AGE_SECONDS
+)
 
 class AgentGraph:
     """
     LangGraph를 사용한 에이전트 그래프
     """
     
-    def __init__(self):
+    def __init__(self, checkpointer: Optional[BaseCheckpointSaver] = None):
         """
         에이전트 그래프 초기화
+        
+        Args:
+            checkpointer: 체크포인트 저장소 (없으면 설정에 따라 SQLite 저장소 생성)
         """
         self.supervisor = SupervisorAgent()
         self.planning_agent = PlanningAgent()
@@ -39,6 +47,11 @@ class AgentGraph:
         self.supervisor.register_agent("planning", self.planning_agent)
         self.supervisor.register_agent("code_generation", self.code_generation_agent)
         
+        # 실행 ID(thread_id)별 단계 상태 저장소
+        if checkpointer is None and CHECKPOINT_ENABLED:
+            checkpointer = SQLiteCheckpointSaver(db_path=CHECKPOINT_PATH, max_age_seconds=CHECKPOINT_MAX_AGE_SECONDS)
+        self.checkpointer = checkpointer
+        
         # 그래프 생성
         self.graph = self._build_graph()
         
@@ -55,30 +68,36 @@ class AgentGraph:
         builder = StateGraph(AgentState)
         
         # 노드 추가
-        builder.add_node("supervisor", self._run_supervisor)
-        builder.add_node("planning", self._run_planning)
-        builder.add_node("code_generation", self._run_code_generation)
+        builder.add_node("supervisor", cancellable(self._run_supervisor))
+        builder.add_node("planning", cancellable(self._run_planning))
+        builder.add_node("code_generation", cancellable(self._run_code_generation))
         
         # 에지 추가
-        # 슈퍼바이저에서 planning으로 조건부 라우팅
+        # 슈퍼바이저의 작업 할당에 따라 조건부 라우팅 (할당된 에이전트만 한 번씩 실행)
         builder.add_conditional_edges(
             "supervisor",
             self._route_to_agents,
             {
                 "planning": "planning", 
+                "code_generation": "code_generation",
+                "end": END
+            }
+        )
+        builder.add_conditional_edges(
+            "planning",
+            self._route_after_planning,
+            {
+                "code_generation": "code_generation",
                 "end": END
             }
         )
-        
-        # 일반 에지 추가
-        builder.add_edge("planning", "code_generation")
         builder.add_edge("code_generation", END)
         
         # 시작 노드 설정 - 이전 버전에서는 entry_point
         builder.set_entry_point("supervisor")
         
-        # 이전 버전 langgraph와 호환되도록 명시적으로 컴파일
-        graph = builder.compile()
+        # 이전 버전 langgraph와 호환되도록 명시적으로 컴파일 (단계마다 체크포인트 저장)
+        graph = builder.compile(checkpointer=self.checkpointer)
         
         return graph
     
@@ -90,20 +109,92 @@ class AgentGraph:
             state: 현재 상태
             
         Returns:
-            업데이트된 상태
+            상태 업데이트 (변경된 필드)
+            
+        Raises:
+            NodeExecutionError: 요청 분석 실패 시
         """
         logger.info("슈퍼바이저 에이전트 실행")
+        # 계획 수립은 task만 읽으므로 슈퍼바이저 분석과 동시에 추측 실행
+        speculation = None
+        speculative_stats = RequestStats()
+        plan = None
+        if SPECULATIVE_PLANNING and state.get("task") and not state.get("speculative_plan"):
+            speculation = asyncio.create_task(self._speculate_planning(state, speculative_stats))
+        
         try:
-            result = await self.supervisor.process(state)
+            async with node_scope("supervisor"):
+                result = await self.supervisor.process(state)
+                if result["status"] != "success":
+                    raise NodeExecutionError("supervisor", result.get("message", "요청 분석 실패"))
+                
+                # 변경된 필드만 반환 (LangGraph가 상태에 병합)
+                update: AgentState = {
+                    "analysis": result.get("analysis", {}),
+                    "task_allocation": result.get("task_allocation", {}),
+                    "route": result.get("route"),
+                    "answer": result.get("answer")
+                }
             
-            # 상태 업데이트
-            new_state = state.copy()
-            new_state["analysis"] = result.get("analysis", {})
+            if speculation is not None:
+                plan = update["speculative_plan"] = await self._commit_speculation(speculation, {**state, **update})
+            return update
+        finally:
+            if speculation is not None:
+                if not speculation.done():
+                    speculation.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await speculation
+                # Reason: 폐기된 추측 호출은 요청 예산과 llm_calls에서 빼고 speculative_llm_calls로만 보고
+                stats = current_request_stats.get()
+                if stats is not None:
+                    stats.merge(speculative_stats, wasted=plan is None)
+    
+    async def _speculate_planning(self, state: AgentState, stats: RequestStats) -> Dict[str, Any]:
+        """
+        슈퍼바이저 분석과 동시에 계획 수립 실행
+        
+        Args:
+            state: 슈퍼바이저 입력 상태
+            stats: 추측 실행 전용 통계 (확정될 때만 요청 통계에 합산)
+            
+        Returns:
+            계획 수립 결과
+        """
+        current_request_stats.set(stats)
+        async with node_scope("planning:speculative"):
+            return await self.planning_agent.process(state)
+    
+    async def _commit_speculation(self, speculation: "asyncio.Task", state: AgentState) -> Optional[Dict[str, Any]]:
+        """
+        슈퍼바이저 라우팅과 비교하여 추측 실행한 계획을 확정하거나 폐기
+        
+        Args:
+            speculation: 추측 실행 중인 계획 수립 태스크
+            state: 슈퍼바이저 결과가 병합된 상태
             
-            return new_state
+        Returns:
+            확정된 계획 수립 결과 (폐기되거나 실패하면 None)
+        """
+        allocation = (state.get("task_allocation") or {}).get("planning", {})
+        if self._route_to_agents(state) != "planning" or allocation.get("task", state.get("task")) != state.get("task"):
+            # 라우팅이 다르면 결과를 기다리지 않고 취소 (호출자의 finally에서 정리)
+            logger.info("추측 실행한 계획 수립 폐기: 슈퍼바이저 라우팅 불일치")
+            metrics.increment("speculative_planning", outcome="aborted")
+            return None
+        
+        try:
+            result = await speculation
         except Exception as e:
-            logger.error(f"슈퍼바이저 에이전트 실행 오류: {str(e)}")
-            return {**state, "error": f"슈퍼바이저 에이전트 오류: {str(e)}"}
+            logger.warning(f"추측 실행한 계획 수립 실패, 계획 수립 노드에서 다시 실행: {str(e)}")
+            result = {"status": "error"}
+        if result.get("status") != "success":
+            metrics.increment("speculative_planning", outcome="failed")
+            return None
+        
+        logger.info("추측 실행한 계획 수립 확정")
+        metrics.increment("speculative_planning", outcome="committed")
+        return result
     
     async def _run_planning(self, state: AgentState) -> AgentState:
         """
@@ -113,23 +204,25 @@ class AgentGraph:
             state: 현재 상태
             
         Returns:
-            업데이트된 상태
+            상태 업데이트 (변경된 필드)
+            
+        Raises:
+            NodeExecutionError: 계획 수립 실패 시
         """
         logger.info("계획 수립 에이전트 실행")
-        try:
-            result = await self.planning_agent.process(state)
+        async with node_scope("planning"):
+            # 슈퍼바이저 단계에서 확정된 추측 실행 결과가 있으면 재사용
+            result = state.get("speculative_plan") or await self.planning_agent.process(state)
+            if result["status"] != "success":
+                raise NodeExecutionError("planning", result.get("message", "계획 수립 실패"))
             
-            # 상태 업데이트
-            new_state = state.copy()
-            if result["status"] == "success":
-                new_state["plan"] = result.get("plan", "")
-            else:
-                new_state["error"] = result.get("message", "계획 수립 실패")
-            
-            return new_state
-        except Exception as e:
-            logger.error(f"계획 수립 에이전트 실행 오류: {str(e)}")
-            return {**state, "error": f"계획 수립 에이전트 오류: {str(e)}"}
+            # 변경된 필드만 반환 (LangGraph가 상태에 병합)
+            return {
+                "agent_results": {**(state.get("agent_results") or {}), "planning": result},
+                "plan": result.get("plan", ""),
+                "target_files": result.get("target_files", []),
+                "speculative_plan": None
+            }
     
     async def _run_code_generation(self, state: AgentState) -> AgentState:
         """
@@ -139,153 +232,268 @@ class AgentGraph:
             state: 현재 상태
             
         Returns:
-            업데이트된 상태
+            상태 업데이트 (변경된 필드)
+            
+        Raises:
+            NodeExecutionError: 코드 생성 실패 시 (일부 파일만 실패한 partial_success는 완료로 처리)
+            DeadlineExceeded: 처리 기한 안에 파일을 하나도 생성하지 못한 경우
         """
         logger.info("코드 생성 에이전트 실행")
-        try:
+        async with node_scope("code_generation"):
             result = await self.code_generation_agent.process(state)
+            if result.get("timed_out") and result["status"] == "error":
+                raise DeadlineExceeded(result.get("message", "처리 기한 초과"))
+            if result["status"] not in ["success", "partial_success"]:
+                raise NodeExecutionError("code_generation", result.get("message", "코드 생성 실패"))
             
-            # 상태 업데이트
-            new_state = state.copy()
-            if result["status"] in ["success", "partial_success"]:
-                new_state["generated_code"] = result.get("generated_code", {})
-                new_state["results"] = result
-            else:
-                new_state["error"] = result.get("message", "코드 생성 실패")
-            
-            return new_state
-        except Exception as e:
-            logger.error(f"코드 생성 에이전트 실행 오류: {str(e)}")
-            return {**state, "error": f"코드 생성 에이전트 오류: {str(e)}"}
+            # 변경된 필드만 반환 (LangGraph가 상태에 병합)
+            return {
+                "agent_results": {**(state.get("agent_results") or {}), "code_generation": result},
+                "generated_code": result.get("generated_code", {}),
+                "results": result
+            }
     
     def _route_to_agents(self, state: AgentState) -> str:
         """
-        분석 결과에 따라 적절한 에이전트로 라우팅
+        슈퍼바이저의 작업 할당에 따라 첫 번째 에이전트로 라우팅 (direct_answer는 바로 종료)
         
         Args:
             state: 현재 상태
             
         Returns:
-            다음 노드 이름 ("planning" 또는 "end")
+            다음 노드 이름 ("planning", "code_generation" 또는 "end")
         """
-        # 오류 발생 시 종료
-        if "error" in state and state["error"]:
-            logger.error(f"오류로 인한 처리 종료: {state['error']}")
-            return "end"
+        return next_allocated_agent(state)
+    
+    def _route_after_planning(self, state: AgentState) -> str:
+        """
+        계획 수립 이후 라우팅
         
-        # 단순화된 라우팅 로직 (실제 구현에서는 분석 결과에 따라 결정)
-        # 여기서는 항상 계획 수립 에이전트부터 시작
-        return "planning"
+        Args:
+            state: 현재 상태
+            
+        Returns:
+            다음 노드 이름 ("code_generation" 또는 "end")
+        """
+        return next_allocated_agent(state, after="planning")
     
-    async def run(self, user_request: str, save_path: str = None) -> Dict[str, Any]:
+    async def run(
+        self,
+        user_request: str,
+        save_path: str = None,
+        emitter: Optional[StreamEmitter] = None,
+        run_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         사용자 요청으로 에이전트 그래프 실행
         
         Args:
             user_request: 사용자 요청
             save_path: 파일 저장 경로 (선택 사항)
+            emitter: 스트리밍 프레임 송신기 (지정하면 토큰/노드 진행 프레임 전송)
+            run_id: 실행 ID (없으면 새로 생성, 재개 시 사용)
+            deadline_seconds: 처리 시간 예산 (초, 없으면 REQUEST_DEADLINE_SECONDS)
             
         Returns:
             실행 결과
         """
-        logger.info(f"에이전트 그래프 실행 시작: {user_request[:50]}...")
+        frames = self.stream(user_request, save_path, tokens=emitter is not None, run_id=run_id, deadline_seconds=deadline_seconds)
+        return await collect(frames, emitter)
+    
+    async def resume(self, run_id: str, emitter: Optional[StreamEmitter] = None) -> Dict[str, Any]:
+        """
+        체크포인트에서 실행 재개 (완료된 노드는 다시 실행하지 않음)
         
-        # json 형식인지 확인
-        try:
-            import json
-            # JSON 형식이면 파싱 시도
-            if user_request.strip().startswith('{') and user_request.strip().endswith('}'):
-                data = json.loads(user_request)
-                
-                # 실제 요청 추출
-                if 'request' in data:
-                    actual_request = data['request']
-                    
-                    # 저장 경로 추출
-                    if 'save_path' in data and not save_path:
-                        save_path = data['save_path']
-                        logger.info(f"JSON에서 저장 경로 추출: {save_path}")
-                    
-                    user_request = actual_request
-                    logger.info(f"JSON에서 실제 요청 추출: {user_request[:50]}...")
+        Args:
+            run_id: 재개할 실행 ID
+            emitter: 스트리밍 프레임 송신기
             
-        except json.JSONDecodeError:
-            # JSON이 아니라면 패스
-            pass
-        except Exception as e:
-            logger.warning(f"JSON 파싱 오류: {str(e)}")
+        Returns:
+            실행 결과
+        """
+        frames = self.resume_stream(run_id, tokens=emitter is not None)
+        return await collect(frames, emitter)
+    
+    def stream(
+        self,
+        user_request: str,
+        save_path: str = None,
+        tokens: bool = True,
+        run_id: Optional[str] = None,
+        logs: bool = False,
+        deadline_seconds: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        에이전트 그래프를 실행하며 진행 이벤트를 비동기 이터레이터로 반환
+        
+        Args:
+            user_request: 사용자 요청
+            save_path: 파일 저장 경로 (선택 사항)
+            tokens: LLM 토큰 델타 프레임 포함 여부
+            run_id: 실행 ID (없으면 새로 생성)
+            logs: 로그를 발생 즉시 log 프레임으로 전송 (False면 result 프레임의 logs에 모아서 전달)
+            deadline_seconds: 처리 시간 예산 (초, 없으면 REQUEST_DEADLINE_SECONDS)
+            
+        Yields:
+            node_start / token / log / node_update / node_end 프레임, 마지막으로 result 프레임
+        """
+        initial_state = build_initial_state(user_request, save_path, deadline_seconds)
+        return self._stream(run_id or uuid.uuid4().hex, initial_state, tokens, logs)
+    
+    def resume_stream(self, run_id: str, tokens: bool = True, logs: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        체크포인트에서 실행을 재개하며 진행 이벤트를 비동기 이터레이터로 반환
+        
+        Args:
+            run_id: 재개할 실행 ID
+            tokens: LLM 토큰 델타 프레임 포함 여부
+            logs: 로그 실시간 전송 여부
+            
+        Yields:
+            stream과 동일한 프레임
+        """
+        return self._stream(run_id, None, tokens, logs)
+    
+    def get_run_state(self, run_id: str) -> Optional[AgentState]:
+        """
+        실행 ID의 마지막 체크포인트 상태 조회
+        
+        Args:
+            run_id: 실행 ID
+            
+        Returns:
+            마지막으로 완료된 단계까지의 상태 (체크포인트가 없으면 None)
+        """
+        if self.checkpointer is None:
+            return None
+        checkpoint = self.checkpointer.get({"configurable": {"thread_id": run_id}})
+        if checkpoint is None:
+            return None
+        # 채널 중 상태 필드만 추출 (노드 inbox 등 내부 채널 제외)
+        return {k: v for k, v in checkpoint["channel_values"].items() if k in AgentState.__annotations__}
+    
+    def _stream(
+        self,
+        run_id: str,
+        initial_state: Optional[AgentState],
+        tokens: bool,
+        logs: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        그래프 실행 태스크를 띄우고 진행 프레임을 비동기 이터레이터로 반환
+
+        Args:
+            run_id: 실행 ID
+            initial_state: 초기 상태 (None이면 체크포인트에서 재개)
+            tokens: LLM 토큰 델타 프레임 포함 여부
+            logs: 로그 실시간 전송 여부
+
+        Returns:
+            진행 프레임 이터레이터 (마지막은 result 프레임)
+        """
+        return stream_run(self._execute, run_id, initial_state, tokens, logs)
+    
+    async def _execute(self, run_id: str, initial_state: Optional[AgentState] = None) -> Dict[str, Any]:
+        """
+        에이전트 그래프 실행 본체 (현재 이벤트 루프에서 astream으로 실행)
         
-        # 초기 상태 생성
-        initial_state: AgentState = {
-            "user_request": user_request,
-            "task": user_request,  # 태스크로도 설정
-        }
+        Args:
+            run_id: 실행 ID (체크포인트 thread_id)
+            initial_state: 초기 상태 (None이면 체크포인트에서 재개)
+            
+        Returns:
+            실행 결과
+        """
+        config = {"configurable": {"thread_id": run_id}}
         
-        # 저장 경로가 있으면 상태에 추가
-        if save_path:
-            initial_state["save_path"] = save_path
-            logger.info(f"저장 경로를 상태에 추가: {save_path}")
+        # 노드 출력을 누적한 상태 (실패 시에도 이미 완료된 노드 결과는 보존)
+        if initial_state is None:
+            final_state = self.get_run_state(run_id)
+            if final_state is None:
+                return {
+                    "status": "error",
+                    "message": f"재개할 실행 기록을 찾을 수 없습니다: {run_id}",
+                    "state": {}
+                }
+            logger.info(f"에이전트 그래프 실행 재개: {run_id}")
+        else:
+            final_state = dict(initial_state)
+            logger.info(f"에이전트 그래프 실행 시작 ({run_id}): {initial_state['user_request'][:50]}...")
+        
+        # 재개한 실행은 이전 기한이 이미 지났을 수 있으므로 새 기한 부여
+        deadline_at = initial_state.get("deadline_at") if initial_state else deadline_after(REQUEST_DEADLINE_SECONDS)
         
         try:
-            # 그래프 실행
             logger.info("LangGraph 실행 시작")
-            
-            try:
-                # LangGraph 0.0.x 버전에서는 다른 방식으로 호출 시도
-                logger.info("LangGraph 실행 방식 1 시도")
-                final_state = self.graph.invoke(initial_state)
-                logger.info("LangGraph 실행 완료")
-            except Exception as graph_error_1:
-                logger.warning(f"첫 번째 실행 방식 오류: {str(graph_error_1)}")
-                
-                try:
-                    # 대체 실행 방식 시도
-                    logger.info("LangGraph 실행 방식 2 시도 - 직접 노드 실행")
-                    
-                    # 수동으로 그래프 노드 실행
-                    state = initial_state.copy()
-                    state = await self._run_supervisor(state)
-                    
-                    if "error" in state and state["error"]:
-                        final_state = state
-                    else:
-                        next_node = self._route_to_agents(state)
-                        if next_node == "planning":
-                            state = await self._run_planning(state)
-                            if not ("error" in state and state["error"]):
-                                state = await self._run_code_generation(state)
-                        final_state = state
-                    
-                    logger.info("수동 그래프 실행 완료")
-                except Exception as manual_error:
-                    logger.error(f"수동 그래프 실행 오류: {str(manual_error)}")
-                    import traceback
-                    logger.error(f"수동 실행 스택 트레이스: {traceback.format_exc()}")
-                    raise
+            with deadline_scope(deadline_at):
+                async with asyncio.timeout_at(loop_deadline(deadline_at) if deadline_at else None):
+                    async for chunk in self.graph.astream(initial_state, config):
+                        for node, update in chunk.items():
+                            if node == END:
+                                # LangGraph 0.0.x는 마지막에 전체 상태를 __end__ 키로 전달
+                                final_state.update(update or {})
+                                continue
+                            final_state.update(update or {})
+                            await emit_event("node_update", node=node, keys=sorted((update or {}).keys()))
+            logger.info("LangGraph 실행 완료")
             
             logger.debug(f"최종 상태: {final_state}")
             
-            # 결과 처리
-            if "error" in final_state and final_state["error"]:
-                logger.warning(f"에이전트 오류: {final_state['error']}")
+            # 하위 에이전트 결과 통합
+            integrated = await self.supervisor.integrate_results(final_state.get("agent_results") or {}, final_state)
+            
+            # 기한 때문에 일부 파일만 생성한 경우 부분 결과로 표시
+            if (final_state.get("results") or {}).get("timed_out"):
+                logger.warning(f"처리 기한 초과로 일부 결과만 생성 ({run_id})")
                 return {
-                    "status": "error",
-                    "message": final_state["error"],
+                    "status": "partial",
+                    "message": "처리 기한 안에 일부 파일만 생성했습니다.",
+                    "summary": integrated["summary"],
+                    "deadline_exceeded": True,
                     "state": final_state
                 }
             
             logger.info("에이전트 그래프 실행 성공")
+            # 슈퍼바이저가 직접 답변한 질문만 답변을 메시지로 반환
+            answer = final_state.get("answer") if final_state.get("route") == "direct_answer" else None
             return {
                 "status": "success",
-                "message": "작업이 성공적으로 완료되었습니다.",
+                "message": answer or "작업이 성공적으로 완료되었습니다.",
+                "summary": integrated["summary"],
                 "state": final_state
             }
+        except TimeoutError:
+            # 기한 안에 끝나지 않은 노드는 취소하고 완료된 노드까지의 결과 반환 (체크포인트에서 재개 가능)
+            await cancel_pending_nodes()
+            logger.warning(f"요청 처리 기한 초과 ({run_id}), 완료된 단계까지의 결과 반환")
+            metrics.increment("deadline_exceeded")
+            integrated = await self.supervisor.integrate_results(final_state.get("agent_results") or {}, final_state)
+            return {
+                "status": "partial",
+                "message": "처리 기한 안에 완료하지 못해 완료된 단계까지의 결과를 반환합니다.",
+                "summary": integrated["summary"],
+                "deadline_exceeded": True,
+                "resumable": self.checkpointer is not None,
+                "state": final_state
+            }
+        except NodeExecutionError as e:
+            logger.warning(f"에이전트 오류 ({e.node}): {str(e)}")
+            return {
+                "status": "error",
+                "message": str(e),
+                "failed_node": e.node,
+                "resumable": self.checkpointer is not None,
+                "state": {**final_state, "error": str(e)}
+            }
         except Exception as e:
+            # Reason: 수동 재실행 경로를 두면 이미 끝난 LLM 호출이 반복되므로, 완료된 노드 결과만 돌려주고 재개는 체크포인트로 처리
             logger.error(f"에이전트 그래프 실행 오류: {str(e)}")
             import traceback
             logger.error(f"오류 스택 트레이스: {traceback.format_exc()}")
             return {
                 "status": "error",
                 "message": f"에이전트 그래프 실행 중 오류 발생: {str(e)}",
-                "state": initial_state
-            } 
\ No newline at end of file
+                "resumable": self.checkpointer is not None,
+                "state": final_state
+            }
@@ -0,0 +1,246 @@
+"""
+생성 코드 파일 경로 결정
+추출된 코드 블록의 최종 파일명(계획의 파일명, tests/ 정규화, 저장 경로)과 요청 기반 파일명 생성
+"""
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+def prepare_file(
+    file: Dict[str, Any],
+    target_file: Optional[Dict[str, str]] = None,
+    save_path: Optional[str] = None,
+    task: str = ""
+) -> Dict[str, Any]:
+    """
+    추출된 파일의 최종 파일명 결정 (계획의 파일명 → tests/ 정규화 → 저장 경로 적용)
+    
+    Args:
+        file: 추출된 파일 정보 (제자리 수정)
+        target_file: 계획에서 지정한 파일 (있으면 파일명 우선 적용)
+        save_path: 파일 저장 경로
+        task: 작업 설명 (파일명 생성용)
+        
+    Returns:
+        수정된 파일 정보
+    """
+    if target_file:
+        file["filename"] = target_file["filename"]
+    elif not file["filename"]:
+        file["filename"] = "example." + ("vue" if file["language"] == "vue" else "txt")
+    file["filename"] = normalize_filename(file["filename"])
+    
+    if save_path:
+        apply_save_path([file], save_path, task)
+    return file
+
+def fallback_file(generated_code: str) -> Dict[str, Any]:
+    """
+    코드 블록을 찾지 못했을 때 응답 전체를 담은 기본 파일 생성
+    
+    Args:
+        generated_code: 생성된 코드 텍스트
+        
+    Returns:
+        기본 파일 정보
+    """
+    logger.warning("파일 정보 추출 실패, 기본값 사용")
+    return {
+        "filename": "tests/example.vue",
+        "language": "vue",
+        "code": "<!-- 기본 코드 -->\n" + generated_code,
+        "description": "코드 추출 실패로 생성된 기본 파일"
+    }
+
+def normalize_filename(filename: str) -> str:
+    """
+    경로가 없는 파일명에 tests/ 폴더 추가
+    
+    Args:
+        filename: 파일명
+        
+    Returns:
+        정규화된 파일명
+    """
+    if not filename.startswith("/") and "tests/" not in filename and "tests\\" not in filename:
+        if "tests" != filename.split("/")[0]:
+            filename = "tests/" + filename
+    return filename
+
+def apply_save_path(files: List[Dict[str, Any]], save_path: str, task: str) -> None:
+    """
+    저장 경로 지정에 맞게 파일 경로 갱신
+    
+    Args:
+        files: 추출된 파일 목록 (제자리 수정)
+        save_path: 파일 저장 경로
+        task: 작업 설명 (파일명 생성용)
+    """
+    for file in files:
+        filename = file["filename"]
+        # 파일 이름이 없거나 기본값인 경우, 요청 내용에서 추출한 정보 사용
+        if not filename or filename == "tests/example.vue":
+            # 파일 이름 생성
+            file_type = extract_file_type_from_request(task)
+            file_summary = generate_file_summary(task)
+            new_filename = generate_filename(save_path, file_summary, file_type)
+            file["filename"] = new_filename
+            logger.info(f"파일명 생성: {new_filename}")
+        # 절대 경로로 시작하지 않고, 특별한 경로 지정이 없는 경우만 처리
+        elif not filename.startswith("/"):
+            # 이미 경로가 있으면 기존 경로 유지
+            if "/" in filename:
+                # 상대 경로가 있는 경우 확인
+                path_parts = filename.split("/")
+                if path_parts[0] != os.path.basename(save_path):
+                    # 저장 경로와 다른 경우, 저장 경로로 변경
+                    base_filename = os.path.basename(filename)
+                    file["filename"] = f"{os.path.basename(save_path)}/{base_filename}"
+            else:
+                # 상대 경로가 없는 경우
+                file["filename"] = f"{os.path.basename(save_path)}/{filename}"
+            logger.info(f"파일 경로 업데이트: {filename} -> {file['filename']}")
+
+def extract_file_type_from_request(request: str) -> str:
+    """
+    요청 텍스트에서 파일 타입 추출
+    
+    Args:
+        request: 요청 텍스트
+        
+    Returns:
+        파일 타입 (.vue, .js, .html 등)
+    """
+    # 파일 확장자 패턴
+    file_patterns = {
+        r'\b(vue|\.vue)\b': '.vue',
+        r'\b(javascript|js|\.js)\b': '.js',
+        r'\b(typescript|ts|\.ts)\b': '.ts',
+        r'\b(html|\.html)\b': '.html',
+        r'\b(css|\.css)\b': '.css',
+        r'\b(python|py|\.py)\b': '.py',
+        r'\b(react|jsx|\.jsx)\b': '.jsx',
+        r'\b(tsx|\.tsx)\b': '.tsx',
+    }
+    
+    # 요청 텍스트에서 파일 타입 찾기
+    for pattern, ext in file_patterns.items():
+        if re.search(pattern, request.lower()):
+            logger.info(f"요청에서 파일 타입 감지: {ext}")
+            return ext
+    
+    # 기본값은 Vue 파일
+    logger.info("파일 타입을 감지할 수 없어 기본값 사용: .vue")
+    return '.vue'
+
+def generate_file_summary(request: str) -> str:
+    """
+    요청 텍스트에서 파일 내용 요약하여 파일명 생성
+    
+    Args:
+        request: 요청 텍스트
+        
+    Returns:
+        10글자 내외의 파일명
+    """
+    # 특수문자 제거 및 공백을 언더스코어로 변경
+    words = re.sub(r'[^\w\s]', '', request.lower()).split()
+    
+    # 주요 키워드 추출 (예: 버튼, 알림, 로그인 등)
+    keywords = ['button', 'alert', 'login', 'form', 'list', 'table', 'modal', 'menu', '버튼', '알림', '로그인', '폼', '리스트', '테이블', '모달', '메뉴']
+    
+    file_name = ""
+    
+    # 키워드 기반 파일명 생성
+    for keyword in keywords:
+        if keyword in request.lower():
+            if keyword in ['button', '버튼']:
+                file_name = 'Button'
+            elif keyword in ['alert', '알림']:
+                file_name = 'Alert'
+            elif keyword in ['login', '로그인']:
+                file_name = 'Login'
+            elif keyword in ['form', '폼']:
+                file_name = 'Form'
+            elif keyword in ['list', '리스트']:
+                file_name = 'List'
+            elif keyword in ['table', '테이블']:
+                file_name = 'Table'
+            elif keyword in ['modal', '모달']:
+                file_name = 'Modal'
+            elif keyword in ['menu', '메뉴']:
+                file_name = 'Menu'
+            break
+    
+    # 키워드가 없는 경우 단어 조합으로 파일명 생성
+    if not file_name and words:
+        # 중요 단어 (명사) 우선 사용
+        important_words = []
+        for word in words:
+            if len(word) > 2:  # 3글자 이상 단어만 고려
+                important_words.append(word)
+        
+        if important_words:
+            # 첫 번째 중요 단어를 사용하고 첫 글자를 대문자로 변경
+            file_name = important_words[0].capitalize()
+            
+            # 두 번째 중요 단어가 있으면 추가
+            if len(important_words) > 1 and len(file_name) + len(important_words[1]) <= 10:
+                file_name += important_words[1].capitalize()
+        else:
+            # 중요 단어가 없으면 처음 몇 개 단어 사용
+            combined = ''.join([w.capitalize() for w in words[:3] if w])
+            file_name = combined[:10]  # 10글자로 제한
+    
+    # 파일명이 없으면 기본값 사용
+    if not file_name:
+        file_name = "Component"
+    
+    logger.info(f"요청에서 파일명 생성: {file_name}")
+    return file_name
+
+def generate_filename(save_path: str, base_name: str, file_ext: str) -> str:
+    """
+    최종 파일명 생성 (중복 확인 및 처리)
+    
+    Args:
+        save_path: 저장 경로
+        base_name: 기본 파일명
+        file_ext: 파일 확장자
+        
+    Returns:
+        최종 파일명 (경로 포함)
+    """
+    # 경로가 절대 경로인지 확인
+    if os.path.isabs(save_path):
+        base_dir = save_path
+    else:
+        # 상대 경로인 경우 현재 작업 디렉토리 기준으로 처리
+        base_dir = os.path.join(os.getcwd(), save_path)
+    
+    # 기본 파일 경로
+    relative_path = os.path.basename(save_path)
+    file_path = f"{relative_path}/{base_name}{file_ext}"
+    full_path = os.path.join(base_dir, f"{base_name}{file_ext}")
+    
+    # 이미 존재하는 파일인지 확인
+    counter = 1
+    while os.path.exists(full_path):
+        # 파일이 이미 존재하면 숫자 추가
+        new_name = f"{base_name}{counter}{file_ext}"
+        file_path = f"{relative_path}/{new_name}"
+        full_path = os.path.join(base_dir, new_name)
+        counter += 1
+        
+        # 안전장치 (무한루프 방지)
+        if counter > 100:
+            # 타임스탬프를 추가하여 유니크한 파일명 생성
+            timestamp = int(time.time())
+            new_name = f"{base_name}{timestamp}{file_ext}"
+            file_path = f"{relative_path}/{new_name}"
+            break
+    
+    logger.info(f"최종 파일명 생성: {file_path}")
+    return file_path
@@ -3,11 +3,17 @@
 """
 from typing import Dict, Any, List, Optional
 from loguru import logger
-import os
+import asyncio
 
 from backend.agents.base_agent import BaseAgent
-from backend.utils.anthropic_client import anthropic_client
+from backend.utils.anthropic_client import anthropic_client, DeltaHandler
+from backend.utils.streaming import get_token_handler, node_scope
+from backend.utils.deadline import time_budget
+from backend.utils.metrics import metrics
+from backend.config.settings import CODEGEN_MAX_CONCURRENCY, DEADLINE_RESERVE_SECONDS
 from backend.utils.cursor_integration import CursorIntegration
+from backend.utils.code_stream_parser import StreamingCodeExtractor
+from backend.agents.code_files import prepare_file, fallback_file
 
 class CodeGenerationAgent(BaseAgent):
     """
@@ -25,13 +31,23 @@ class CodeGenerationAgent(BaseAgent):
         super().__init__(name)
         self.cursor = cursor_integration or CursorIntegration()
     
-    async def generate_code(self, task: str, plan: Optional[str] = None) -> Dict[str, Any]:
+    async def generate_code(
+        self,
+        task: str,
+        plan: Optional[str] = None,
+        target_file: Optional[Dict[str, str]] = None,
+        all_files: Optional[List[Dict[str, str]]] = None,
+        on_delta: Optional[DeltaHandler] = None
+    ) -> Dict[str, Any]:
         """
         코드 생성
         
         Args:
             task: 수행할 작업 설명
             plan: 계획 (있는 경우)
+            target_file: 이번 호출에서 생성할 파일 (파일별 팬아웃 시)
+            all_files: 계획에 포함된 전체 파일 목록 (파일 간 참조 일관성 유지용)
+            on_delta: 토큰 델타 콜백 (없으면 스트리밍 토큰 핸들러 사용)
             
         Returns:
             생성된 코드
@@ -46,6 +62,21 @@ class CodeGenerationAgent(BaseAgent):
             위 작업과 계획에 따라 코드를 생성해주세요.
             """
         
+        cache_prefix = None
+        if target_file:
+            file_list = "\n".join(f"- {f['filename']}: {f.get('description', '')}" for f in all_files or [target_file])
+            # Reason: 팬아웃된 파일별 호출은 작업/계획/파일 구성이 모두 같으므로 이 부분을 캐시 접두부로 두고
+            # 파일마다 다른 지시만 뒤에 붙인다 (접두부가 최소 캐시 길이에 못 미치면 표시는 빠짐)
+            cache_prefix = prompt + f"""
+            
+            전체 파일 구성:
+            {file_list}
+            """
+            prompt = f"""
+            이번 응답에서는 다음 파일 하나만 생성하세요: {target_file['filename']}
+            역할: {target_file.get('description', '')}
+            """
+        
         system_message = """
         당신은 요구사항에 맞는 코드를 생성하는 코드 생성 에이전트입니다.
         주어진 작업과 계획을 분석하고 최적의 코드를 작성하세요.
@@ -65,11 +96,15 @@ class CodeGenerationAgent(BaseAgent):
         - description: 코드 설명
         """
         
-        response = anthropic_client.get_completion(
+        response = await anthropic_client.aget_completion(
             prompt=prompt,
             system_message=system_message,
             temperature=0.3,
-            max_tokens=2000
+            max_tokens=2000,
+            on_delta=on_delta or get_token_handler(),
+            cache_prefix=cache_prefix,
+            agent="code_generation",
+            step="generate"
         )
         
         if response["status"] == "error":
@@ -87,7 +122,7 @@ class CodeGenerationAgent(BaseAgent):
     
     async def extract_code_files(self, generated_code: str) -> Dict[str, Any]:
         """
-        생성된 코드에서 파일 정보 추출
+        생성된 코드에서 파일 정보 추출 (완성된 응답 전체를 한 번에 파싱)
         
         Args:
             generated_code: 생성된 코드 텍스트
@@ -95,92 +130,17 @@ class CodeGenerationAgent(BaseAgent):
         Returns:
             파일 정보 목록
         """
-        # 실제 구현에서는 생성된 코드에서 파일 정보를 파싱하는 로직 추가
-        # 여기서는 예시로 간단하게 구현
-        
-        # JSON 형식으로 파싱 시도
         try:
-            import re
-            import json
-            
             logger.info(f"생성된 코드 추출 시작: {generated_code[:100]}...")
             
-            # 그냥 안전하게 가장 일반적인 형태로 추출
-            files = []
-            
-            # JSON 형식 추출 시도
-            json_match = re.search(r'({[\s\S]*})', generated_code)
-            if json_match:
-                try:
-                    json_str = json_match.group(1)
-                    data = json.loads(json_str)
-                    
-                    # 저장 경로에 tests 폴더 추가
-                    filename = data.get("filename", "")
-                    
-                    # 파일 이름에 경로가 없으면 tests/ 추가
-                    if not filename.startswith("/") and "tests/" not in filename and "tests\\" not in filename:
-                        if "tests" == filename.split("/")[0]:
-                            # tests가 이미 포함되어 있는 경우
-                            filename = filename
-                        else:
-                            # tests가 포함되어 있지 않은 경우
-                            filename = "tests/" + filename
-                    
-                    files.append({
-                        "filename": filename,
-                        "language": data.get("language", ""),
-                        "code": data.get("code", "").replace("```vue\n", "").replace("\n```", "").strip(),
-                        "description": data.get("description", "")
-                    })
-                    
-                    logger.info(f"JSON 형식으로 파일 추출 성공: {filename}")
-                except Exception as e:
-                    logger.warning(f"JSON 파싱 실패, 다른 방법 시도: {str(e)}")
-            
-            # 코드 블록 추출 시도 (JSON 파싱 실패 시)
-            if not files:
-                code_match = re.search(r'```([a-zA-Z]*)\n([\s\S]*?)```', generated_code)
-                if code_match:
-                    language = code_match.group(1) or "text"
-                    code = code_match.group(2)
-                    
-                    # 파일명 추출 시도
-                    filename_match = re.search(r'"filename"\s*:\s*"([^"]+)"', generated_code)
-                    filename = filename_match.group(1) if filename_match else "example." + ("vue" if language == "vue" else "txt")
-                    
-                    # 파일 이름에 경로가 없으면 tests/ 추가
-                    if not filename.startswith("/") and "tests/" not in filename and "tests\\" not in filename:
-                        if "tests" == filename.split("/")[0]:
-                            # tests가 이미 포함되어 있는 경우
-                            filename = filename
-                        else:
-                            # tests가 포함되어 있지 않은 경우
-                            filename = "tests/" + filename
-                    
-                    # 설명 추출 시도
-                    description_match = re.search(r'"description"\s*:\s*"([^"]+)"', generated_code)
-                    description = description_match.group(1) if description_match else f"{language} 파일"
-                    
-                    files.append({
-                        "filename": filename,
-                        "language": language,
-                        "code": code,
-                        "description": description
-                    })
-                    
-                    logger.info(f"코드 블록에서 파일 추출 성공: {filename}")
+            extractor = StreamingCodeExtractor()
+            files = extractor.feed(generated_code) + extractor.close()
+            for file in files:
+                prepare_file(file)
             
             # 파일 추출 실패 시 기본값 사용
             if not files:
-                logger.warning("파일 정보 추출 실패, 기본값 사용")
-                filename = "tests/example.vue"
-                files.append({
-                    "filename": filename,
-                    "language": "vue",
-                    "code": "<!-- 기본 코드 -->\n" + generated_code,
-                    "description": "코드 추출 실패로 생성된 기본 파일"
-                })
+                files.append(fallback_file(generated_code))
             
             return {
                 "status": "success",
@@ -221,8 +181,8 @@ class CodeGenerationAgent(BaseAgent):
                 continue
             
             try:
-                # Cursor 통합을 통해 파일 생성
-                result = self.cursor.create_file(filename, code)
+                # Cursor 통합을 통해 파일 생성 (토큰 스트림을 막지 않도록 스레드에서 실행)
+                result = await asyncio.to_thread(self.cursor.create_file, filename, code)
                 
                 if result["status"] == "success":
                     success_count += 1
@@ -253,6 +213,9 @@ class CodeGenerationAgent(BaseAgent):
         """
         상태 처리 및 결과 반환
         
+        계획에 대상 파일이 여러 개 있으면 파일마다 코드 생성을 동시에 실행하고
+        (CODEGEN_MAX_CONCURRENCY로 동시 실행 수 제한) 결과를 하나로 병합한다.
+        
         Args:
             state: 현재 상태
             
@@ -267,68 +230,18 @@ class CodeGenerationAgent(BaseAgent):
                 return {"status": "error", "message": "수행할 작업이 지정되지 않았습니다."}
             
             # 계획이 있으면 사용
-            plan = None
-            if "plan" in state:
-                plan = state["plan"]
-            
-            # 요청 텍스트에서 파일 타입 추출
-            file_type = self.extract_file_type_from_request(task)
-            file_summary = self.generate_file_summary(task)
+            plan = state.get("plan")
             
             # 저장 경로 확인
             save_path = state.get("save_path")
             if save_path:
                 logger.info(f"저장 경로 지정됨: {save_path}")
             
-            # 1. 코드 생성
-            generated_code = await self.generate_code(task, plan)
-            if generated_code["status"] != "success":
-                return generated_code
-            
-            # 2. 코드 파일 추출
-            extracted_files = await self.extract_code_files(generated_code["generated_code"])
-            if extracted_files["status"] != "success":
-                return extracted_files
-            
-            # 저장 경로 지정이 있으면 적용
-            if save_path:
-                updated_files = []
-                for file in extracted_files["files"]:
-                    filename = file["filename"]
-                    # 파일 이름이 없거나 기본값인 경우, 요청 내용에서 추출한 정보 사용
-                    if not filename or filename == "tests/example.vue":
-                        # 파일 이름 생성
-                        new_filename = self.generate_filename(save_path, file_summary, file_type)
-                        file["filename"] = new_filename
-                        logger.info(f"파일명 생성: {new_filename}")
-                    # 절대 경로로 시작하지 않고, 특별한 경로 지정이 없는 경우만 처리
-                    elif not filename.startswith("/"):
-                        # 이미 경로가 있으면 기존 경로 유지
-                        if "/" in filename:
-                            # 상대 경로가 있는 경우 확인
-                            path_parts = filename.split("/")
-                            if path_parts[0] != os.path.basename(save_path):
-                                # 저장 경로와 다른 경우, 저장 경로로 변경
-                                base_filename = os.path.basename(filename)
-                                file["filename"] = f"{os.path.basename(save_path)}/{base_filename}"
-                        else:
-                            # 상대 경로가 없는 경우
-                            file["filename"] = f"{os.path.basename(save_path)}/{filename}"
-                        logger.info(f"파일 경로 업데이트: {filename} -> {file['filename']}")
-                    updated_files.append(file)
-                extracted_files["files"] = updated_files
-            
-            # 3. 코드 파일 저장
-            save_result = await self.save_code_files(extracted_files["files"])
-            
-            # 결과 반환
-            result = {
-                "status": save_result["status"],
-                "message": save_result["message"],
-                "generated_code": generated_code,
-                "files": extracted_files["files"],
-                "save_results": save_result["results"]
-            }
+            target_files = state.get("target_files") or []
+            if len(target_files) <= 1:
+                result = await self.generate_file(task, plan, save_path, target_files[0] if target_files else None)
+            else:
+                result = await self.generate_files(task, plan, save_path, target_files)
             
             self.log_completion(state, result)
             return result
@@ -340,151 +253,186 @@ class CodeGenerationAgent(BaseAgent):
                 "message": f"코드 생성 중 오류 발생: {str(e)}"
             }
     
-    def extract_file_type_from_request(self, request: str) -> str:
+    async def generate_files(
+        self,
+        task: str,
+        plan: Optional[str],
+        save_path: Optional[str],
+        target_files: List[Dict[str, str]]
+    ) -> Dict[str, Any]:
         """
-        요청 텍스트에서 파일 타입 추출
+        여러 파일을 파일별로 동시에 생성하고 결과 병합
         
         Args:
-            request: 요청 텍스트
+            task: 수행할 작업 설명
+            plan: 계획
+            save_path: 파일 저장 경로
+            target_files: 생성할 파일 목록
             
         Returns:
-            파일 타입 (.vue, .js, .html 등)
+            병합된 처리 결과
         """
-        import re
+        semaphore = asyncio.Semaphore(CODEGEN_MAX_CONCURRENCY)
+        logger.info(f"파일별 코드 생성 시작: {len(target_files)}개 (동시 실행 최대 {CODEGEN_MAX_CONCURRENCY}개)")
         
-        # 파일 확장자 패턴
-        file_patterns = {
-            r'\b(vue|\.vue)\b': '.vue',
-            r'\b(javascript|js|\.js)\b': '.js',
-            r'\b(typescript|ts|\.ts)\b': '.ts',
-            r'\b(html|\.html)\b': '.html',
-            r'\b(css|\.css)\b': '.css',
-            r'\b(python|py|\.py)\b': '.py',
-            r'\b(react|jsx|\.jsx)\b': '.jsx',
-            r'\b(tsx|\.tsx)\b': '.tsx',
-        }
+        async def run_branch(target_file: Dict[str, str]) -> Dict[str, Any]:
+            async with semaphore:
+                async with node_scope(f"code_generation:{target_file['filename']}"):
+                    return await self.generate_file(task, plan, save_path, target_file, target_files)
         
-        # 요청 텍스트에서 파일 타입 찾기
-        for pattern, ext in file_patterns.items():
-            if re.search(pattern, request.lower()):
-                logger.info(f"요청에서 파일 타입 감지: {ext}")
-                return ext
+        branch_results = await asyncio.gather(
+            *(run_branch(target_file) for target_file in target_files),
+            return_exceptions=True
+        )
         
-        # 기본값은 Vue 파일
-        logger.info("파일 타입을 감지할 수 없어 기본값 사용: .vue")
-        return '.vue'
+        # 결과 병합
+        files: List[Dict[str, Any]] = []
+        save_results: List[Dict[str, Any]] = []
+        generated_code: Dict[str, Any] = {}
+        failed = []
+        timed_out = False
+        for target_file, branch in zip(target_files, branch_results):
+            if isinstance(branch, asyncio.CancelledError):
+                # Reason: 이 노드 자체가 취소 중이면 결과를 합치지 않고 취소를 그대로 전파
+                if asyncio.current_task().cancelling():
+                    raise branch
+                # 분기만 취소된 경우(처리 기한 등)는 해당 파일만 기한 초과로 처리
+                branch = self.timed_out_result(target_file, [], [])
+            elif isinstance(branch, BaseException):
+                branch = {"status": "error", "message": f"코드 생성 중 오류 발생: {str(branch)}"}
+            timed_out = timed_out or branch.get("timed_out", False)
+            if branch["status"] not in ["success", "partial_success"]:
+                failed.append(target_file["filename"])
+                save_results.append({
+                    "filename": target_file["filename"],
+                    "status": "error",
+                    "message": branch.get("message", "코드 생성 실패")
+                })
+                continue
+            files.extend(branch["files"])
+            save_results.extend(branch["save_results"])
+            generated_code[target_file["filename"]] = branch["generated_code"]
+        
+        success_count = sum(1 for r in save_results if r["status"] == "success")
+        error_count = len(save_results) - success_count
+        return {
+            "status": "success" if error_count == 0 else "partial_success" if success_count > 0 else "error",
+            "message": f"파일 저장 완료: 성공 {success_count}개, 실패 {error_count}개",
+            "generated_code": {"status": "success", "files": generated_code},
+            "files": files,
+            "save_results": save_results,
+            "failed_files": failed,
+            "timed_out": timed_out
+        }
     
-    def generate_file_summary(self, request: str) -> str:
+    async def generate_file(
+        self,
+        task: str,
+        plan: Optional[str],
+        save_path: Optional[str],
+        target_file: Optional[Dict[str, str]] = None,
+        all_files: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
         """
-        요청 텍스트에서 파일 내용 요약하여 파일명 생성
+        코드 생성과 동시에 파일 추출 및 저장
+        
+        토큰 델타를 StreamingCodeExtractor에 흘려보내 코드 펜스가 닫히는 즉시
+        파일명을 확정하고 저장하므로, 모델이 응답을 생성하는 동안 파일이 작업 공간에 나타난다.
+        처리 기한(응답 정리 시간 제외)까지 생성이 끝나지 않으면 그때까지 저장한 파일만 결과로 반환한다.
         
         Args:
-            request: 요청 텍스트
+            task: 수행할 작업 설명
+            plan: 계획
+            save_path: 파일 저장 경로
+            target_file: 생성할 파일 (없으면 응답에서 결정)
+            all_files: 계획의 전체 파일 목록
             
         Returns:
-            10글자 내외의 파일명
+            처리 결과
         """
-        import re
-        
-        # 특수문자 제거 및 공백을 언더스코어로 변경
-        words = re.sub(r'[^\w\s]', '', request.lower()).split()
-        
-        # 주요 키워드 추출 (예: 버튼, 알림, 로그인 등)
-        keywords = ['button', 'alert', 'login', 'form', 'list', 'table', 'modal', 'menu', '버튼', '알림', '로그인', '폼', '리스트', '테이블', '모달', '메뉴']
-        
-        file_name = ""
-        
-        # 키워드 기반 파일명 생성
-        for keyword in keywords:
-            if keyword in request.lower():
-                if keyword in ['button', '버튼']:
-                    file_name = 'Button'
-                elif keyword in ['alert', '알림']:
-                    file_name = 'Alert'
-                elif keyword in ['login', '로그인']:
-                    file_name = 'Login'
-                elif keyword in ['form', '폼']:
-                    file_name = 'Form'
-                elif keyword in ['list', '리스트']:
-                    file_name = 'List'
-                elif keyword in ['table', '테이블']:
-                    file_name = 'Table'
-                elif keyword in ['modal', '모달']:
-                    file_name = 'Modal'
-                elif keyword in ['menu', '메뉴']:
-                    file_name = 'Menu'
-                break
-        
-        # 키워드가 없는 경우 단어 조합으로 파일명 생성
-        if not file_name and words:
-            # 중요 단어 (명사) 우선 사용
-            important_words = []
-            for word in words:
-                if len(word) > 2:  # 3글자 이상 단어만 고려
-                    important_words.append(word)
-            
-            if important_words:
-                # 첫 번째 중요 단어를 사용하고 첫 글자를 대문자로 변경
-                file_name = important_words[0].capitalize()
-                
-                # 두 번째 중요 단어가 있으면 추가
-                if len(important_words) > 1 and len(file_name) + len(important_words[1]) <= 10:
-                    file_name += important_words[1].capitalize()
-            else:
-                # 중요 단어가 없으면 처음 몇 개 단어 사용
-                combined = ''.join([w.capitalize() for w in words[:3] if w])
-                file_name = combined[:10]  # 10글자로 제한
-        
-        # 파일명이 없으면 기본값 사용
-        if not file_name:
-            file_name = "Component"
-        
-        logger.info(f"요청에서 파일명 생성: {file_name}")
-        return file_name
+        extractor = StreamingCodeExtractor()
+        token_handler = get_token_handler()
+        files: List[Dict[str, Any]] = []
+        save_results: List[Dict[str, Any]] = []
+        
+        async def save_completed(completed: List[Dict[str, Any]]) -> None:
+            for file in completed:
+                # 계획에서 지정한 파일명은 첫 번째 파일에만 적용
+                prepare_file(file, None if files else target_file, save_path, task)
+                files.append(file)
+                logger.info(f"코드 블록 완성, 파일 저장: {file['filename']}")
+                save_result = await self.save_code_files([file])
+                save_results.extend(save_result["results"])
+        
+        streamed = False
+        
+        async def on_delta(text: str) -> None:
+            nonlocal streamed
+            streamed = True
+            if token_handler:
+                await token_handler(text)
+            completed = extractor.feed(text)
+            if completed:
+                await save_completed(completed)
+        
+        # 1. 코드 생성 (완성된 파일은 스트리밍 중 저장됨)
+        try:
+            async with asyncio.timeout(time_budget(reserve=DEADLINE_RESERVE_SECONDS)):
+                generated_code = await self.generate_code(task, plan, target_file, all_files, on_delta=on_delta)
+        except TimeoutError:
+            return self.timed_out_result(target_file, files, save_results)
+        if generated_code["status"] != "success":
+            return generated_code
+        
+        # 2. 델타 없이 완성된 응답만 받은 경우 한 번에 파싱, 닫히지 않은 마지막 블록 처리
+        if not streamed:
+            await save_completed(extractor.feed(generated_code["generated_code"]))
+        await save_completed(extractor.close())
+        # 추출된 파일이 없으면 기본 파일 저장
+        if not files:
+            await save_completed([fallback_file(generated_code["generated_code"])])
+        
+        success_count = sum(1 for r in save_results if r["status"] == "success")
+        error_count = len(save_results) - success_count
+        return {
+            "status": "success" if error_count == 0 else "partial_success" if success_count > 0 else "error",
+            "message": f"파일 저장 완료: 성공 {success_count}개, 실패 {error_count}개",
+            "generated_code": generated_code,
+            "files": files,
+            "save_results": save_results
+        }
     
-    def generate_filename(self, save_path: str, base_name: str, file_ext: str) -> str:
+    def timed_out_result(
+        self,
+        target_file: Optional[Dict[str, str]],
+        files: List[Dict[str, Any]],
+        save_results: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         """
-        최종 파일명 생성 (중복 확인 및 처리)
+        처리 기한 초과 시 그때까지 저장된 파일로 결과 생성 (작성 중이던 코드 블록은 버림)
         
         Args:
-            save_path: 저장 경로
-            base_name: 기본 파일명
-            file_ext: 파일 확장자
+            target_file: 생성하던 파일
+            files: 저장된 파일 목록
+            save_results: 저장 결과 목록
             
         Returns:
-            최종 파일명 (경로 포함)
+            부분 결과 (저장된 파일이 없으면 오류), timed_out 표시 포함
         """
-        import os
-        
-        # 경로가 절대 경로인지 확인
-        if os.path.isabs(save_path):
-            base_dir = save_path
-        else:
-            # 상대 경로인 경우 현재 작업 디렉토리 기준으로 처리
-            base_dir = os.path.join(os.getcwd(), save_path)
-        
-        # 기본 파일 경로
-        relative_path = os.path.basename(save_path)
-        file_path = f"{relative_path}/{base_name}{file_ext}"
-        full_path = os.path.join(base_dir, f"{base_name}{file_ext}")
-        
-        # 이미 존재하는 파일인지 확인
-        counter = 1
-        while os.path.exists(full_path):
-            # 파일이 이미 존재하면 숫자 추가
-            new_name = f"{base_name}{counter}{file_ext}"
-            file_path = f"{relative_path}/{new_name}"
-            full_path = os.path.join(base_dir, new_name)
-            counter += 1
-            
-            # 안전장치 (무한루프 방지)
-            if counter > 100:
-                import time
-                # 타임스탬프를 추가하여 유니크한 파일명 생성
-                timestamp = int(time.time())
-                new_name = f"{base_name}{timestamp}{file_ext}"
-                file_path = f"{relative_path}/{new_name}"
-                break
-        
-        logger.info(f"최종 파일명 생성: {file_path}")
-        return file_path 
\ No newline at end of file
+        name = target_file["filename"] if target_file else "응답"
+        logger.warning(f"처리 기한 초과로 코드 생성 중단: {name} (저장된 파일 {len(files)}개)")
+        metrics.increment("deadline_degraded", kind="codegen_truncated", agent="code_generation")
+        if not files:
+            return {
+                "status": "error",
+                "message": f"처리 기한 안에 코드를 생성하지 못했습니다: {name}",
+                "timed_out": True
+            }
+        return {
+            "status": "partial_success",
+            "message": f"처리 기한 초과로 일부 파일만 저장: {len(files)}개",
+            "generated_code": {"status": "partial", "generated_code": ""},
+            "files": files,
+            "save_results": save_results,
+            "timed_out": True
+        }
@@ -0,0 +1,163 @@
+"""
+에이전트 그래프 실행 관리
+실행 하나의 진행 프레임을 큐로 전달하고, 실행이 취소되면 진행 중인 노드 태스크까지 취소하며, 요청당 LLM 호출 예산을 확인
+"""
+import asyncio
+import functools
+import contextlib
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+from loguru import logger
+
+from backend.utils.streaming import StreamEmitter, current_emitter, current_node
+from backend.utils.log_capture import log_capture
+from backend.utils.metrics import metrics, RequestStats, current_request_stats
+from backend.config.settings import MAX_LLM_CALLS_PER_REQUEST
+
+# 현재 실행의 노드 태스크 목록
+# Reason: LangGraph는 실행이 취소되어도 진행 중인 노드 태스크를 취소하지 않으므로 직접 추적하여 취소
+_run_tasks: ContextVar[Optional[Set[asyncio.Task]]] = ContextVar("run_tasks", default=None)
+
+def cancellable(node: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+    """
+    노드 함수를 실행 취소 시 함께 취소되도록 감쌈 (노드 태스크를 현재 실행의 태스크 목록에 등록)
+    
+    Args:
+        node: 노드 함수
+        
+    Returns:
+        감싼 노드 함수
+    """
+    @functools.wraps(node)
+    async def run(state: Any) -> Any:
+        tasks = _run_tasks.get()
+        task = asyncio.current_task()
+        if tasks is None or task is None:
+            return await node(state)
+        tasks.add(task)
+        try:
+            return await node(state)
+        finally:
+            tasks.discard(task)
+    
+    return run
+
+async def cancel_pending_nodes() -> None:
+    """
+    현재 실행에서 아직 끝나지 않은 노드 태스크 취소 후 정리 대기
+    """
+    pending = [task for task in _run_tasks.get() or () if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+def check_llm_call_budget(stats: RequestStats, final_state: Dict[str, Any]) -> None:
+    """
+    요청당 LLM 호출 횟수 기록 및 예산 초과 감지
+    
+    Args:
+        stats: 요청 통계
+        final_state: 최종 상태 (파일별 팬아웃 수 확인용)
+    """
+    metrics.observe("llm_calls_per_request", stats.llm_calls)
+    # 파일별 코드 생성은 파일 하나당 호출 1회이므로 추가 파일 수만큼 예산 확장
+    budget = MAX_LLM_CALLS_PER_REQUEST + max(0, len(final_state.get("target_files") or []) - 1)
+    if stats.llm_calls > budget:
+        # Reason: 에이전트 중복 실행 같은 회귀를 조기에 잡기 위해 예산 초과를 별도 카운터로 노출
+        metrics.increment("llm_call_budget_exceeded")
+        logger.warning(
+            f"요청당 LLM 호출 예산 초과: {stats.llm_calls}회 (한도 {budget}회)"
+        )
+
+async def collect(frames: AsyncIterator[Dict[str, Any]], emitter: Optional[StreamEmitter]) -> Dict[str, Any]:
+    """
+    프레임 스트림에서 result 프레임을 꺼내고 나머지는 송신기로 전달
+    
+    Args:
+        frames: stream/resume_stream 이터레이터
+        emitter: 스트리밍 프레임 송신기
+        
+    Returns:
+        실행 결과
+    """
+    result: Dict[str, Any] = {}
+    async for frame in frames:
+        if frame["type"] == "result":
+            result = {k: v for k, v in frame.items() if k not in ("type", "node", "seq")}
+        elif emitter is not None:
+            await emitter.forward(frame)
+    return result
+
+async def stream_run(
+    execute: Callable[[str, Optional[Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+    run_id: str,
+    initial_state: Optional[Dict[str, Any]],
+    tokens: bool,
+    logs: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    그래프 실행 태스크를 띄우고 프레임을 큐에서 꺼내 반환
+    
+    Args:
+        execute: 그래프 실행 본체 (실행 ID와 초기 상태를 받아 실행 결과 반환)
+        run_id: 실행 ID (로그 캡처의 request_id로도 사용)
+        initial_state: 초기 상태 (None이면 체크포인트에서 재개)
+        tokens: LLM 토큰 델타 프레임 포함 여부
+        logs: 로그 실시간 전송 여부
+        
+    Yields:
+        진행 프레임, 마지막으로 result 프레임
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    emitter = StreamEmitter(queue.put, stream_tokens=tokens, send_nowait=queue.put_nowait)
+    
+    def send_log(entry: Dict[str, Any]) -> None:
+        emitter.emit_nowait("log", node=current_node.get(), **entry)
+    
+    async def produce() -> None:
+        # Reason: 송신기를 컨텍스트 변수로 전달해야 그래프 상태(직렬화 대상)에 콜백이 섞이지 않음
+        emitter_token = current_emitter.set(emitter)
+        stats = RequestStats()
+        stats_token = current_request_stats.set(stats)
+        run_tasks: Set[asyncio.Task] = set()
+        tasks_token = _run_tasks.set(run_tasks)
+        try:
+            with log_capture.capture(run_id, send_log if logs else None) as records:
+                result = await execute(run_id, initial_state)
+                check_llm_call_budget(stats, result.get("state") or {})
+            # 다른 스레드에서 넘어온 로그 프레임이 result 프레임보다 먼저 전송되도록 한 번 양보
+            await asyncio.sleep(0)
+            if not logs:
+                result["logs"] = list(records)
+            result["run_id"] = run_id
+            result["stats"] = stats.to_dict()
+            await emitter.emit("result", **result)
+        finally:
+            # 실행이 취소되면 아직 돌고 있는 노드 태스크도 취소 (LLM 호출/하위 프로세스까지 전파)
+            await cancel_pending_nodes()
+            _run_tasks.reset(tasks_token)
+            current_request_stats.reset(stats_token)
+            current_emitter.reset(emitter_token)
+            await queue.put(None)
+    
+    producer = asyncio.create_task(produce())
+    last_node = None
+    try:
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                break
+            if frame["type"] == "node_start":
+                last_node = frame.get("node")
+            yield frame
+        await producer
+    finally:
+        # 소비자가 중간에 이터레이션을 멈추면(연결 종료, 취소) 그래프 실행도 취소
+        # 취소는 실행 중인 노드의 LLM 호출(HTTP 스트림 중단)과 하위 프로세스(프로세스 그룹 종료)까지 전파됨
+        if not producer.done():
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+            metrics.increment("agent_runs_cancelled", node=last_node or "start")
+            logger.info(f"에이전트 그래프 실행 취소 ({run_id}): 마지막 노드 {last_node or '시작 전'}")
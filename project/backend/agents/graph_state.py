@@ -0,0 +1,131 @@
+"""
+에이전트 그래프 상태
+그래프 상태 타입, 노드 실패 예외, 초기 상태 생성과 작업 할당에 따른 다음 노드 결정
+"""
+import json
+from typing import Any, Dict, List, Optional, TypedDict
+from loguru import logger
+
+from backend.utils.deadline import deadline_after
+from backend.config.settings import REQUEST_DEADLINE_SECONDS
+
+# 슈퍼바이저 할당 결과를 실행하는 순서 (각 에이전트는 요청당 최대 한 번 실행)
+AGENT_ORDER = ["planning", "code_generation"]
+
+# 상태 타입 정의
+class AgentState(TypedDict, total=False):
+    user_request: str
+    task: Optional[str]
+    analysis: Optional[Dict[str, Any]]
+    task_allocation: Optional[Dict[str, Dict[str, Any]]]
+    agent_results: Optional[Dict[str, Dict[str, Any]]]
+    plan: Optional[str]
+    target_files: Optional[List[Dict[str, str]]]
+    generated_code: Optional[Dict[str, Any]]
+    results: Optional[Dict[str, Any]]
+    error: Optional[str]
+    save_path: Optional[str]
+    speculative_plan: Optional[Dict[str, Any]]
+    route: Optional[str]
+    answer: Optional[str]
+    deadline_at: Optional[float]
+
+class NodeExecutionError(Exception):
+    """
+    그래프 노드 실행 실패
+
+    노드가 상태 업데이트 대신 예외로 실패하면 해당 단계가 체크포인트에 기록되지 않으므로,
+    실행을 재개할 때 완료된 노드는 건너뛰고 실패한 노드부터 다시 실행된다.
+    """
+
+    def __init__(self, node: str, message: str):
+        """
+        노드 실행 실패 예외 초기화
+
+        Args:
+            node: 실패한 노드 이름
+            message: 오류 메시지
+        """
+        super().__init__(message)
+        self.node = node
+
+def next_allocated_agent(state: AgentState, after: Optional[str] = None) -> str:
+    """
+    작업 할당에서 아직 실행하지 않은 다음 에이전트 찾기
+    
+    Args:
+        state: 현재 상태
+        after: 방금 실행한 노드 이름 (없으면 처음부터)
+        
+    Returns:
+        다음 노드 이름 또는 "end"
+    """
+    # 오류 발생 시 종료
+    if "error" in state and state["error"]:
+        logger.error(f"오류로 인한 처리 종료: {state['error']}")
+        return "end"
+    
+    allocation = state.get("task_allocation") or {}
+    start = AGENT_ORDER.index(after) + 1 if after in AGENT_ORDER else 0
+    for agent_id in AGENT_ORDER[start:]:
+        if allocation.get(agent_id, {}).get("assigned"):
+            return agent_id
+    return "end"
+
+def build_initial_state(
+    user_request: str,
+    save_path: Optional[str] = None,
+    deadline_seconds: Optional[float] = None
+) -> AgentState:
+    """
+    사용자 요청에서 초기 상태 생성 (JSON 형식 요청이면 request/save_path 추출)
+    
+    Args:
+        user_request: 사용자 요청
+        save_path: 파일 저장 경로 (선택 사항)
+        deadline_seconds: 처리 시간 예산 (초, 없으면 REQUEST_DEADLINE_SECONDS)
+        
+    Returns:
+        초기 상태
+    """
+    # json 형식인지 확인
+    try:
+        # JSON 형식이면 파싱 시도
+        if user_request.strip().startswith('{') and user_request.strip().endswith('}'):
+            data = json.loads(user_request)
+            
+            # 실제 요청 추출
+            if 'request' in data:
+                actual_request = data['request']
+                
+                # 저장 경로 추출
+                if 'save_path' in data and not save_path:
+                    save_path = data['save_path']
+                    logger.info(f"JSON에서 저장 경로 추출: {save_path}")
+                
+                user_request = actual_request
+                logger.info(f"JSON에서 실제 요청 추출: {user_request[:50]}...")
+        
+    except json.JSONDecodeError:
+        # JSON이 아니라면 패스
+        pass
+    except Exception as e:
+        logger.warning(f"JSON 파싱 오류: {str(e)}")
+    
+    # 초기 상태 생성
+    initial_state: AgentState = {
+        "user_request": user_request,
+        "task": user_request,  # 태스크로도 설정
+    }
+    
+    # 저장 경로가 있으면 상태에 추가
+    if save_path:
+        initial_state["save_path"] = save_path
+        logger.info(f"저장 경로를 상태에 추가: {save_path}")
+    
+    # 처리 기한 (에이전트가 남은 시간에 맞춰 모델/출력 길이/선택 단계를 조절)
+    deadline_at = deadline_after(deadline_seconds or REQUEST_DEADLINE_SECONDS)
+    if deadline_at is not None:
+        initial_state["deadline_at"] = deadline_at
+    
+    return initial_state
@@ -6,6 +6,11 @@ from loguru import logger
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.anthropic_client import anthropic_client
+from backend.utils.streaming import get_token_handler
+from backend.utils.json_utils import extract_json_object
+from backend.utils.deadline import remaining_seconds
+from backend.utils.metrics import metrics
+from backend.config.settings import CODEGEN_MAX_FILES, DEADLINE_SKIP_OPTIONAL_SECONDS, DEADLINE_SKIP_PLANNING_SECONDS
 
 class PlanningAgent(BaseAgent):
     """
@@ -41,12 +46,19 @@ class PlanningAgent(BaseAgent):
         
         계획은 구체적이고 실행 가능해야 합니다.
         JSON 형식으로 응답해주세요.
+        생성하거나 수정해야 하는 파일은 "files" 배열에 모두 나열하세요.
+        각 항목은 다음 정보를 포함해야 합니다:
+        - filename: 파일명 (상대 경로)
+        - description: 해당 파일이 담당하는 역할
         """
         
-        response = anthropic_client.get_completion(
+        response = await anthropic_client.aget_completion(
             prompt=task,
             system_message=system_message,
-            temperature=0.2
+            temperature=0.2,
+            on_delta=get_token_handler(),
+            agent="planning",
+            step="plan"
         )
         
         if response["status"] == "error":
@@ -59,9 +71,44 @@ class PlanningAgent(BaseAgent):
         return {
             "status": "success",
             "plan": response["content"],
+            "target_files": self.extract_target_files(response["content"]),
             "raw_response": response
         }
     
+    def extract_target_files(self, plan_text: str) -> List[Dict[str, str]]:
+        """
+        계획에서 생성 대상 파일 목록 추출
+        
+        Args:
+            plan_text: 계획 응답 텍스트
+            
+        Returns:
+            파일 목록 (filename, description), 중복 제거 후 CODEGEN_MAX_FILES개까지
+        """
+        data = extract_json_object(plan_text)
+        if not data or not isinstance(data.get("files"), list):
+            return []
+        
+        target_files = []
+        seen = set()
+        for item in data["files"]:
+            if isinstance(item, str):
+                item = {"filename": item}
+            if not isinstance(item, dict) or not item.get("filename") or item["filename"] in seen:
+                continue
+            seen.add(item["filename"])
+            target_files.append({
+                "filename": str(item["filename"]),
+                "description": str(item.get("description", ""))
+            })
+        
+        if len(target_files) > CODEGEN_MAX_FILES:
+            logger.warning(f"대상 파일이 너무 많아 {CODEGEN_MAX_FILES}개로 제한: {len(target_files)}개")
+            target_files = target_files[:CODEGEN_MAX_FILES]
+        
+        logger.info(f"계획에서 대상 파일 추출: {[f['filename'] for f in target_files]}")
+        return target_files
+    
     async def prioritize_steps(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         """
         계획 단계 우선순위 지정
@@ -100,19 +147,39 @@ class PlanningAgent(BaseAgent):
             if not task:
                 return {"status": "error", "message": "수행할 작업이 지정되지 않았습니다."}
             
+            # 기한이 얼마 남지 않았으면 계획 없이 코드 생성으로 넘어가도록 계획 수립 생략
+            remaining = remaining_seconds(state)
+            if remaining is not None and remaining < DEADLINE_SKIP_PLANNING_SECONDS:
+                logger.warning(f"기한까지 {remaining:.1f}초 남아 계획 수립 생략")
+                metrics.increment("deadline_degraded", kind="skip_planning", agent="planning")
+                return {
+                    "status": "success",
+                    "message": "처리 기한이 얼마 남지 않아 계획 수립 생략",
+                    "plan": "",
+                    "target_files": [],
+                    "skipped": True
+                }
+            
             # 1. 계획 수립
             plan = await self.create_plan(task)
             if plan["status"] != "success":
                 return plan
             
-            # 2. 우선순위 지정
-            prioritized_plan = await self.prioritize_steps(plan)
+            # 2. 우선순위 지정 (선택 단계이므로 기한이 빠듯하면 원본 계획 사용)
+            remaining = remaining_seconds(state)
+            if remaining is not None and remaining < DEADLINE_SKIP_OPTIONAL_SECONDS:
+                logger.info(f"기한까지 {remaining:.1f}초 남아 우선순위 지정 생략")
+                metrics.increment("deadline_degraded", kind="skip_prioritize", agent="planning")
+                prioritized_plan = {"status": "success", "prioritized_plan": plan["plan"], "original_plan": plan, "skipped": True}
+            else:
+                prioritized_plan = await self.prioritize_steps(plan)
             
             # 결과 반환
             result = {
                 "status": "success",
                 "message": "계획 수립 완료",
                 "plan": prioritized_plan["prioritized_plan"],
+                "target_files": plan["target_files"],
                 "details": {
                     "original_plan": plan,
                     "prioritized_plan": prioritized_plan
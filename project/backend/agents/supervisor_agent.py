@@ -1,12 +1,53 @@
 """
 슈퍼바이저 에이전트 구현
 """
-import asyncio
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Literal
 from loguru import logger
+from pydantic import BaseModel, Field, ValidationError, model_validator
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.anthropic_client import anthropic_client
+from backend.utils.metrics import metrics
+
+# 라우팅 결정별로 실행할 하위 에이전트
+ROUTE_AGENTS = {
+    "direct_answer": [],
+    "code_only": ["code_generation"],
+    "plan_and_code": ["planning", "code_generation"],
+}
+
+# 결정을 얻지 못했을 때 사용하는 라우팅 (모든 에이전트 실행)
+FALLBACK_ROUTE = "plan_and_code"
+
+class RoutingDecision(BaseModel):
+    """
+    슈퍼바이저 라우팅 결정
+    """
+    route: Literal["direct_answer", "code_only", "plan_and_code"] = Field(
+        description=(
+            "direct_answer: 코드 생성이 필요 없는 질문이나 설명 요청. "
+            "code_only: 파일 하나 수준의 간단한 생성/수정이라 계획이 필요 없는 요청. "
+            "plan_and_code: 여러 파일이나 설계가 필요한 요청."
+        )
+    )
+    reason: str = Field(default="", description="라우팅 판단 근거 (한두 문장)")
+    answer: Optional[str] = Field(default=None, description="route가 direct_answer일 때 사용자에게 줄 답변")
+
+    @model_validator(mode="after")
+    def check_answer(self) -> "RoutingDecision":
+        """
+        direct_answer 라우팅이면 답변이 있는지 검증
+        """
+        if self.route == "direct_answer" and not (self.answer or "").strip():
+            raise ValueError("direct_answer 라우팅에는 answer가 필요합니다.")
+        return self
+
+# 라우팅 결정을 스키마에 맞게 받기 위한 도구 정의
+ROUTING_TOOL = {
+    "name": "route_request",
+    "description": "사용자 요청을 처리할 경로를 결정합니다.",
+    "input_schema": RoutingDecision.model_json_schema()
+}
 
 class SupervisorAgent(BaseAgent):
     """
@@ -45,29 +86,30 @@ class SupervisorAgent(BaseAgent):
     
     async def analyze_request(self, user_request: str) -> Dict[str, Any]:
         """
-        사용자 요청 분석
+        사용자 요청 분석 (도구 호출로 스키마 검증된 라우팅 결정 생성)
         
         Args:
             user_request: 사용자 요청 텍스트
             
         Returns:
-            분석 결과
+            분석 결과 (decision: RoutingDecision 사전)
         """
         system_message = """
         당신은 작업을 분석하고 적절한 하위 에이전트에게 할당하는 슈퍼바이저입니다.
-        사용자 요청을 분석하고 다음 작업을 수행하세요:
-        1. 요청의 주요 목적과 필요한 작업 식별
-        2. 필요한 하위 에이전트 목록 작성 (계획 수립, 코드 생성, 디버깅 등)
-        3. 각 하위 에이전트에게 할당할 구체적인 작업 정의
-        4. 작업 간의 의존성 파악
+        사용자 요청을 분석하고 route_request 도구로 처리 경로를 결정하세요:
+        - direct_answer: 코드를 만들 필요가 없는 질문이나 설명 요청 (answer에 답변 작성)
+        - code_only: 파일 하나 수준의 간단한 코드 생성/수정 (계획 수립 생략)
+        - plan_and_code: 여러 파일, 구조 설계, 단계적 작업이 필요한 요청
         
-        JSON 형식으로 응답해주세요.
+        판단이 애매하면 plan_and_code를 선택하세요.
         """
         
-        response = anthropic_client.get_completion(
+        response = await anthropic_client.aget_tool_call(
             prompt=user_request,
+            tool=ROUTING_TOOL,
             system_message=system_message,
-            temperature=0.3
+            agent="supervisor",
+            step="analyze"
         )
         
         if response["status"] == "error":
@@ -77,10 +119,20 @@ class SupervisorAgent(BaseAgent):
                 "message": "사용자 요청을 분석하는데 문제가 발생했습니다."
             }
         
-        # TODO: 응답을 구조화된 형태로 파싱
+        try:
+            decision = RoutingDecision.model_validate(response.get("tool_input") or {})
+        except ValidationError as e:
+            # 결정을 검증할 수 없으면 기존처럼 모든 에이전트를 실행
+            logger.warning(f"라우팅 결정 검증 실패, {FALLBACK_ROUTE}로 처리: {str(e)}")
+            metrics.increment("supervisor_routing_fallback")
+            decision = RoutingDecision(route=FALLBACK_ROUTE, reason="라우팅 결정 검증 실패")
+        
+        logger.info(f"라우팅 결정: {decision.route} ({decision.reason})")
+        metrics.increment("supervisor_routing", route=decision.route)
         return {
             "status": "success",
-            "analysis": response["content"],
+            "analysis": decision.reason,
+            "decision": decision.model_dump(),
             "raw_response": response
         }
     
@@ -88,6 +140,9 @@ class SupervisorAgent(BaseAgent):
         """
         작업 할당
         
+        슈퍼바이저는 할당만 결정하고 실행은 하지 않는다. 실제 실행은 AgentGraph가
+        할당 결과에 따라 각 에이전트를 정확히 한 번씩 수행한다.
+        
         Args:
             analysis: 요청 분석 결과
             state: 현재 상태
@@ -95,15 +150,16 @@ class SupervisorAgent(BaseAgent):
         Returns:
             작업 할당 결과
         """
-        # TODO: 분석 결과에서 필요한 에이전트와 작업 추출
-        # 예시용 임시 구현
+        route = (analysis.get("decision") or {}).get("route", FALLBACK_ROUTE)
+        assigned_agents = ROUTE_AGENTS[route]
+        task = state.get("task") or state.get("user_request", "")
         task_allocation = {}
         
         for agent_id, agent in self.sub_agents.items():
             task_allocation[agent_id] = {
                 "agent": agent.name,
-                "assigned": True,
-                "task": f"작업 수행: {analysis.get('analysis', '일반 작업')[:50]}..."
+                "assigned": agent_id in assigned_agents,
+                "task": task
             }
         
         return {
@@ -111,57 +167,6 @@ class SupervisorAgent(BaseAgent):
             "task_allocation": task_allocation
         }
     
-    async def execute_parallel(self, tasks: Dict[str, Dict[str, Any]], state: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        작업 병렬 실행
-        
-        Args:
-            tasks: 할당된 작업 목록
-            state: 현재 상태
-            
-        Returns:
-            실행 결과
-        """
-        if not tasks:
-            return {"status": "error", "message": "실행할 작업이 없습니다."}
-        
-        # 병렬로 실행할 작업 생성
-        coroutines = []
-        for agent_id, task in tasks.items():
-            if agent_id in self.sub_agents and task.get("assigned", False):
-                agent = self.sub_agents[agent_id]
-                # 각 에이전트에 필요한 상태 복사본 생성
-                agent_state = state.copy()
-                agent_state["task"] = task["task"]
-                coroutines.append(agent.process(agent_state))
-        
-        # 병렬 실행
-        results = {}
-        if coroutines:
-            try:
-                executed_results = await asyncio.gather(*coroutines, return_exceptions=True)
-                
-                # 결과 처리
-                for i, agent_id in enumerate(tasks.keys()):
-                    if i < len(executed_results):
-                        result = executed_results[i]
-                        if isinstance(result, Exception):
-                            logger.error(f"에이전트 실행 오류 ({agent_id}): {str(result)}")
-                            results[agent_id] = {
-                                "status": "error",
-                                "message": f"실행 중 오류 발생: {str(result)}"
-                            }
-                        else:
-                            results[agent_id] = result
-            except Exception as e:
-                logger.error(f"병렬 실행 오류: {str(e)}")
-                return {"status": "error", "message": f"병렬 실행 중 오류 발생: {str(e)}"}
-        
-        return {
-            "status": "success",
-            "results": results
-        }
-    
     async def integrate_results(self, results: Dict[str, Dict[str, Any]], state: Dict[str, Any]) -> Dict[str, Any]:
         """
         작업 결과 통합
@@ -224,22 +229,17 @@ class SupervisorAgent(BaseAgent):
             if task_allocation["status"] != "success":
                 return task_allocation
             
-            # 3. 병렬 실행
-            execution_results = await self.execute_parallel(task_allocation["task_allocation"], state)
-            if execution_results["status"] != "success":
-                return execution_results
-            
-            # 4. 결과 통합
-            integrated_result = await self.integrate_results(execution_results["results"], state)
-            
-            # 최종 상태 업데이트
+            # 최종 상태 업데이트 (하위 에이전트 실행은 그래프가 담당)
+            assigned = [agent_id for agent_id, task in task_allocation["task_allocation"].items() if task.get("assigned")]
+            decision = analysis["decision"]
             result = {
-                "status": integrated_result["status"],
-                "message": integrated_result["summary"],
+                "status": "success",
+                "message": f"작업 할당 완료 ({decision['route']}): {', '.join(assigned) or '없음'}",
                 "analysis": analysis,
-                "task_allocation": task_allocation,
-                "execution_results": execution_results,
-                "integrated_result": integrated_result
+                "route": decision["route"],
+                # Reason: 도구 스키마상 다른 라우팅에도 answer가 채워질 수 있으므로 직접 답변일 때만 전달
+                "answer": decision.get("answer") if decision["route"] == "direct_answer" else None,
+                "task_allocation": task_allocation["task_allocation"]
             }
             
             self.log_completion(state, result)
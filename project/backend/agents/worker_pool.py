@@ -0,0 +1,380 @@
+"""
+에이전트 그래프 워커 프로세스 풀
+그래프 실행을 별도 프로세스로 분산하고 진행 프레임과 결과를 API 프로세스로 중계
+"""
+import time
+import uuid
+import asyncio
+import threading
+import contextlib
+import multiprocessing
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+from loguru import logger
+
+from backend.agents.agent_graph import AgentGraph, AgentState
+from backend.utils.checkpoint_store import SQLiteCheckpointSaver
+from backend.utils.circuit_breaker import merge_breaker_snapshots
+from backend.utils.metrics import metrics
+from backend.config.settings import CHECKPOINT_ENABLED, CHECKPOINT_PATH, CHECKPOINT_MAX_AGE_SECONDS, LLM_BREAKER_ENABLED
+
+# 워커 생존 확인 주기 (초)
+MONITOR_INTERVAL = 1.0
+
+# 워커 상태(서킷 브레이커, 메트릭 변화량 등) 보고 주기 (초, 실행이 끝날 때도 보고)
+STATUS_INTERVAL = 2.0
+
+def _worker_main(index: int, inbox: Any, outbox: Any, concurrency: int, num_workers: int) -> None:
+    """
+    워커 프로세스 진입점
+
+    Args:
+        index: 워커 번호
+        inbox: 실행/취소 메시지 수신 큐
+        outbox: (dispatch_id, frame) 송신 큐 (frame이 None이면 해당 실행 종료, dispatch_id가 None이면 워커 상태 보고)
+        concurrency: 프로세스당 동시 실행 수
+        num_workers: 전체 워커 수 (LLM 호출 한도를 나눠 씀)
+    """
+    asyncio.run(_worker_loop(index, inbox, outbox, concurrency, num_workers))
+
+async def _worker_loop(index: int, inbox: Any, outbox: Any, concurrency: int, num_workers: int) -> None:
+    """
+    워커 이벤트 루프 (프로세스마다 자체 AgentGraph와 LLM 클라이언트 사용)
+
+    Args:
+        index: 워커 번호
+        inbox: 실행/취소 메시지 수신 큐
+        outbox: 프레임 송신 큐
+        concurrency: 프로세스당 동시 실행 수
+        num_workers: 전체 워커 수
+    """
+    from backend.utils.anthropic_client import anthropic_client
+
+    # 계정 단위 RPM/TPM 한도를 워커 수만큼 나눔
+    anthropic_client.rate_limiter.scale(1 / num_workers)
+    graph = AgentGraph()
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    tasks: Dict[str, asyncio.Task] = {}
+    logger.info(f"그래프 워커 {index} 시작")
+
+    def report_status() -> None:
+        # Reason: 서킷 브레이커와 메트릭은 프로세스마다 따로 있으므로 API 프로세스가 워커 상태를 모아 보여 주도록 보고
+        outbox.put((None, {
+            "worker": index,
+            "breakers": anthropic_client.breakers.snapshot(),
+            "llm": anthropic_client.stats(),
+            "metrics": metrics.take_delta()
+        }))
+
+    async def report_periodically() -> None:
+        while True:
+            report_status()
+            await asyncio.sleep(STATUS_INTERVAL)
+
+    async def relay(dispatch_id: str, message: Dict[str, Any]) -> None:
+        try:
+            async with slots:
+                async for frame in graph._stream(
+                    message["run_id"], message["initial_state"], message["tokens"], message["logs"]
+                ):
+                    outbox.put((dispatch_id, frame))
+        except asyncio.CancelledError:
+            logger.info(f"그래프 워커 {index}: 실행 취소됨 ({message['run_id']})")
+        except Exception as e:
+            logger.error(f"그래프 워커 {index}: 실행 오류 ({message['run_id']}): {str(e)}")
+            outbox.put((dispatch_id, {
+                "type": "result",
+                "node": None,
+                "seq": 0,
+                "status": "error",
+                "message": f"워커 실행 중 오류 발생: {str(e)}",
+                "run_id": message["run_id"]
+            }))
+        finally:
+            tasks.pop(dispatch_id, None)
+            report_status()
+            outbox.put((dispatch_id, None))
+
+    reporter = asyncio.create_task(report_periodically())
+    try:
+        while True:
+            message = await loop.run_in_executor(None, inbox.get)
+            if message is None:
+                break
+            if message["op"] == "run":
+                tasks[message["id"]] = asyncio.create_task(relay(message["id"], message))
+            elif message["op"] == "cancel":
+                task = tasks.get(message["id"])
+                if task is not None:
+                    task.cancel()
+    finally:
+        reporter.cancel()
+        for task in list(tasks.values()):
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        await anthropic_client.aclose()
+        logger.info(f"그래프 워커 {index} 종료")
+
+class _Worker:
+    """
+    워커 프로세스 핸들
+    """
+
+    def __init__(self, index: int, process: Any, inbox: Any):
+        """
+        워커 핸들 초기화
+
+        Args:
+            index: 워커 번호
+            process: 프로세스 객체
+            inbox: 워커 수신 큐
+        """
+        self.index = index
+        self.process = process
+        self.inbox = inbox
+        self.inflight = 0
+
+class ProcessWorkerPool:
+    """
+    spawn 방식 워커 프로세스 풀
+
+    실행마다 가장 한가한 워커의 수신 큐로 메시지를 보내고, 모든 워커가 공유하는 송신 큐를
+    읽는 스레드가 프레임을 실행별 asyncio 큐로 전달한다.
+    """
+
+    def __init__(self, num_workers: int, concurrency: int):
+        """
+        워커 풀 초기화
+
+        Args:
+            num_workers: 워커 프로세스 수
+            concurrency: 프로세스당 동시 실행 수
+        """
+        self.num_workers = num_workers
+        self.concurrency = concurrency
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._outbox: Any = None
+        self._reader: Optional[threading.Thread] = None
+        self._monitor: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatches: Dict[str, Tuple[asyncio.Queue, _Worker]] = {}
+        # 워커 번호별 마지막 상태 보고
+        self._status: Dict[int, Dict[str, Any]] = {}
+
+    def _spawn(self, index: int) -> _Worker:
+        """
+        워커 프로세스 생성
+
+        Args:
+            index: 워커 번호
+
+        Returns:
+            워커 핸들
+        """
+        inbox = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, inbox, self._outbox, self.concurrency, self.num_workers),
+            name=f"agent-graph-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return _Worker(index, process, inbox)
+
+    async def start(self) -> None:
+        """
+        워커 프로세스와 프레임 중계 스레드 시작
+        """
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._outbox = self._context.Queue()
+        self._workers = [self._spawn(i) for i in range(self.num_workers)]
+        self._reader = threading.Thread(target=self._read_frames, name="agent-graph-relay", daemon=True)
+        self._reader.start()
+        self._monitor = asyncio.create_task(self._watch_workers())
+        logger.info(f"그래프 워커 프로세스 {self.num_workers}개 시작 (프로세스당 동시 실행 {self.concurrency}개)")
+
+    async def stop(self) -> None:
+        """
+        워커 프로세스 종료
+        """
+        if self._monitor is not None:
+            self._monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor
+        for worker in self._workers:
+            worker.inbox.put(None)
+        for worker in self._workers:
+            await asyncio.to_thread(worker.process.join, 10)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self._workers = []
+        if self._outbox is not None:
+            self._outbox.put(None)
+        if self._reader is not None:
+            await asyncio.to_thread(self._reader.join, 5)
+
+    def _read_frames(self) -> None:
+        """
+        송신 큐를 읽어 이벤트 루프로 프레임 전달 (중계 스레드)
+        """
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                break
+            self._loop.call_soon_threadsafe(self._deliver, *item)
+
+    def _deliver(self, dispatch_id: str, frame: Optional[Dict[str, Any]]) -> None:
+        """
+        프레임을 해당 실행의 큐에 전달 (이벤트 루프 스레드)
+
+        Args:
+            dispatch_id: 실행 식별자 (None이면 워커 상태 보고)
+            frame: 프레임 (None이면 실행 종료)
+        """
+        if dispatch_id is None:
+            # 메트릭 변화량은 API 프로세스 레지스트리에 합산하고 나머지는 워커별 최신 상태로 보관
+            metrics.merge(frame.pop("metrics"))
+            self._status[frame["worker"]] = {**frame, "reported_at": time.time()}
+            return
+        dispatch = self._dispatches.get(dispatch_id)
+        if dispatch is not None:
+            dispatch[0].put_nowait(frame)
+
+    async def _watch_workers(self) -> None:
+        """
+        비정상 종료된 워커의 실행을 오류로 끝내고 워커를 다시 생성
+        """
+        while True:
+            await asyncio.sleep(MONITOR_INTERVAL)
+            for position, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                logger.error(f"그래프 워커 {worker.index} 비정상 종료 (exitcode={worker.process.exitcode}), 재시작")
+                metrics.increment("worker_process_restarts")
+                self._status.pop(worker.index, None)
+                for dispatch_id, (queue, owner) in list(self._dispatches.items()):
+                    if owner is worker:
+                        queue.put_nowait({
+                            "type": "result",
+                            "node": None,
+                            "seq": 0,
+                            "status": "error",
+                            "message": "워커 프로세스가 비정상 종료되었습니다."
+                        })
+                        queue.put_nowait(None)
+                self._workers[position] = self._spawn(worker.index)
+
+    def breakers_snapshot(self) -> Dict[str, Any]:
+        """
+        워커들이 마지막으로 보고한 서킷 브레이커 상태
+
+        Returns:
+            모델별 합산 상태와 워커별 상태 (보고 주기만큼 늦을 수 있음)
+        """
+        reports = [self._status[index] for index in sorted(self._status)]
+        return {
+            "enabled": LLM_BREAKER_ENABLED,
+            "mode": "process",
+            "models": merge_breaker_snapshots([report["breakers"] for report in reports]),
+            "workers": {
+                str(report["worker"]): {"reported_at": report["reported_at"], "models": report["breakers"]["models"]}
+                for report in reports
+            }
+        }
+
+    def llm_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        워커들이 마지막으로 보고한 LLM 클라이언트 통계
+
+        Returns:
+            워커 번호별 속도 제한, 응답 캐시, 헤징 통계
+        """
+        return {
+            str(index): {"reported_at": report["reported_at"], **report["llm"]}
+            for index, report in sorted(self._status.items())
+        }
+
+    async def dispatch(self, message: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        그래프 실행을 워커로 보내고 중계된 프레임 반환
+
+        Args:
+            message: 실행 메시지 (run_id, initial_state, tokens, logs)
+
+        Yields:
+            워커가 보낸 프레임 (마지막은 result 프레임)
+        """
+        if not self._workers:
+            raise RuntimeError("워커 풀이 시작되지 않았습니다.")
+
+        dispatch_id = uuid.uuid4().hex
+        worker = min(self._workers, key=lambda w: w.inflight)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._dispatches[dispatch_id] = (queue, worker)
+        worker.inflight += 1
+        metrics.increment("worker_dispatches", worker=worker.index)
+        worker.inbox.put({**message, "op": "run", "id": dispatch_id})
+
+        finished = False
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    finished = True
+                    break
+                yield frame
+        finally:
+            self._dispatches.pop(dispatch_id, None)
+            worker.inflight -= 1
+            # 소비자가 중간에 멈추면(연결 종료, 취소 등) 워커에서도 실행 취소
+            if not finished and worker.process.is_alive():
+                worker.inbox.put({"op": "cancel", "id": dispatch_id})
+
+class ProcessPoolAgentGraph(AgentGraph):
+    """
+    그래프 실행을 워커 프로세스 풀로 위임하는 AgentGraph
+
+    run/stream/resume/resume_stream 인터페이스는 그대로이며, 에이전트와 컴파일된 그래프는
+    워커 프로세스에서만 생성한다.
+    """
+
+    def __init__(self, pool: ProcessWorkerPool):
+        """
+        위임 그래프 초기화
+
+        Args:
+            pool: 워커 프로세스 풀
+        """
+        self.pool = pool
+        # 실행 상태 조회(재개 가능 여부 확인)용 체크포인트 저장소만 API 프로세스에 둠
+        self.checkpointer = (
+            SQLiteCheckpointSaver(db_path=CHECKPOINT_PATH, max_age_seconds=CHECKPOINT_MAX_AGE_SECONDS)
+            if CHECKPOINT_ENABLED else None
+        )
+        logger.info("에이전트 그래프 초기화 완료 (워커 프로세스 모드)")
+
+    async def _stream(
+        self,
+        run_id: str,
+        initial_state: Optional[AgentState],
+        tokens: bool,
+        logs: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        워커 프로세스에서 그래프를 실행하고 프레임 중계
+
+        Args:
+            run_id: 실행 ID
+            initial_state: 초기 상태 (None이면 체크포인트에서 재개)
+            tokens: LLM 토큰 델타 프레임 포함 여부
+            logs: 로그 실시간 전송 여부
+
+        Yields:
+            진행 프레임, 마지막으로 result 프레임
+        """
+        message = {"run_id": run_id, "initial_state": initial_state, "tokens": tokens, "logs": logs}
+        async for frame in self.pool.dispatch(message):
+            yield frame
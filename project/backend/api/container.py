@@ -0,0 +1,192 @@
+"""
+애플리케이션 구성 요소 컨테이너
+에이전트 그래프/워커 풀/작업 큐/LLM 클라이언트를 import 시점이 아니라 처음 사용할 때(또는 애플리케이션 시작 시)
+생성하고, FastAPI lifespan에서 구동/준비/종료를 관리
+"""
+import sys
+import time
+import asyncio
+import importlib
+from typing import Any, Awaitable, Callable, Dict, Optional, TYPE_CHECKING
+from loguru import logger
+
+from backend.utils.metrics import metrics
+from backend.utils.job_queue import JobStore, JobQueue
+from backend.config.settings import (
+    JOB_DB_PATH,
+    JOB_WORKERS,
+    JOB_POLL_INTERVAL,
+    JOB_RETENTION_SECONDS,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    WORKER_MODE,
+    WORKER_PROCESSES,
+    WORKER_PROCESS_CONCURRENCY,
+    STARTUP_WARMUP
+)
+
+if TYPE_CHECKING:
+    from backend.agents.agent_graph import AgentGraph
+    from backend.agents.worker_pool import ProcessWorkerPool
+    from backend.utils.anthropic_client import AnthropicClient
+
+# 작업 실행 함수 타입 (선점한 작업, 진행 이벤트 발행 함수 -> 실행 결과)
+JobHandler = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Awaitable[Dict[str, Any]]]
+
+# 준비 단계에서 이벤트 루프를 막지 않도록 다른 스레드에서 미리 불러올 무거운 모듈 (LangGraph, Anthropic SDK)
+WARMUP_MODULES = (
+    "backend.agents.worker_pool" if WORKER_MODE == "process" else "backend.agents.agent_graph",
+    "backend.utils.anthropic_client",
+)
+
+class AppContainer:
+    """
+    애플리케이션 구성 요소의 지연 생성과 수명 관리
+
+    속성에 처음 접근할 때 구성 요소를 만들기 때문에, 라우트 모듈을 import만 하는 쪽(워커 부팅, 테스트 수집)은
+    LangGraph 컴파일, LLM 클라이언트 생성, 작업 공간 확인 비용을 치르지 않는다.
+    """
+
+    def __init__(self, job_handler: JobHandler):
+        """
+        컨테이너 초기화
+
+        Args:
+            job_handler: 작업 큐 워커가 작업마다 호출할 실행 함수
+        """
+        self.job_handler = job_handler
+        self._agent_graph: Optional["AgentGraph"] = None
+        self._worker_pool: Optional["ProcessWorkerPool"] = None
+        self._job_queue: Optional[JobQueue] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _build(component: str, factory: Callable[[], Any]) -> Any:
+        """
+        구성 요소 생성 (생성 시간 메트릭 기록)
+
+        Args:
+            component: 구성 요소 이름
+            factory: 생성 함수
+
+        Returns:
+            생성된 구성 요소
+        """
+        started = time.monotonic()
+        instance = factory()
+        elapsed = time.monotonic() - started
+        metrics.observe("startup_component_seconds", elapsed, component=component)
+        logger.info(f"구성 요소 생성: {component} ({elapsed:.3f}초)")
+        return instance
+
+    @property
+    def worker_pool(self) -> Optional["ProcessWorkerPool"]:
+        """
+        그래프 워커 프로세스 풀 (process 모드가 아니면 None)
+        """
+        if WORKER_MODE != "process":
+            return None
+        if self._worker_pool is None:
+            from backend.agents.worker_pool import ProcessWorkerPool
+            self._worker_pool = self._build(
+                "worker_pool", lambda: ProcessWorkerPool(WORKER_PROCESSES, WORKER_PROCESS_CONCURRENCY)
+            )
+        return self._worker_pool
+
+    @property
+    def agent_graph(self) -> "AgentGraph":
+        """
+        에이전트 그래프 (process 모드에서는 워커 프로세스 풀로 실행을 위임하는 그래프)
+        """
+        if self._agent_graph is None:
+            if WORKER_MODE == "process":
+                from backend.agents.worker_pool import ProcessPoolAgentGraph
+                pool = self.worker_pool
+                self._agent_graph = self._build("agent_graph", lambda: ProcessPoolAgentGraph(pool))
+            else:
+                from backend.agents.agent_graph import AgentGraph
+                self._agent_graph = self._build("agent_graph", AgentGraph)
+        return self._agent_graph
+
+    @property
+    def job_queue(self) -> JobQueue:
+        """
+        비동기 작업 큐
+        """
+        if self._job_queue is None:
+            self._job_queue = self._build("job_queue", lambda: JobQueue(
+                JobStore(JOB_DB_PATH),
+                self.job_handler,
+                num_workers=JOB_WORKERS,
+                poll_interval=JOB_POLL_INTERVAL,
+                retention_seconds=JOB_RETENTION_SECONDS,
+                lease_seconds=JOB_LEASE_SECONDS,
+                max_attempts=JOB_MAX_ATTEMPTS
+            ))
+        return self._job_queue
+
+    @property
+    def llm_client(self) -> "AnthropicClient":
+        """
+        공유 Anthropic 클라이언트 (anthropic_client 싱글턴)
+        """
+        from backend.utils.anthropic_client import anthropic_client
+        return anthropic_client
+
+    @property
+    def ready(self) -> bool:
+        """
+        에이전트 그래프 준비 완료 여부
+        """
+        return self._agent_graph is not None
+
+    async def warmup(self) -> None:
+        """
+        첫 요청이 준비 비용을 치르지 않도록 에이전트 그래프와 LLM 클라이언트를 미리 생성
+
+        무거운 모듈 import는 다른 스레드에서 하고, 객체 생성은 이벤트 루프 스레드에서 한다.
+        """
+        started = time.monotonic()
+        for module in WARMUP_MODULES:
+            await asyncio.to_thread(importlib.import_module, module)
+        self.agent_graph
+        self.llm_client.resolve()
+        elapsed = time.monotonic() - started
+        metrics.observe("startup_warmup_seconds", elapsed)
+        logger.info(f"에이전트 그래프 준비 완료 ({elapsed:.3f}초)")
+
+    async def _background_warmup(self) -> None:
+        """
+        백그라운드 준비 (실패해도 애플리케이션은 계속 동작하고 첫 요청에서 다시 생성을 시도)
+        """
+        try:
+            await self.warmup()
+        except Exception as e:
+            logger.error(f"에이전트 그래프 준비 실패 (첫 요청에서 다시 시도): {str(e)}")
+
+    async def startup(self) -> None:
+        """
+        구성 요소 구동 (워커 풀, 작업 큐) 후 STARTUP_WARMUP 방식에 따라 에이전트 그래프 준비
+        """
+        if self.worker_pool is not None:
+            await self.worker_pool.start()
+        await self.job_queue.start()
+        if STARTUP_WARMUP == "eager":
+            await self.warmup()
+        elif STARTUP_WARMUP == "background":
+            self._warmup_task = asyncio.create_task(self._background_warmup())
+
+    async def shutdown(self) -> None:
+        """
+        생성된 구성 요소만 정리 (생성되지 않은 구성 요소는 종료를 위해 새로 만들지 않음)
+        """
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            await asyncio.gather(self._warmup_task, return_exceptions=True)
+        if self._job_queue is not None:
+            await self._job_queue.stop()
+        if self._worker_pool is not None:
+            await self._worker_pool.stop()
+        client_module = sys.modules.get("backend.utils.anthropic_client")
+        if client_module is not None and client_module.anthropic_client.initialized:
+            await client_module.anthropic_client.aclose()
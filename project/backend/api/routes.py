@@ -1,65 +1,36 @@
 """
 FastAPI 라우트 모듈
 """
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, BackgroundTasks, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, File, UploadFile, WebSocket, WebSocketDisconnect, Request, Header
+from sse_starlette.sse import EventSourceResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Awaitable
 import asyncio
+import contextlib
 import json
 from loguru import logger
-import os
-import uuid
-import logging
-from io import StringIO
 
-from backend.agents.agent_graph import AgentGraph
-from backend.config.settings import UPLOAD_DIR, APP_ENV
+from backend.api.container import AppContainer
+from backend.api.ws_session import WebSocketSession
+from backend.utils.metrics import metrics
+from backend.utils.admission import admission_controller, AdmissionRejected
+from backend.utils.job_queue import FINISHED_STATUSES
 
-# 로그 캡처를 위한 StringIO 객체와 핸들러
-class LogCapture:
-    def __init__(self):
-        self.log_records = []
-        self.max_records = 100  # 최대 로그 항목 수
-    
-    def add_record(self, record):
-        # 필요한 로그 정보만 저장
-        log_entry = {
-            "time": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
-            "level": record["level"].name,
-            "message": record["message"],
-            "name": record["name"],
-            "function": record["function"],
-            "line": record["line"]
-        }
-        self.log_records.append(log_entry)
-        
-        # 최대 항목 수를 초과하면 가장 오래된 항목 제거
-        if len(self.log_records) > self.max_records:
-            self.log_records.pop(0)
-    
-    def get_records(self):
-        return self.log_records
-    
-    def clear(self):
-        self.log_records = []
+# SSE 연결 유지 ping 전송 주기 (다른 프로세스에서 실행 중인 작업의 완료 확인 주기이기도 함)
+SSE_KEEPALIVE_SECONDS = 5.0
 
-# 로그 캡처 인스턴스 생성
-log_capture = LogCapture()
-
-# loguru 커스텀 로그 핸들러 추가
-logger.configure(
-    handlers=[
-        # 기존 콘솔 로그 핸들러 유지
-        {"sink": lambda msg: print(msg), "format": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"},
-        # 로그 캡처 핸들러 추가
-        {"sink": log_capture.add_record, "format": "{time} | {level} | {name}:{function}:{line} - {message}"}
-    ]
-)
+# 클라이언트가 응답 전에 연결을 끊은 요청의 상태 코드 (nginx 관례, 실제로 전달되지는 않음)
+CLIENT_CLOSED_REQUEST = 499
 
 # 모델 정의
 class UserRequest(BaseModel):
     request: str
+    # 처리 시간 예산 (초, 없으면 REQUEST_DEADLINE_SECONDS)
+    deadline_seconds: Optional[float] = None
+
+class JobRequest(BaseModel):
+    request: str
+    save_path: Optional[str] = None
     
 class AgentResponse(BaseModel):
     status: str
@@ -69,43 +40,114 @@ class AgentResponse(BaseModel):
 # 라우터 생성
 router = APIRouter(prefix="/api/v1")
 
-# 에이전트 그래프 인스턴스
-agent_graph = AgentGraph()
+async def run_job(job: Dict[str, Any], publish) -> Dict[str, Any]:
+    """
+    작업 큐 워커에서 에이전트 그래프 실행 (노드 진행 프레임을 작업 이벤트로 발행)
+    
+    Args:
+        job: 선점한 작업
+        publish: 진행 이벤트 발행 함수
+        
+    Returns:
+        실행 결과
+    """
+    payload = job["payload"]
+    result: Dict[str, Any] = {}
+    # 작업 워커 수로 이미 동시성이 제한되므로 기한 없이 슬롯 대기
+    async with admission_controller.slot(timeout=None):
+        async for frame in container.agent_graph.stream(payload["request"], payload.get("save_path"), tokens=False):
+            if frame["type"] == "result":
+                result = {k: v for k, v in frame.items() if k not in ("type", "node", "seq")}
+            else:
+                publish(frame)
+    return result
 
-# 활성 WebSocket 연결 저장
-active_connections: Dict[str, WebSocket] = {}
+# 구성 요소 컨테이너 (에이전트 그래프/워커 풀/작업 큐는 처음 사용할 때 생성, 구동과 종료는 애플리케이션 lifespan에서 처리)
+# process 모드에서는 에이전트 그래프가 워커 프로세스 풀로 실행을 위임
+container = AppContainer(run_job)
 
-# 웹소켓 클라이언트 목록
-websocket_clients: Dict[str, WebSocket] = {}
+class ClientDisconnected(Exception):
+    """HTTP 클라이언트가 실행 도중 연결을 끊음"""
+
+async def run_until_disconnected(http_request: Request, awaitable: Awaitable[Any]) -> Any:
+    """
+    클라이언트 연결 종료를 감시하며 실행 (끊기면 실행을 취소하여 남은 LLM 호출과 하위 프로세스 중단)
+    
+    Args:
+        http_request: HTTP 요청 (본문은 이미 읽은 상태)
+        awaitable: 실행할 코루틴
+        
+    Returns:
+        실행 결과
+        
+    Raises:
+        ClientDisconnected: 실행이 끝나기 전에 연결이 끊긴 경우
+    """
+    run = asyncio.ensure_future(awaitable)
+    
+    async def wait_for_disconnect() -> None:
+        # 본문을 다 읽은 뒤의 receive는 연결이 끊길 때 http.disconnect를 반환
+        while (await http_request.receive())["type"] != "http.disconnect":
+            pass
+    
+    watcher = asyncio.create_task(wait_for_disconnect())
+    try:
+        await asyncio.wait({run, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not run.done():
+            run.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await run
+    if not run.cancelled():
+        return run.result()
+    logger.info("클라이언트 연결 종료로 실행 취소")
+    metrics.increment("runs_abandoned", transport="http")
+    raise ClientDisconnected()
 
 # API 엔드포인트
 @router.post("/process", response_model=AgentResponse)
-async def process_request(request: UserRequest) -> AgentResponse:
+async def process_request(request: UserRequest, http_request: Request) -> AgentResponse:
     """
     사용자 요청 처리
     
     Args:
         request: 사용자 요청
+        http_request: HTTP 요청 (연결 종료 감지용)
         
     Returns:
         처리 결과
     """
+    async def execute() -> Dict[str, Any]:
+        # 에이전트 그래프 실행 (동시 실행 한도 초과 시 대기열에서 대기)
+        async with admission_controller.slot():
+            return await container.agent_graph.run(request.request, deadline_seconds=request.deadline_seconds)
+    
     try:
         logger.info(f"사용자 요청 수신: {request.request[:50]}...")
         logger.debug(f"전체 요청 데이터: {request}")
         
-        # 에이전트 그래프 실행
-        result = await agent_graph.run(request.request)
+        # 클라이언트가 연결을 끊으면 대기/실행 중인 그래프도 취소
+        result = await run_until_disconnected(http_request, execute())
         logger.debug(f"에이전트 그래프 실행 결과: {result}")
         
         # 응답 반환
         response = AgentResponse(
             status=result["status"],
             message=result["message"],
-            details={"state": result.get("state", {})}
+            details={"run_id": result.get("run_id"), "state": result.get("state", {})}
         )
         logger.info(f"응답 반환: {response.status}")
         return response
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="클라이언트 연결이 종료되었습니다.")
+    except AdmissionRejected as e:
+        logger.warning(f"요청 거절: {str(e)}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header}
+        )
     except Exception as e:
         logger.error(f"요청 처리 중 오류 발생: {str(e)}")
         import traceback
@@ -115,35 +157,177 @@ async def process_request(request: UserRequest) -> AgentResponse:
             detail=f"요청 처리 중 오류 발생: {str(e)}"
         )
 
+@router.post("/runs/{run_id}/resume", response_model=AgentResponse)
+async def resume_run(run_id: str, http_request: Request) -> AgentResponse:
+    """
+    실패하거나 중단된 실행을 마지막 완료 노드부터 재개
+    
+    Args:
+        run_id: 실행 ID (/process 응답의 details.run_id 또는 WebSocket 결과의 run_id)
+        http_request: HTTP 요청 (연결 종료 감지용)
+        
+    Returns:
+        처리 결과
+    """
+    if container.agent_graph.get_run_state(run_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"재개할 실행 기록을 찾을 수 없습니다: {run_id}"
+        )
+    
+    async def execute() -> Dict[str, Any]:
+        async with admission_controller.slot():
+            return await container.agent_graph.resume(run_id)
+    
+    try:
+        logger.info(f"실행 재개 요청: {run_id}")
+        result = await run_until_disconnected(http_request, execute())
+        return AgentResponse(
+            status=result["status"],
+            message=result["message"],
+            details={"run_id": run_id, "state": result.get("state", {})}
+        )
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="클라이언트 연결이 종료되었습니다.")
+    except AdmissionRejected as e:
+        logger.warning(f"재개 요청 거절: {str(e)}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header}
+        )
+    except Exception as e:
+        logger.error(f"실행 재개 중 오류 발생: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"실행 재개 중 오류 발생: {str(e)}"
+        )
+
+@router.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest) -> Dict[str, Any]:
+    """
+    사용자 요청을 작업 큐에 등록하고 즉시 반환
+    
+    Args:
+        request: 사용자 요청
+        
+    Returns:
+        작업 ID와 상태 (결과는 GET /jobs/{job_id} 또는 /jobs/{job_id}/events로 확인)
+    """
+    job_id = await container.job_queue.submit("process", {"request": request.request, "save_path": request.save_path})
+    logger.info(f"작업 등록: {job_id}")
+    return {"job_id": job_id, "status": "queued"}
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict[str, Any]:
+    """
+    작업 상태 및 결과 조회
+    
+    Args:
+        job_id: 작업 ID
+        
+    Returns:
+        작업 정보
+    """
+    job = await container.job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+def _parse_last_event_id(last_event_id: Optional[str]) -> int:
+    """
+    Last-Event-ID 헤더를 이벤트 일련번호로 변환
+    
+    Args:
+        last_event_id: 클라이언트가 마지막으로 받은 이벤트 ID
+        
+    Returns:
+        이벤트 일련번호 (없거나 잘못된 값이면 0)
+    """
+    try:
+        return max(0, int(last_event_id or 0))
+    except ValueError:
+        return 0
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, last_event_id: Optional[str] = Header(None)) -> EventSourceResponse:
+    """
+    작업 진행 이벤트 SSE 스트림 (node_start/node_update/node_end 등, 마지막에 result 이벤트)
+    
+    Args:
+        job_id: 작업 ID
+        last_event_id: 재연결 시 브라우저가 보내는 Last-Event-ID 헤더 (이후 이벤트만 전송)
+        
+    Returns:
+        text/event-stream 응답
+    """
+    if await container.job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    last_seq = _parse_last_event_id(last_event_id)
+    
+    async def event_stream():
+        # Reason: 구독을 먼저 등록한 뒤 상태를 확인해야 그 사이에 끝난 작업의 완료 이벤트를 놓치지 않음
+        async with container.job_queue.subscribe(job_id) as queue:
+            job = await container.job_queue.get(job_id)
+            while job is not None and job["status"] not in FINISHED_STATUSES:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # 다른 프로세스에서 실행 중인 작업은 이벤트가 오지 않으므로 상태를 직접 확인 (ping은 응답 객체가 전송)
+                    job = await container.job_queue.get(job_id)
+                    continue
+                if event is None:
+                    job = await container.job_queue.get(job_id)
+                    break
+                if event.get("seq", 0) <= last_seq:
+                    # 재연결 전에 이미 받은 이벤트는 건너뜀
+                    continue
+                yield {"event": event["type"], "id": str(event["seq"]), "data": json.dumps(event, ensure_ascii=False, default=str)}
+            if job is None:
+                # 스트리밍 중에 작업 기록이 정리되면 종료 이벤트로 알려 클라이언트가 재연결하지 않게 함
+                job = {"job_id": job_id, "status": "not_found", "error": f"작업을 찾을 수 없습니다: {job_id}"}
+            yield {"event": "result", "data": json.dumps(job, ensure_ascii=False, default=str)}
+    
+    return EventSourceResponse(event_stream(), ping=SSE_KEEPALIVE_SECONDS)
+
 @router.post("/upload", response_model=AgentResponse)
-async def upload_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
-) -> AgentResponse:
+async def upload_file(file: UploadFile = File(...)) -> AgentResponse:
     """
-    파일 업로드 및 분석
+    파일 업로드 및 분석 (작업 큐에 등록하고 작업 ID 반환)
     
     Args:
-        background_tasks: 백그라운드 작업
         file: 업로드된 파일
         
     Returns:
-        처리 결과
+        처리 결과 (details.job_id로 결과 조회)
     """
     try:
         logger.info(f"파일 업로드: {file.filename}")
         
+        # 실행 대기열이 가득 찼으면 작업을 쌓지 않고 바로 거절
+        admission_controller.check()
+        
         # 파일 내용 읽기
         content = await file.read()
         file_text = content.decode("utf-8")
         
-        # 백그라운드에서 처리 (비동기 실행)
-        background_tasks.add_task(agent_graph.run, f"다음 파일을 분석해주세요: {file.filename}\n\n{file_text[:1000]}...")
+        # 작업 큐에 등록 (결과는 GET /jobs/{job_id}로 조회)
+        job_id = await container.job_queue.submit("upload", {
+            "request": f"다음 파일을 분석해주세요: {file.filename}\n\n{file_text[:1000]}...",
+            "filename": file.filename
+        })
         
         return AgentResponse(
             status="accepted",
             message=f"파일 '{file.filename}'이 업로드되었으며 처리 중입니다.",
-            details={"filename": file.filename}
+            details={"filename": file.filename, "job_id": job_id}
+        )
+    except AdmissionRejected as e:
+        logger.warning(f"파일 업로드 거절: {str(e)}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header}
         )
     except Exception as e:
         logger.error(f"파일 업로드 중 오류 발생: {str(e)}")
@@ -169,9 +353,6 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
         await websocket.accept()
         logger.info(f"API-WS: 연결 수락 완료 - client_id={client_id}")
         
-        # 클라이언트 등록
-        websocket_clients[client_id] = websocket
-        
         # 연결 성공 메시지 전송
         logger.info(f"API-WS: 연결 성공 메시지 전송 - client_id={client_id}")
         await websocket.send_json({
@@ -181,77 +362,64 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
         })
         logger.info(f"API-WS: 연결 성공 메시지 전송 완료 - client_id={client_id}")
         
-        # 메시지 대기 루프
+        # 메시지 대기 루프 (요청은 세션이 request_id별 태스크로 실행하므로 실행 중에도 다음 메시지 수신)
+        session = WebSocketSession(websocket, client_id, container.agent_graph)
         try:
             logger.info(f"API-WS: 메시지 대기 시작 - client_id={client_id}")
             while True:
                 # 메시지 수신
                 data = await websocket.receive_text()
                 logger.info(f"API-WS: 메시지 수신 완료 - client_id={client_id}, 데이터 길이: {len(data)}")
-                
-                # JSON 파싱
-                logger.info(f"API-WS: JSON 파싱 시도 - client_id={client_id}")
-                json_data = json.loads(data)
-                logger.info(f"API-WS: JSON 파싱 성공 - client_id={client_id}")
-                
-                # 에이전트 그래프 실행
-                request = json_data.get("request", "")
-                logger.info(f"API-WS: 에이전트 그래프 실행 시작 - client_id={client_id}, 요청: {request[:50]}...")
-                
-                # 저장 경로 확인
-                save_path = json_data.get("save_path")
-                if save_path:
-                    logger.info(f"API-WS: 저장 경로 지정됨 - client_id={client_id}, 경로: {save_path}")
-                
-                # 로그 캡처 초기화
-                log_capture.clear()
-                
-                # 에이전트 그래프 실행
-                result = await agent_graph.run(request, save_path)
-                
-                logger.info(f"API-WS: 에이전트 그래프 실행 완료 - client_id={client_id}")
-                
-                # 응답 전송
-                logger.info(f"API-WS: 응답 전송 시작 - client_id={client_id}")
-                
-                # 응답에 로그 추가
-                result["logs"] = log_capture.get_records()
-                
-                await websocket.send_json(result)
-                logger.info(f"API-WS: 응답 전송 완료 - client_id={client_id}")
-                
-                # 로그 캡처 초기화
-                log_capture.clear()
+                await session.handle_message(data)
         except WebSocketDisconnect:
             logger.info(f"API-WS: 클라이언트 연결 종료 - client_id={client_id}")
         except Exception as e:
-            logger.error(f"API-WS: 메시지 처리 오류 - client_id={client_id}, 오류: {str(e)}")
-            # 클라이언트에게 오류 전송
-            try:
-                await websocket.send_json({
-                    "status": "error",
-                    "message": f"메시지 처리 중 오류가 발생했습니다: {str(e)}"
-                })
-            except:
-                pass
+            logger.error(f"API-WS: 메시지 수신 오류 - client_id={client_id}, 오류: {str(e)}")
+        finally:
+            # 연결이 끊기면 실행 중인 요청과 LLM 호출 모두 취소
+            await session.close()
     except WebSocketDisconnect:
         logger.info(f"API-WS: 클라이언트 연결 종료 - client_id={client_id}, 코드: 1006")
     except Exception as e:
         logger.error(f"API-WS: 연결 설정 오류 - client_id={client_id}, 오류: {str(e)}")
     finally:
-        # 클라이언트 제거
-        if client_id in websocket_clients:
-            del websocket_clients[client_id]
-        
         logger.info(f"API-WS: 클라이언트 연결 종료 처리 완료 - client_id={client_id}")
 
 # 상태 확인 엔드포인트
 @router.get("/health")
-async def health_check() -> Dict[str, str]:
+async def health_check() -> Dict[str, Any]:
     """
     서버 상태 확인
     
     Returns:
-        상태 정보
+        상태 정보 (ready: 에이전트 그래프 준비 완료 여부)
+    """
+    return {"status": "ok", "message": "서버가 정상 동작 중입니다.", "ready": container.ready} 
+
+# LLM 서킷 브레이커 상태 확인 엔드포인트
+@router.get("/llm/breakers")
+async def get_llm_breakers() -> Dict[str, Any]:
+    """
+    모델별 서킷 브레이커 상태 조회
+    
+    Returns:
+        사용 여부와 모델별 상태 (closed/open/half_open, 최근 실패 비율, 열린 횟수 등)
+    """
+    # 워커 프로세스 모드에서는 LLM 호출이 워커에서만 일어나므로 워커가 보고한 상태를 합쳐서 반환
+    if container.worker_pool is not None:
+        return container.worker_pool.breakers_snapshot()
+    return container.llm_client.breakers.snapshot()
+
+# 메트릭 확인 엔드포인트
+@router.get("/metrics")
+async def get_metrics() -> Dict[str, Any]:
+    """
+    메트릭 조회 (LLM 캐시 적중률 등)
+    
+    Returns:
+        메트릭 스냅샷
     """
-    return {"status": "ok", "message": "서버가 정상 동작 중입니다."} 
\ No newline at end of file
+    # 워커 프로세스 모드: 카운터/요약은 워커가 보낸 변화량이 합산되어 있고, 클라이언트 통계는 워커별로 반환
+    if container.worker_pool is not None:
+        return {"metrics": metrics.snapshot(), "workers": container.worker_pool.llm_stats()}
+    return {"metrics": metrics.snapshot(), **container.llm_client.stats()}
@@ -0,0 +1,205 @@
+"""
+WebSocket 세션 모듈
+하나의 연결에서 여러 요청을 동시에 처리 (요청 ID로 응답/진행 프레임을 구분하고 cancel 메시지로 취소)
+"""
+import json
+import uuid
+import asyncio
+from typing import Dict, Any, Optional, TYPE_CHECKING
+from fastapi import WebSocket
+from loguru import logger
+
+from backend.utils.metrics import metrics
+from backend.utils.admission import admission_controller, AdmissionRejected
+from backend.config.settings import WS_MAX_CONCURRENT_REQUESTS
+
+if TYPE_CHECKING:
+    from backend.agents.agent_graph import AgentGraph
+
+class WebSocketSession:
+    """
+    멀티플렉싱 WebSocket 세션
+
+    수신 메시지마다 request_id를 붙여 별도 태스크로 실행하고, 모든 송신은 잠금으로 직렬화한다.
+
+    메시지 형식:
+        {"type": "request", "request_id": "...", "request": "...", "save_path": "...", "stream": true}
+        {"type": "cancel", "request_id": "..."}
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        client_id: str,
+        agent_graph: "AgentGraph",
+        max_concurrent: int = WS_MAX_CONCURRENT_REQUESTS
+    ):
+        """
+        세션 초기화
+
+        Args:
+            websocket: 수락된 WebSocket 연결
+            client_id: 클라이언트 ID
+            agent_graph: 요청을 실행할 에이전트 그래프
+            max_concurrent: 연결당 동시 실행 요청 수 상한
+        """
+        self.websocket = websocket
+        self.client_id = client_id
+        self.agent_graph = agent_graph
+        self.max_concurrent = max_concurrent
+        self.tasks: Dict[str, asyncio.Task] = {}
+        # Reason: 여러 요청 태스크가 같은 연결에 동시에 send하면 프레임이 섞일 수 있으므로 직렬화
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, frame: Dict[str, Any]) -> None:
+        """
+        프레임 전송 (연결이 끊긴 경우 무시)
+
+        Args:
+            frame: 전송할 프레임
+        """
+        try:
+            async with self._send_lock:
+                await self.websocket.send_json(frame)
+        except Exception as e:
+            logger.warning(f"API-WS: 프레임 전송 실패 - client_id={self.client_id}, 오류: {str(e)}")
+
+    async def handle_message(self, data: str) -> None:
+        """
+        수신 메시지 처리 (요청은 태스크로 띄우고 바로 반환하여 다음 메시지를 받을 수 있게 함)
+
+        Args:
+            data: 수신한 텍스트
+        """
+        try:
+            message = json.loads(data)
+        except json.JSONDecodeError as e:
+            await self.send({"type": "error", "status": "error", "message": f"JSON 파싱 오류: {str(e)}"})
+            return
+        if not isinstance(message, dict):
+            # Reason: 예외가 수신 루프로 올라가면 연결이 닫히고 같은 연결의 다른 요청까지 모두 취소됨
+            await self.send({"type": "error", "status": "error", "message": "메시지는 JSON 객체여야 합니다."})
+            return
+
+        message_type = message.get("type", "request")
+        request_id = str(message.get("request_id") or uuid.uuid4().hex)
+
+        if message_type == "cancel":
+            await self.cancel(request_id)
+            return
+
+        if message_type != "request":
+            await self.send({
+                "type": "error",
+                "request_id": request_id,
+                "status": "error",
+                "message": f"알 수 없는 메시지 타입: {message_type}"
+            })
+            return
+
+        if request_id in self.tasks:
+            await self.send({
+                "type": "error",
+                "request_id": request_id,
+                "status": "error",
+                "message": f"이미 실행 중인 요청 ID입니다: {request_id}"
+            })
+            return
+
+        if len(self.tasks) >= self.max_concurrent:
+            metrics.increment("ws_requests_rejected", reason="connection_limit")
+            await self.send({
+                "type": "error",
+                "request_id": request_id,
+                "status": "error",
+                "message": f"연결당 동시 요청 한도({self.max_concurrent}개)를 초과했습니다."
+            })
+            return
+
+        task = asyncio.create_task(self._run_request(request_id, message))
+        self.tasks[request_id] = task
+        task.add_done_callback(lambda _: self.tasks.pop(request_id, None))
+        metrics.increment("ws_requests_started")
+
+    async def _run_request(self, request_id: str, message: Dict[str, Any]) -> None:
+        """
+        요청 하나 실행 (모든 프레임에 request_id를 붙여 전송)
+
+        Args:
+            request_id: 요청 ID
+            message: 요청 메시지
+        """
+        request = message.get("request", "")
+        save_path = message.get("save_path")
+        deadline_seconds = message.get("deadline_seconds")
+        logger.info(f"API-WS: 에이전트 그래프 실행 시작 - client_id={self.client_id}, request_id={request_id}, 요청: {request[:50]}...")
+        if save_path:
+            logger.info(f"API-WS: 저장 경로 지정됨 - client_id={self.client_id}, 경로: {save_path}")
+
+        try:
+            async with admission_controller.slot():
+                if message.get("stream"):
+                    # 스트리밍 모드: 토큰/로그/노드 진행 프레임을 즉시 전송하고 마지막에 result 프레임 전송
+                    async for frame in self.agent_graph.stream(request, save_path, logs=True, deadline_seconds=deadline_seconds):
+                        await self.send({**frame, "request_id": request_id})
+                else:
+                    result = await self.agent_graph.run(request, save_path, deadline_seconds=deadline_seconds)
+                    await self.send({**result, "request_id": request_id})
+            logger.info(f"API-WS: 응답 전송 완료 - client_id={self.client_id}, request_id={request_id}")
+        except AdmissionRejected as e:
+            logger.warning(f"API-WS: 요청 거절 - client_id={self.client_id}, request_id={request_id}, 사유: {e.reason}")
+            metrics.increment("ws_requests_rejected", reason="busy")
+            await self.send({
+                "type": "busy",
+                "request_id": request_id,
+                "status": "busy",
+                "message": str(e),
+                "retry_after": e.retry_after
+            })
+        except asyncio.CancelledError:
+            # 그래프 스트림의 finally에서 실행 중인 노드와 LLM 호출 태스크도 함께 취소됨
+            logger.info(f"API-WS: 요청 취소됨 - client_id={self.client_id}, request_id={request_id}")
+            raise
+        except Exception as e:
+            logger.error(f"API-WS: 메시지 처리 오류 - client_id={self.client_id}, request_id={request_id}, 오류: {str(e)}")
+            await self.send({
+                "type": "error",
+                "request_id": request_id,
+                "status": "error",
+                "message": f"메시지 처리 중 오류가 발생했습니다: {str(e)}"
+            })
+
+    async def cancel(self, request_id: str) -> None:
+        """
+        실행 중인 요청 취소
+
+        Args:
+            request_id: 취소할 요청 ID
+        """
+        task: Optional[asyncio.Task] = self.tasks.get(request_id)
+        if task is None or task.done():
+            await self.send({
+                "type": "error",
+                "request_id": request_id,
+                "status": "error",
+                "message": f"실행 중인 요청을 찾을 수 없습니다: {request_id}"
+            })
+            return
+        task.cancel()
+        # 취소 정리(LLM 호출 중단 등)가 끝난 뒤 알림 (시작 전에 취소된 태스크는 본문이 실행되지 않으므로 여기서 전송)
+        await asyncio.gather(task, return_exceptions=True)
+        metrics.increment("ws_requests_cancelled")
+        await self.send({"type": "cancelled", "request_id": request_id, "status": "cancelled", "message": "요청이 취소되었습니다."})
+
+    async def close(self) -> None:
+        """
+        연결 종료 시 남은 요청 태스크 모두 취소
+        """
+        tasks = [task for task in self.tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            # 클라이언트가 결과를 받지 못하고 떠난 실행 (탭 닫힘 등)
+            logger.info(f"API-WS: 연결 종료로 실행 중인 요청 {len(tasks)}개 취소 - client_id={self.client_id}")
+            metrics.increment("runs_abandoned", value=len(tasks), transport="websocket")
+            await asyncio.gather(*tasks, return_exceptions=True)
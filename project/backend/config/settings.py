@@ -2,6 +2,7 @@
 환경 변수 설정 모듈
 """
 import os
+import json
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -20,22 +21,160 @@ APP_ENV = os.getenv("APP_ENV", "development")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
 BACKEND_PORT = int(os.getenv("BACKEND_PORT", 6000))
 
-# 환경 변수 검증 (개발 또는 테스트 환경에서는 무시)
-if not ANTHROPIC_API_KEY and APP_ENV not in ["development", "test"]:
-    raise ValueError("ANTHROPIC_API_KEY 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
-    
-# 개발 환경에서는 API 키가 없을 경우 로그만 출력
-if APP_ENV == "development" and not ANTHROPIC_API_KEY:
-    from loguru import logger
-    logger.warning("ANTHROPIC_API_KEY가 설정되지 않았습니다. API 호출은 동작하지 않을 수 있습니다.")
+# 환경 변수 검증과 디렉토리 생성은 import 시점이 아니라 애플리케이션 시작 시 수행 (파일 끝의 validate_settings, ensure_directories)
 
 # 업로드 디렉토리 설정
 UPLOAD_DIR = os.path.join(PROJECT_ROOT, "backend", "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 # API 관련 설정
 API_PREFIX = "/api/v1"
 
+# Anthropic HTTP 연결 풀 설정 (모든 에이전트가 공유)
+ANTHROPIC_HTTP2 = os.getenv("ANTHROPIC_HTTP2", "true").lower() == "true"
+ANTHROPIC_MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", 100))
+ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS", 20))
+ANTHROPIC_KEEPALIVE_EXPIRY = float(os.getenv("ANTHROPIC_KEEPALIVE_EXPIRY", 30.0))
+ANTHROPIC_CONNECT_TIMEOUT = float(os.getenv("ANTHROPIC_CONNECT_TIMEOUT", 10.0))
+ANTHROPIC_READ_TIMEOUT = float(os.getenv("ANTHROPIC_READ_TIMEOUT", 600.0))
+
+# Anthropic 계정 티어별 분당 요청/토큰 한도 (ANTHROPIC_RPM/ANTHROPIC_TPM으로 개별 지정 가능, 응답 헤더로 자동 보정)
+ANTHROPIC_TIER_LIMITS = {
+    "1": (50, 40000),
+    "2": (1000, 80000),
+    "3": (2000, 160000),
+    "4": (4000, 400000),
+}
+ANTHROPIC_TIER = os.getenv("ANTHROPIC_TIER", "1")
+_TIER_RPM, _TIER_TPM = ANTHROPIC_TIER_LIMITS.get(ANTHROPIC_TIER, ANTHROPIC_TIER_LIMITS["1"])
+ANTHROPIC_RPM = int(os.getenv("ANTHROPIC_RPM", _TIER_RPM))
+ANTHROPIC_TPM = int(os.getenv("ANTHROPIC_TPM", _TIER_TPM))
+
+# 모델 별칭 (라우팅 표에서 별칭 또는 모델 ID를 사용)
+LLM_MODELS = {
+    "haiku": os.getenv("LLM_MODEL_HAIKU", "claude-3-5-haiku-20241022"),
+    "sonnet": os.getenv("LLM_MODEL_SONNET", "claude-3-5-sonnet-20241022"),
+    "opus": os.getenv("LLM_MODEL_OPUS", "claude-3-opus-20240229"),
+}
+LLM_DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "opus")
+
+# 에이전트/단계별 모델 라우팅 ("에이전트" 또는 "에이전트.단계" 키, "단계" 키가 우선)
+# 예: LLM_MODEL_ROUTES='{"code_generation.generate": "sonnet"}'
+LLM_MODEL_ROUTES = {
+    "supervisor": os.getenv("LLM_MODEL_SUPERVISOR", "haiku"),
+    "planning": os.getenv("LLM_MODEL_PLANNING", "sonnet"),
+    "code_generation": os.getenv("LLM_MODEL_CODE_GENERATION", "opus"),
+}
+LLM_MODEL_ROUTES.update(json.loads(os.getenv("LLM_MODEL_ROUTES", "{}")))
+
+# LLM 호출 재시도 설정 (429/과부하/서버 오류/연결 오류만 재시도, 지수 백오프 + jitter)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", 1.0))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", 30.0))
+
+# LLM 응답 캐시 설정 (기본 비활성화)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(PROJECT_ROOT, "backend", "cache", "llm_cache.sqlite3"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", 86400))
+LLM_CACHE_MEMORY_ITEMS = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", 256))
+LLM_CACHE_DISK_ITEMS = int(os.getenv("LLM_CACHE_DISK_ITEMS", 10000))
+
+# 동시에 들어온 동일 LLM 요청을 API 호출 하나로 합침
+LLM_COALESCE_ENABLED = os.getenv("LLM_COALESCE_ENABLED", "true").lower() == "true"
+
+# LLM 모델별 서킷 브레이커 (최근 LLM_BREAKER_WINDOW번 시도 중 실패/느린 첫 응답 비율이 LLM_BREAKER_FAILURE_RATIO 이상이면 열림)
+# 열린 모델은 LLM_BREAKER_OPEN_SECONDS 동안 호출하지 않고 대체 모델로 전환(없으면 즉시 실패), 이후 시험 호출 하나로 복구 확인
+LLM_BREAKER_ENABLED = os.getenv("LLM_BREAKER_ENABLED", "true").lower() == "true"
+LLM_BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", 20))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", 5))
+LLM_BREAKER_FAILURE_RATIO = float(os.getenv("LLM_BREAKER_FAILURE_RATIO", 0.5))
+# 느린 응답으로 셀 첫 토큰 지연 (초, 첫 토큰 시각을 아는 스트리밍 호출에만 적용)
+LLM_BREAKER_SLOW_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_SECONDS", 30))
+LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", 30))
+
+# 대체 모델 체인 (회로가 열렸거나 재시도 후에도 모델 오류면 순서대로 호출, 별칭 또는 모델 ID)
+# 예: LLM_FALLBACK_MODELS='{"opus": ["sonnet"], "haiku": ["sonnet"]}'
+LLM_FALLBACK_MODELS = {
+    "opus": ["sonnet", "haiku"],
+    "sonnet": ["haiku"],
+}
+LLM_FALLBACK_MODELS.update(json.loads(os.getenv("LLM_FALLBACK_MODELS", "{}")))
+
+# LLM 요청 헤징 (첫 응답이 모델/에이전트별 최근 지연의 LLM_HEDGE_PERCENTILE 백분위를 넘기면 같은 요청을 한 번 더 보냄)
+# 헤지 수는 전체 호출의 LLM_HEDGE_MAX_RATIO 비율로 제한, 표본이 LLM_HEDGE_MIN_SAMPLES개 모이기 전에는 헤징하지 않음
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 95))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", 200))
+LLM_HEDGE_MAX_RATIO = float(os.getenv("LLM_HEDGE_MAX_RATIO", 0.05))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", 0.2))
+
+# LLM 백엔드 ("anthropic": 실제 API, "fake": 결정적 가짜 응답, "record": 실제 응답 녹화, "replay": 녹화 재생)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "anthropic").lower()
+LLM_CASSETTE_DIR = os.getenv("LLM_CASSETTE_DIR", os.path.join(PROJECT_ROOT, "backend", "cache", "cassettes"))
+LLM_REPLAY_SPEED = float(os.getenv("LLM_REPLAY_SPEED", 1.0))
+
+# 가짜 LLM 백엔드 설정 (첫 토큰 지연 중앙값(ms)/로그정규 시그마, 초당 출력 토큰, 출력 토큰 중앙값, 529 오류 비율)
+LLM_FAKE_TTFT_MS = float(os.getenv("LLM_FAKE_TTFT_MS", 400))
+LLM_FAKE_TTFT_SIGMA = float(os.getenv("LLM_FAKE_TTFT_SIGMA", 0.4))
+LLM_FAKE_TOKENS_PER_SECOND = float(os.getenv("LLM_FAKE_TOKENS_PER_SECOND", 80))
+LLM_FAKE_OUTPUT_TOKENS = int(os.getenv("LLM_FAKE_OUTPUT_TOKENS", 400))
+LLM_FAKE_ERROR_RATE = float(os.getenv("LLM_FAKE_ERROR_RATE", 0.0))
+LLM_FAKE_SEED = int(os.getenv("LLM_FAKE_SEED", 0))
+
+# 파일별 코드 생성 팬아웃 설정
+CODEGEN_MAX_FILES = int(os.getenv("CODEGEN_MAX_FILES", 8))
+CODEGEN_MAX_CONCURRENCY = int(os.getenv("CODEGEN_MAX_CONCURRENCY", 4))
+
+# 요청당 LLM 호출 예산 (파일이 여러 개면 추가 파일 수만큼 늘어남) (초과 시 경고 및 llm_call_budget_exceeded 메트릭 증가)
+MAX_LLM_CALLS_PER_REQUEST = int(os.getenv("MAX_LLM_CALLS_PER_REQUEST", 3))
+
+# 슈퍼바이저 분석과 동시에 계획 수립을 추측 실행 (라우팅이 계획 수립이 아니면 결과 폐기)
+# 폐기되면 LLM 호출 1회가 낭비되므로 plan_and_code 요청이 대부분일 때만 켬
+SPECULATIVE_PLANNING = os.getenv("SPECULATIVE_PLANNING", "false").lower() == "true"
+
+# 요청 처리 기한 (초, 0이면 기한 없음) (기한이 되면 완료된 단계까지의 부분 결과 반환)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", 120))
+# 기한에 맞춘 단계적 품질 저하 기준 (결과 정리/응답 전송용 예비 시간, 남은 시간이 각 값보다 적으면 선택 단계 생략/빠른 모델 전환/계획 수립 생략)
+DEADLINE_RESERVE_SECONDS = float(os.getenv("DEADLINE_RESERVE_SECONDS", 2.0))
+DEADLINE_SKIP_OPTIONAL_SECONDS = float(os.getenv("DEADLINE_SKIP_OPTIONAL_SECONDS", 45.0))
+DEADLINE_FAST_MODEL_SECONDS = float(os.getenv("DEADLINE_FAST_MODEL_SECONDS", 30.0))
+DEADLINE_SKIP_PLANNING_SECONDS = float(os.getenv("DEADLINE_SKIP_PLANNING_SECONDS", 20.0))
+DEADLINE_FAST_MODEL = os.getenv("DEADLINE_FAST_MODEL", "haiku")
+# max_tokens를 남은 시간에 맞출 때 가정하는 출력 속도 (토큰/초)와 최소 max_tokens
+DEADLINE_OUTPUT_TOKENS_PER_SECOND = float(os.getenv("DEADLINE_OUTPUT_TOKENS_PER_SECOND", 40.0))
+DEADLINE_MIN_OUTPUT_TOKENS = int(os.getenv("DEADLINE_MIN_OUTPUT_TOKENS", 256))
+
+# 명령어 실행 시간 제한 (초) (요청 기한이 더 짧으면 기한까지)
+COMMAND_TIMEOUT_SECONDS = float(os.getenv("COMMAND_TIMEOUT_SECONDS", 60))
+
+# WebSocket 연결당 동시 실행 요청 수 상한
+WS_MAX_CONCURRENT_REQUESTS = int(os.getenv("WS_MAX_CONCURRENT_REQUESTS", 4))
+
+# 에이전트 실행 승인 제어 (동시 실행 상한, 대기열 길이 상한, 대기 기한(초)) (초과 시 429/busy 응답)
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", 16))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", 32))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 10.0))
+
+# LangGraph 체크포인트 설정 (실패한 실행을 마지막 완료 노드부터 재개)
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", os.path.join(PROJECT_ROOT, "backend", "cache", "checkpoints.sqlite3"))
+CHECKPOINT_MAX_AGE_SECONDS = float(os.getenv("CHECKPOINT_MAX_AGE_SECONDS", 7 * 24 * 3600))
+
+# 비동기 작업 큐 설정 (SQLite에 영속화, 워커 풀이 순서대로 처리)
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(PROJECT_ROOT, "backend", "cache", "jobs.sqlite3"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", 7 * 24 * 3600))
+# 이 시간 동안 생존 신호가 없는 서버 인스턴스의 실행 중 작업을 다시 대기 상태로 (초)
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+# 작업당 최대 실행 시도 횟수 (실행 도중 서버가 죽은 횟수 포함, 넘으면 실패 처리)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+# 그래프 실행 방식 ("inline": API 프로세스에서 실행, "process": 워커 프로세스 풀로 분산)
+WORKER_MODE = os.getenv("WORKER_MODE", "inline").lower()
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", os.cpu_count() or 2))
+WORKER_PROCESS_CONCURRENCY = int(os.getenv("WORKER_PROCESS_CONCURRENCY", 4))
+
 # 환경별 설정
 if APP_ENV == "development":
     DEBUG = True
@@ -48,4 +187,31 @@ else:  # test
     HOST = "localhost"
     # 테스트 환경 특수 설정
     TEST_UPLOAD_DIR = os.path.join(PROJECT_ROOT, "tests", "temp")
-    os.makedirs(TEST_UPLOAD_DIR, exist_ok=True) 
\ No newline at end of file
+
+# 애플리케이션 시작 방식 ("background": 요청을 받으면서 백그라운드에서 에이전트 그래프 준비,
+# "eager": 준비를 마친 뒤 요청 수신, "lazy": 첫 요청에서 준비)
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background").lower()
+
+def validate_settings() -> None:
+    """
+    환경 변수 검증 (개발 또는 테스트 환경에서는 경고만 출력)
+    
+    Raises:
+        ValueError: 운영 환경에서 ANTHROPIC_API_KEY가 설정되지 않은 경우
+    """
+    if not ANTHROPIC_API_KEY and APP_ENV not in ["development", "test"]:
+        raise ValueError("ANTHROPIC_API_KEY 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
+    
+    # 개발 환경에서는 API 키가 없을 경우 로그만 출력
+    if APP_ENV == "development" and not ANTHROPIC_API_KEY:
+        from loguru import logger
+        logger.warning("ANTHROPIC_API_KEY가 설정되지 않았습니다. API 호출은 동작하지 않을 수 있습니다.")
+
+def ensure_directories() -> None:
+    """
+    애플리케이션이 사용하는 디렉토리 생성
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    if APP_ENV not in ["development", "production"]:
+        os.makedirs(TEST_UPLOAD_DIR, exist_ok=True)
+ 
\ No newline at end of file
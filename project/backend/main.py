@@ -3,6 +3,8 @@ FastAPI 애플리케이션 메인 모듈
 """
 import os
 import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 import uvicorn
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,22 +14,48 @@ from loguru import logger
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # 내부 모듈 임포트
-from backend.config.settings import BACKEND_PORT, HOST, DEBUG, API_PREFIX, LOG_LEVEL
-from backend.api.routes import router as api_router
+from backend.config.settings import BACKEND_PORT, HOST, DEBUG, API_PREFIX, LOG_LEVEL, validate_settings, ensure_directories
+from backend.api.routes import router as api_router, container
+from backend.utils.log_capture import log_capture
 
-# 로깅 설정
-logger.remove()
-logger.add(
-    sink=lambda msg: print(msg),
-    level=LOG_LEVEL.upper(),
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-)
+def configure_logging() -> None:
+    """
+    로깅 설정 (import 시점이 아니라 애플리케이션 시작 시 적용)
+    """
+    logger.remove()
+    logger.add(
+        sink=lambda msg: print(msg),
+        level=LOG_LEVEL.upper(),
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    )
+    # 요청별 로그 캡처 싱크 (logger.remove()로 제거되므로 다시 등록)
+    log_capture.install()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    애플리케이션 수명 관리 (시작 시 설정 검증과 구성 요소 구동, 종료 시 정리)
+    
+    Args:
+        app: FastAPI 애플리케이션
+    """
+    configure_logging()
+    validate_settings()
+    ensure_directories()
+    logger.info("애플리케이션 시작")
+    await container.startup()
+    try:
+        yield
+    finally:
+        await container.shutdown()
+        logger.info("애플리케이션 종료")
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
     title="LangGraph 멀티에이전트 시스템",
     description="슈퍼바이저 패턴 기반의 멀티에이전트 시스템 API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS 미들웨어 설정
@@ -91,18 +119,9 @@ async def websocket_test(websocket: WebSocket):
     finally:
         logger.info("WS-TEST: 연결 종료")
 
-# 애플리케이션 시작
-@app.on_event("startup")
-async def startup_event():
-    logger.info("애플리케이션 시작")
-    
-# 애플리케이션 종료
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("애플리케이션 종료")
-
 if __name__ == "__main__":
     # 서버 실행
+    configure_logging()
     logger.info(f"서버 시작 - 호스트: {HOST}, 포트: {BACKEND_PORT}, 디버그 모드: {DEBUG}")
     uvicorn.run(
         "main:app",
@@ -1,7 +1,3 @@
 """
 Utils 모듈 초기화
-""" 
-
-# utils 패키지 초기화
-from . import cursor_integration
-from . import anthropic_client 
\ No newline at end of file
+"""
@@ -0,0 +1,223 @@
+"""
+에이전트 실행 승인 제어
+동시 실행 수를 제한하고 초과 요청은 기한이 있는 대기열에 넣으며, 대기열이 가득 차거나 기한이 지나면 재시도 시점과 함께 거절
+"""
+import math
+import time
+import asyncio
+import contextlib
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Optional, Tuple
+
+from backend.utils.metrics import metrics
+from backend.config.settings import ADMISSION_MAX_IN_FLIGHT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT
+
+# 실행 시간 이동 평균의 초기값과 가중치 (재시도 시점 추정용)
+INITIAL_RUN_SECONDS = 10.0
+RUN_SECONDS_ALPHA = 0.2
+
+# timeout 인자를 생략했을 때 설정의 대기 기한을 쓰기 위한 표식
+_DEFAULT_TIMEOUT: Any = object()
+
+class AdmissionRejected(Exception):
+    """
+    승인 거절 (대기열 포화 또는 대기 기한 초과)
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        """
+        승인 거절 예외 초기화
+
+        Args:
+            reason: 거절 사유 (queue_full, timeout)
+            retry_after: 재시도 권장 대기 시간 (초)
+        """
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"요청이 많아 처리할 수 없습니다 ({reason}). {retry_after:.0f}초 후 다시 시도하세요.")
+
+    @property
+    def retry_after_header(self) -> str:
+        """
+        Retry-After 헤더 값 (정수 초)
+        """
+        return str(max(1, math.ceil(self.retry_after)))
+
+class AdmissionController:
+    """
+    FIFO 승인 제어기
+
+    슬롯이 비면 가장 오래 기다린 대기자에게 바로 넘겨주므로 새 요청이 대기자를 앞지르지 않는다.
+    timeout=None으로 획득하는 대기자(작업 큐 워커 등 자체적으로 동시성이 제한된 호출자)는
+    대기열 상한에 포함하지 않는다.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT
+    ):
+        """
+        승인 제어기 초기화
+
+        Args:
+            max_in_flight: 동시 실행 수 상한
+            max_queue: 대기열 길이 상한
+            queue_timeout: 기본 대기 기한 (초)
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[asyncio.Future, bool]] = deque()
+        self._bounded_waiters = 0
+        self._run_seconds = INITIAL_RUN_SECONDS
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        현재 대기 중인 요청 수
+        """
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        """
+        재시도 권장 대기 시간 추정 (대기열이 한 번 빠지는 데 걸리는 시간)
+
+        Returns:
+            초 단위 추정치
+        """
+        return self._run_seconds * (len(self._waiters) + 1) / self.max_in_flight
+
+    def check(self) -> None:
+        """
+        대기열이 가득 찼으면 바로 거절 (실행을 나중에 하는 작업 등록 전 확인용)
+
+        Raises:
+            AdmissionRejected: 대기열 포화
+        """
+        if self.in_flight >= self.max_in_flight and self._bounded_waiters >= self.max_queue:
+            self._reject("queue_full")
+
+    def _reject(self, reason: str) -> None:
+        """
+        거절 메트릭 기록 후 예외 발생
+
+        Args:
+            reason: 거절 사유
+        """
+        metrics.increment("admission_rejected", reason=reason)
+        raise AdmissionRejected(reason, self.retry_after())
+
+    def _update_gauges(self) -> None:
+        """
+        동시 실행 수와 대기열 길이 게이지 갱신
+        """
+        metrics.set_gauge("admission_in_flight", self.in_flight)
+        metrics.set_gauge("admission_queue_depth", len(self._waiters))
+
+    def _remove_waiter(self, entry: Tuple[asyncio.Future, bool]) -> None:
+        """
+        대기열에서 대기자 제거
+
+        Args:
+            entry: (future, 대기열 상한 적용 여부)
+        """
+        with contextlib.suppress(ValueError):
+            self._waiters.remove(entry)
+            if entry[1]:
+                self._bounded_waiters -= 1
+
+    async def acquire(self, timeout: Optional[float] = _DEFAULT_TIMEOUT) -> None:
+        """
+        실행 슬롯 획득
+
+        Args:
+            timeout: 대기 기한 (초, 생략 시 설정값, None이면 기한 없이 대기)
+
+        Raises:
+            AdmissionRejected: 대기열 포화 또는 대기 기한 초과
+        """
+        if timeout is _DEFAULT_TIMEOUT:
+            timeout = self.queue_timeout
+        bounded = timeout is not None
+
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            metrics.observe("admission_wait_seconds", 0.0)
+            self._update_gauges()
+            return
+
+        if bounded and self._bounded_waiters >= self.max_queue:
+            self._reject("queue_full")
+
+        entry = (asyncio.get_running_loop().create_future(), bounded)
+        self._waiters.append(entry)
+        if bounded:
+            self._bounded_waiters += 1
+        self._update_gauges()
+
+        started = time.monotonic()
+        try:
+            # Reason: wait_for와 달리 asyncio.wait는 기한이 지나도 future를 취소하지 않으므로
+            # 기한 직전에 슬롯을 넘겨받았는지 future 상태로 판별할 수 있음
+            done, _ = await asyncio.wait({entry[0]}, timeout=timeout)
+        except asyncio.CancelledError:
+            if entry[0].done():
+                # 슬롯을 넘겨받은 뒤 취소되었으면 다음 대기자에게 반환
+                self.release()
+            else:
+                self._remove_waiter(entry)
+                entry[0].cancel()
+                self._update_gauges()
+            raise
+
+        metrics.observe("admission_wait_seconds", time.monotonic() - started)
+        if not done:
+            self._remove_waiter(entry)
+            entry[0].cancel()
+            self._update_gauges()
+            self._reject("timeout")
+
+    def release(self, run_seconds: Optional[float] = None) -> None:
+        """
+        실행 슬롯 반환 (대기자가 있으면 가장 오래 기다린 대기자에게 넘김)
+
+        Args:
+            run_seconds: 슬롯을 점유한 시간 (재시도 시점 추정에 반영)
+        """
+        if run_seconds is not None:
+            self._run_seconds += RUN_SECONDS_ALPHA * (run_seconds - self._run_seconds)
+
+        while self._waiters:
+            future, bounded = self._waiters.popleft()
+            if bounded:
+                self._bounded_waiters -= 1
+            if not future.done():
+                future.set_result(None)
+                self._update_gauges()
+                return
+        self.in_flight -= 1
+        self._update_gauges()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, timeout: Optional[float] = _DEFAULT_TIMEOUT) -> AsyncIterator[None]:
+        """
+        실행 슬롯을 점유하는 컨텍스트
+
+        Args:
+            timeout: 대기 기한 (초, 생략 시 설정값, None이면 기한 없이 대기)
+
+        Raises:
+            AdmissionRejected: 대기열 포화 또는 대기 기한 초과
+        """
+        await self.acquire(timeout)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+# 싱글턴 인스턴스
+admission_controller = AdmissionController()
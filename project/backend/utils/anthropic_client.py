@@ -2,138 +2,494 @@
 Anthropic API 클라이언트 유틸리티
 """
 import os
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Awaitable
+import httpx
 from loguru import logger
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 
-from backend.config.settings import ANTHROPIC_API_KEY
+from backend.config.settings import (
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_HTTP2,
+    ANTHROPIC_MAX_CONNECTIONS,
+    ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+    ANTHROPIC_KEEPALIVE_EXPIRY,
+    ANTHROPIC_CONNECT_TIMEOUT,
+    ANTHROPIC_READ_TIMEOUT,
+    ANTHROPIC_RPM,
+    ANTHROPIC_TPM,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MEMORY_ITEMS,
+    LLM_CACHE_DISK_ITEMS,
+    LLM_COALESCE_ENABLED,
+    LLM_BREAKER_ENABLED,
+    LLM_BREAKER_WINDOW,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_FAILURE_RATIO,
+    LLM_BREAKER_SLOW_SECONDS,
+    LLM_BREAKER_OPEN_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_WINDOW,
+    LLM_HEDGE_MAX_RATIO,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_BACKEND,
+)
+from backend.utils.llm_cache import LLMCache, make_cache_key
+from backend.utils.llm_request import resolve_model, split_system_message, user_message, build_request, format_response
+from backend.utils.singleflight import SingleFlight
+from backend.utils.hedging import HedgePolicy
+from backend.utils.circuit_breaker import CircuitBreakerRegistry
+from backend.utils.llm_fallback import acreate_with_fallback, create_with_fallback
+from backend.utils.llm_retry import RetryingCaller
+from backend.utils.llm_backends import OFFLINE_BACKENDS, REQUEST_KEY_BACKENDS, REQUEST_KEY_HEADER, build_transport
+from backend.utils.metrics import metrics, record_llm_call
+from backend.utils.rate_limiter import AdaptiveRateLimiter
+from backend.utils.streaming import current_node
+from backend.utils.deadline import DeadlineExceeded, time_budget
+from backend.utils.llm_deadline import fit_to_deadline
+from backend.utils.lazy import LazyObject
+
+DEFAULT_MODEL = resolve_model()
+
+# 토큰 델타를 받는 콜백 타입
+DeltaHandler = Callable[[str], Awaitable[None]]
+
+def _build_http_options() -> Dict[str, Any]:
+    """
+    동기/비동기 HTTP 클라이언트가 공유하는 연결 풀 옵션 생성
+
+    Returns:
+        httpx 클라이언트 생성 인자
+    """
+    return {
+        "http2": ANTHROPIC_HTTP2,
+        "limits": httpx.Limits(
+            max_connections=ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=ANTHROPIC_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(ANTHROPIC_READ_TIMEOUT, connect=ANTHROPIC_CONNECT_TIMEOUT),
+    }
 
 class AnthropicClient:
     """Anthropic API 클라이언트 클래스"""
-    
-    def __init__(self, api_key: Optional[str] = None):
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[LLMCache] = None):
         """
         Anthropic 클라이언트 초기화
-        
+
         Args:
             api_key: Anthropic API 키 (없으면 환경 변수에서 로드)
+            cache: LLM 응답 캐시 (없으면 LLM_CACHE_ENABLED 설정에 따라 생성)
         """
         self.api_key = api_key or ANTHROPIC_API_KEY
+        if not self.api_key and LLM_BACKEND in OFFLINE_BACKENDS:
+            # 가짜/재생 백엔드는 실제 API를 호출하지 않으므로 키 없이 동작
+            self.api_key = "offline"
         if not self.api_key:
             raise ValueError("Anthropic API 키가 설정되지 않았습니다.")
-        
-        self.client = Anthropic(api_key=self.api_key)
-        logger.info("Anthropic 클라이언트 초기화 완료")
-    
+
+        # Reason: 요청마다 새 연결을 맺지 않도록 HTTP/2 연결 풀을 하나 만들어 모든 에이전트가 공유
+        # 재시도는 속도 제한기와 함께 직접 처리하므로 SDK 자체 재시도는 끔
+        # LLM_BACKEND가 anthropic이 아니면 전송 계층을 가짜/녹화/재생 전송으로 교체
+        http_options = _build_http_options()
+        self.client = Anthropic(
+            api_key=self.api_key,
+            http_client=httpx.Client(transport=build_transport(http_options, sync=True), **http_options),
+            max_retries=0
+        )
+        self.async_client = AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=httpx.AsyncClient(transport=build_transport(http_options), **http_options),
+            max_retries=0
+        )
+        self.rate_limiter = AdaptiveRateLimiter(ANTHROPIC_RPM, ANTHROPIC_TPM)
+        if cache is None and LLM_CACHE_ENABLED:
+            cache = LLMCache(LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MEMORY_ITEMS, LLM_CACHE_DISK_ITEMS)
+        self.cache = cache
+        # 동일 요청이 동시에 들어오면 API 호출 하나를 공유
+        self.inflight = SingleFlight() if LLM_COALESCE_ENABLED else None
+        # 모델별로 실패/느린 응답이 몰리면 회로를 열어 바로 실패하거나 대체 모델로 전환
+        self.breakers = CircuitBreakerRegistry(
+            LLM_BREAKER_ENABLED,
+            LLM_BREAKER_WINDOW,
+            LLM_BREAKER_MIN_CALLS,
+            LLM_BREAKER_FAILURE_RATIO,
+            LLM_BREAKER_SLOW_SECONDS,
+            LLM_BREAKER_OPEN_SECONDS
+        )
+        # 첫 응답이 느린 비동기 호출은 같은 요청을 한 번 더 보내 먼저 온 응답 사용 (꺼져 있어도 지연 표본은 수집)
+        self.hedging = HedgePolicy(
+            LLM_HEDGE_ENABLED,
+            LLM_HEDGE_PERCENTILE,
+            LLM_HEDGE_MIN_SAMPLES,
+            LLM_HEDGE_WINDOW,
+            LLM_HEDGE_MAX_RATIO,
+            LLM_HEDGE_MIN_DELAY
+        )
+        # 모델 하나에 대한 호출/재시도 (대체 모델 전환은 그 바깥에서 처리)
+        self.caller = RetryingCaller(self.client, self.async_client, self.rate_limiter, self.breakers, self.hedging)
+
+        logger.info(
+            f"Anthropic 클라이언트 초기화 완료 (backend={LLM_BACKEND}, http2={ANTHROPIC_HTTP2}, "
+            f"max_connections={ANTHROPIC_MAX_CONNECTIONS})"
+        )
+
+    @classmethod
+    def _prepare(cls, request: Dict[str, Any], agent: Optional[str]) -> Tuple[str, Dict[str, Any], bool]:
+        """
+        요청 지문 계산 후 기한에 맞춰 요청 조정
+
+        Reason: 캐시/합치기/카세트 키는 기한 조정 전 요청으로 만든다. 조정된 max_tokens/모델은 남은 시간마다
+        달라지므로 그대로 키에 넣으면 같은 요청도 매번 다른 키가 된다.
+
+        Args:
+            request: API 호출 인자
+            agent: 메트릭 라벨용 에이전트 이름
+
+        Returns:
+            (요청 지문, 조정된 호출 인자, 기한 때문에 모델/max_tokens를 줄였는지 여부)
+
+        Raises:
+            DeadlineExceeded: 기한이 이미 지난 경우
+        """
+        key = make_cache_key(request)
+        fitted = fit_to_deadline(request, agent)
+        degraded = fitted["model"] != request["model"] or fitted["max_tokens"] != request["max_tokens"]
+        if LLM_BACKEND in REQUEST_KEY_BACKENDS:
+            fitted = {**fitted, "extra_headers": {REQUEST_KEY_HEADER: key}}
+        return key, fitted, degraded
+
+    @staticmethod
+    def _record_usage(result: Dict[str, Any], agent: Optional[str]) -> None:
+        """
+        에이전트별 토큰 사용량 메트릭 기록
+
+        Args:
+            result: 생성 결과
+            agent: 호출한 에이전트 이름 (없으면 현재 그래프 노드)
+        """
+        usage = result.get("usage")
+        if not usage:
+            return
+        labels = {"agent": agent or current_node.get() or "unknown", "model": result.get("model")}
+        for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+            metrics.increment(f"llm_{field}", usage.get(field, 0), **labels)
+
+    @staticmethod
+    def _error_result(label: str, error: Exception) -> Dict[str, Any]:
+        """
+        API 호출 실패 결과 생성
+
+        Args:
+            label: 로그에 표시할 API 종류 (API, Chat API)
+            error: 발생한 예외
+
+        Returns:
+            오류 결과
+        """
+        logger.error(f"Anthropic {label} 호출 실패: {str(error)}")
+        return {
+            "status": "error",
+            "message": f"Anthropic {label} 호출 중 오류 발생: {str(error)}",
+            "content": None
+        }
+
+    def _complete(self, request: Dict[str, Any], chat: bool = False, agent: Optional[str] = None) -> Dict[str, Any]:
+        """
+        동기 완성 호출 (캐시 조회 포함)
+
+        Args:
+            request: API 호출 인자
+            chat: 채팅 완성 여부
+            agent: 사용량 집계용 에이전트 이름
+
+        Returns:
+            생성 결과
+        """
+        label = "Chat API" if chat else "API"
+        try:
+            cache_key, fitted, degraded = self._prepare(request, agent)
+        except DeadlineExceeded as e:
+            return self._error_result(label, e)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                record_llm_call(cached=True)
+                return {**cached, "cached": True}
+
+        record_llm_call()
+        try:
+            result = format_response(create_with_fallback(self.caller.create, fitted, agent), chat=chat)
+        except Exception as e:
+            return self._error_result(label, e)
+
+        self._record_usage(result, agent)
+
+        # 기한 때문에 줄인 응답이나 대체 모델의 응답은 원래 요청의 응답으로 캐시하지 않음
+        if self.cache and not degraded and result["model"] == request["model"]:
+            self.cache.set(cache_key, result)
+        return result
+
+    async def _acomplete(
+        self,
+        request: Dict[str, Any],
+        chat: bool = False,
+        on_delta: Optional[DeltaHandler] = None,
+        agent: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        비동기 완성 호출 (캐시 조회 포함)
+
+        Args:
+            request: API 호출 인자
+            chat: 채팅 완성 여부
+            on_delta: 토큰 델타 콜백
+            agent: 사용량 집계용 에이전트 이름
+
+        Returns:
+            생성 결과
+        """
+        label = "Chat API" if chat else "API"
+        # 합친 호출은 빈 컨텍스트에서 실행되므로 에이전트 이름은 호출자 컨텍스트에서 미리 결정
+        agent = agent or current_node.get()
+        try:
+            cache_key, fitted, degraded = self._prepare(request, agent)
+        except DeadlineExceeded as e:
+            return self._error_result(label, e)
+        if self.cache:
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                # Reason: 스트리밍 클라이언트도 캐시 적중 시 내용을 받을 수 있도록 한 번에 전달
+                if on_delta is not None and cached.get("content"):
+                    await on_delta(cached["content"])
+                record_llm_call(cached=True)
+                return {**cached, "cached": True}
+
+        async def call(delta_handler: Optional[DeltaHandler]) -> Dict[str, Any]:
+            response = await acreate_with_fallback(self.caller.acreate, fitted, delta_handler, agent)
+            result = format_response(response, chat=chat)
+            self._record_usage(result, agent)
+            # 기한 때문에 줄인 응답이나 대체 모델의 응답은 원래 요청의 응답으로 캐시하지 않음
+            if self.cache and not degraded and result["model"] == request["model"]:
+                await self.cache.aset(cache_key, result)
+            return result
+
+        try:
+            # 기한 때문에 줄인 요청은 다른 호출자가 기대하는 응답과 다르므로 합치지 않음
+            if self.inflight is None or degraded:
+                record_llm_call()
+                return await call(on_delta)
+            # 스트리밍 호출과 일반 호출은 델타 전달 방식이 달라 따로 합침
+            flight_key = (cache_key, on_delta is not None)
+            # 요청 통계는 대기자마다 자기 컨텍스트에서 기록 (실행을 시작한 쪽만 실제 API 호출로 셈)
+            record_llm_call(coalesced=self.inflight.in_flight(flight_key))
+            try:
+                # 공유 실행에는 기한이 없으므로 이 호출자의 기한까지만 기다림
+                result, shared = await self.inflight.do(flight_key, call, on_delta, timeout=time_budget())
+            except TimeoutError:
+                raise DeadlineExceeded("요청 처리 기한이 지났습니다.")
+        except Exception as e:
+            return self._error_result(label, e)
+
+        if shared:
+            return {**result, "coalesced": True}
+        return result
+
     def get_completion(
-        self, 
-        prompt: str, 
-        model: str = "claude-3-opus-20240229",
+        self,
+        prompt: str,
+        model: Optional[str] = None,
         system_message: str = "You are a helpful assistant.",
         temperature: float = 0.7,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        cache_system: bool = False,
+        cache_prefix: Optional[str] = None,
+        agent: Optional[str] = None,
+        step: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        텍스트 생성
-        
+        텍스트 생성 (동기 버전, 이벤트 루프 밖의 스크립트용)
+
         Args:
             prompt: 사용자 프롬프트
-            model: 사용할 모델
+            model: 사용할 모델 (없으면 agent/step 라우팅 표로 결정)
             system_message: 시스템 메시지
             temperature: 온도 (창의성 조절)
             max_tokens: 최대 생성 토큰 수
-            
+            cache_system: 시스템 메시지 프롬프트 캐시 여부
+            cache_prefix: 프롬프트 캐시 대상 고정 접두부
+            agent: 사용량 집계 및 모델 라우팅용 에이전트 이름
+            step: 모델 라우팅용 단계 이름
+
         Returns:
             생성 결과
         """
-        try:
-            response = self.client.messages.create(
-                model=model,
-                system=system_message,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            
-            return {
-                "status": "success",
-                "content": response.content[0].text,
-                "model": response.model,
-                "usage": {
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
-                }
-            }
-        except Exception as e:
-            logger.error(f"Anthropic API 호출 실패: {str(e)}")
-            return {
-                "status": "error",
-                "message": f"Anthropic API 호출 중 오류 발생: {str(e)}",
-                "content": None
-            }
-    
+        model = model or resolve_model(agent, step)
+        return self._complete(build_request(
+            model, system_message, [user_message(prompt, cache_prefix)], temperature, max_tokens, cache_system
+        ), agent=agent)
+
+    async def aget_completion(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system_message: str = "You are a helpful assistant.",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        on_delta: Optional[DeltaHandler] = None,
+        cache_system: bool = False,
+        cache_prefix: Optional[str] = None,
+        agent: Optional[str] = None,
+        step: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        텍스트 생성 (비동기 버전, 이벤트 루프를 막지 않음)
+
+        Args:
+            prompt: 사용자 프롬프트
+            model: 사용할 모델 (없으면 agent/step 라우팅 표로 결정)
+            system_message: 시스템 메시지
+            temperature: 온도 (창의성 조절)
+            max_tokens: 최대 생성 토큰 수
+            on_delta: 토큰 델타 콜백 (지정하면 스트리밍 API 사용)
+            cache_system: 시스템 메시지 프롬프트 캐시 여부
+            cache_prefix: 프롬프트 캐시 대상 고정 접두부
+            agent: 사용량 집계 및 모델 라우팅용 에이전트 이름
+            step: 모델 라우팅용 단계 이름
+
+        Returns:
+            생성 결과
+        """
+        model = model or resolve_model(agent, step)
+        return await self._acomplete(build_request(
+            model, system_message, [user_message(prompt, cache_prefix)], temperature, max_tokens, cache_system
+        ), on_delta=on_delta, agent=agent)
+
+    async def aget_tool_call(
+        self,
+        prompt: str,
+        tool: Dict[str, Any],
+        model: Optional[str] = None,
+        system_message: str = "You are a helpful assistant.",
+        temperature: float = 0.0,
+        max_tokens: int = 1000,
+        cache_system: bool = False,
+        agent: Optional[str] = None,
+        step: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        지정한 도구 호출을 강제하여 스키마에 맞는 구조화된 입력 생성 (비동기 버전)
+
+        Args:
+            prompt: 사용자 프롬프트
+            tool: 도구 정의 (name, description, input_schema)
+            model: 사용할 모델 (없으면 agent/step 라우팅 표로 결정)
+            system_message: 시스템 메시지
+            temperature: 온도 (창의성 조절)
+            max_tokens: 최대 생성 토큰 수
+            cache_system: 시스템 메시지 프롬프트 캐시 여부
+            agent: 사용량 집계 및 모델 라우팅용 에이전트 이름
+            step: 모델 라우팅용 단계 이름
+
+        Returns:
+            생성 결과 (도구 입력은 tool_input)
+        """
+        model = model or resolve_model(agent, step)
+        request = build_request(
+            model, system_message, [user_message(prompt)], temperature, max_tokens, cache_system, tool
+        )
+        return await self._acomplete(request, agent=agent)
+
     def get_chat_completion(
-        self, 
-        messages: List[Dict[str, str]], 
-        model: str = "claude-3-opus-20240229",
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        cache_system: bool = False,
+        agent: Optional[str] = None,
+        step: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        채팅 완성 생성
-        
+        채팅 완성 생성 (동기 버전)
+
         Args:
             messages: 메시지 목록 (역할과 내용 포함)
-            model: 사용할 모델
+            model: 사용할 모델 (없으면 agent/step 라우팅 표로 결정)
             temperature: 온도 (창의성 조절)
             max_tokens: 최대 생성 토큰 수
-            
+            cache_system: 시스템 메시지 프롬프트 캐시 여부
+            agent: 사용량 집계 및 모델 라우팅용 에이전트 이름
+            step: 모델 라우팅용 단계 이름
+
         Returns:
             생성 결과
         """
-        try:
-            # 시스템 메시지를 별도로 추출
-            system_message = None
-            chat_messages = []
-            
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_message = msg["content"]
-                else:
-                    chat_messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
-            
-            response = self.client.messages.create(
-                model=model,
-                system=system_message,
-                messages=chat_messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            
-            return {
-                "status": "success",
-                "content": response.content[0].text,
-                "role": "assistant",
-                "model": response.model,
-                "usage": {
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
-                }
-            }
-        except Exception as e:
-            logger.error(f"Anthropic Chat API 호출 실패: {str(e)}")
-            return {
-                "status": "error",
-                "message": f"Anthropic Chat API 호출 중 오류 발생: {str(e)}",
-                "content": None
-            }
-
-# 싱글턴 인스턴스
-anthropic_client = AnthropicClient() 
\ No newline at end of file
+        system_message, chat_messages = split_system_message(messages)
+        model = model or resolve_model(agent, step)
+        return self._complete(build_request(
+            model, system_message, chat_messages, temperature, max_tokens, cache_system
+        ), chat=True, agent=agent)
+
+    async def aget_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        on_delta: Optional[DeltaHandler] = None,
+        cache_system: bool = False,
+        agent: Optional[str] = None,
+        step: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        채팅 완성 생성 (비동기 버전)
+
+        Args:
+            messages: 메시지 목록 (역할과 내용 포함)
+            model: 사용할 모델 (없으면 agent/step 라우팅 표로 결정)
+            temperature: 온도 (창의성 조절)
+            max_tokens: 최대 생성 토큰 수
+            on_delta: 토큰 델타 콜백 (지정하면 스트리밍 API 사용)
+            cache_system: 시스템 메시지 프롬프트 캐시 여부
+            agent: 사용량 집계 및 모델 라우팅용 에이전트 이름
+            step: 모델 라우팅용 단계 이름
+
+        Returns:
+            생성 결과
+        """
+        system_message, chat_messages = split_system_message(messages)
+        model = model or resolve_model(agent, step)
+        return await self._acomplete(build_request(
+            model, system_message, chat_messages, temperature, max_tokens, cache_system
+        ), chat=True, on_delta=on_delta, agent=agent)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        클라이언트 상태 (속도 제한, 응답 캐시, 헤징 통계)
+
+        Returns:
+            /metrics 응답에 들어가는 클라이언트별 통계
+        """
+        return {
+            "rate_limit": self.rate_limiter.snapshot(),
+            "llm_cache": self.cache.get_stats() if self.cache else {"enabled": False},
+            "llm_hedging": self.hedging.stats()
+        }
+
+    async def aclose(self) -> None:
+        """
+        연결 풀 정리 (애플리케이션 종료 시 호출)
+        """
+        await self.async_client.close()
+        self.client.close()
+        if self.cache:
+            self.cache.close()
+        logger.info("Anthropic 클라이언트 연결 풀 종료")
+
+# 싱글턴 인스턴스 (처음 사용할 때 생성하므로 import만으로는 API 키 검증/연결 풀 생성을 하지 않음)
+anthropic_client: AnthropicClient = LazyObject(AnthropicClient, "anthropic_client")
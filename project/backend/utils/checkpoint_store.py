@@ -0,0 +1,178 @@
+"""
+LangGraph 체크포인트 저장소
+실행(run) ID를 thread_id로 사용하여 단계별 그래프 상태를 SQLite에 저장하고, 실패한 실행을 마지막 완료 노드부터 재개
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Dict, Any, Optional
+from loguru import logger
+from langchain_core.pydantic_v1 import PrivateAttr
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.utils import ConfigurableFieldSpec
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointAt
+
+# 오래된 실행 기록 정리 주기 (쓰기 N회마다 한 번)
+PRUNE_INTERVAL = 64
+
+def _seen_dict() -> defaultdict:
+    """
+    versions_seen 내부 사전 생성 (langgraph.checkpoint.base와 동일한 형태)
+
+    Returns:
+        기본값 0인 사전
+    """
+    return defaultdict(int)
+
+def serialize_checkpoint(checkpoint: Checkpoint) -> str:
+    """
+    체크포인트를 JSON 문자열로 직렬화
+
+    Args:
+        checkpoint: LangGraph 체크포인트
+
+    Returns:
+        JSON 문자열
+    """
+    return json.dumps({
+        "v": checkpoint["v"],
+        "ts": checkpoint["ts"],
+        "channel_values": checkpoint["channel_values"],
+        "channel_versions": dict(checkpoint["channel_versions"]),
+        "versions_seen": {node: dict(seen) for node, seen in checkpoint["versions_seen"].items()}
+    }, ensure_ascii=False, default=str)
+
+def deserialize_checkpoint(data: str) -> Checkpoint:
+    """
+    JSON 문자열에서 체크포인트 복원 (버전 사전은 defaultdict로 되돌림)
+
+    Args:
+        data: JSON 문자열
+
+    Returns:
+        LangGraph 체크포인트
+    """
+    raw = json.loads(data)
+    versions_seen = defaultdict(_seen_dict)
+    for node, seen in raw["versions_seen"].items():
+        versions_seen[node].update(seen)
+    return Checkpoint(
+        v=raw["v"],
+        ts=raw["ts"],
+        channel_values=raw["channel_values"],
+        channel_versions=defaultdict(int, raw["channel_versions"]),
+        versions_seen=versions_seen
+    )
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver):
+    """
+    SQLite 기반 체크포인트 저장소 (langgraph 0.0.x에는 메모리 저장소만 포함되어 있어 직접 구현)
+
+    단계가 끝날 때마다 저장하므로, 노드가 예외로 실패하면 마지막으로 완료된 단계의 상태가 남고
+    같은 thread_id로 다시 실행하면 실패한 노드부터 이어서 실행된다.
+    """
+
+    at: CheckpointAt = CheckpointAt.END_OF_STEP
+    db_path: str
+    max_age_seconds: float = 7 * 24 * 3600
+
+    _conn: sqlite3.Connection = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _writes_since_prune: int = PrivateAttr(default=0)
+
+    def __init__(self, **kwargs: Any):
+        """
+        체크포인트 저장소 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+            max_age_seconds: 실행 기록 보존 기간 (초)
+        """
+        super().__init__(**kwargs)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "thread_id TEXT PRIMARY KEY, checkpoint TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_checkpoints_updated_at ON checkpoints(updated_at)")
+        self._conn.commit()
+        logger.info(f"체크포인트 저장소 초기화 완료: {self.db_path}")
+
+    @property
+    def config_specs(self) -> list[ConfigurableFieldSpec]:
+        return [
+            ConfigurableFieldSpec(
+                id="thread_id",
+                annotation=str,
+                name="Thread ID",
+                description="실행(run) ID",
+                default="",
+                is_shared=True,
+            ),
+        ]
+
+    def get(self, config: RunnableConfig) -> Optional[Checkpoint]:
+        """
+        실행 ID의 최신 체크포인트 조회
+
+        Args:
+            config: configurable.thread_id를 포함한 실행 설정
+
+        Returns:
+            체크포인트 또는 None
+        """
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checkpoint FROM checkpoints WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+        return deserialize_checkpoint(row[0]) if row else None
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint) -> None:
+        """
+        체크포인트 저장 (실행 ID당 최신 상태 하나만 유지)
+
+        Args:
+            config: configurable.thread_id를 포함한 실행 설정
+            checkpoint: 저장할 체크포인트
+        """
+        thread_id = config["configurable"]["thread_id"]
+        # Reason: LangGraph가 체크포인트 사전을 제자리에서 갱신하므로 호출 시점에 직렬화해야 상태가 고정됨
+        data = serialize_checkpoint(checkpoint)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint, updated_at) VALUES (?, ?, ?)",
+                (thread_id, data, now)
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= PRUNE_INTERVAL:
+                self._writes_since_prune = 0
+                self._conn.execute("DELETE FROM checkpoints WHERE updated_at < ?", (now - self.max_age_seconds,))
+            self._conn.commit()
+
+    def get_state(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """
+        실행 ID의 마지막 저장 시점 채널 값 조회
+
+        Args:
+            thread_id: 실행 ID
+
+        Returns:
+            채널 이름 → 값 사전 또는 None
+        """
+        checkpoint = self.get({"configurable": {"thread_id": thread_id}})
+        return checkpoint["channel_values"] if checkpoint else None
+
+    def close(self) -> None:
+        """
+        DB 연결 종료
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,275 @@
+"""
+LLM 모델별 서킷 브레이커
+최근 시도의 실패/느린 응답 비율이 기준을 넘으면 회로를 열어 해당 모델 호출을 즉시 실패시키고(대체 모델로 전환),
+일정 시간 뒤 시험 호출 하나(half-open)로 복구 여부를 확인
+"""
+import time
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from anthropic import APIStatusError
+from loguru import logger
+
+from backend.utils.metrics import metrics
+from backend.utils.rate_limiter import is_retryable
+
+# 회로 상태
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpen(Exception):
+    """회로가 열려 모델을 호출하지 않음"""
+
+    def __init__(self, model: str, retry_after: float):
+        """
+        Args:
+            model: 모델 ID
+            retry_after: 시험 호출까지 남은 시간 (초)
+        """
+        super().__init__(f"{model} 모델 회로가 열려 있습니다 ({retry_after:.1f}초 후 재시도)")
+        self.model = model
+        self.retry_after = retry_after
+
+def is_breaker_failure(error: Exception) -> bool:
+    """
+    모델 상태 이상으로 볼 오류인지 판별
+
+    서버 오류/과부하/연결 오류/시간 초과만 세고, 잘못된 요청과 계정 속도 제한(429)은 모델 상태와
+    무관하므로 세지 않는다.
+
+    Args:
+        error: 발생한 예외
+
+    Returns:
+        실패로 셀지 여부
+    """
+    if isinstance(error, APIStatusError) and error.status_code == 429:
+        return False
+    return is_retryable(error)
+
+class CircuitBreaker:
+    """
+    모델 하나의 서킷 브레이커 (스레드 안전, 동기/비동기 호출 공용)
+    """
+
+    def __init__(
+        self,
+        model: str,
+        enabled: bool,
+        window: int,
+        min_calls: int,
+        failure_ratio: float,
+        slow_seconds: float,
+        open_seconds: float
+    ):
+        """
+        서킷 브레이커 초기화
+
+        Args:
+            model: 모델 ID
+            enabled: 회로 차단 사용 여부 (꺼져 있어도 시도 결과는 집계)
+            window: 실패 비율을 계산할 최근 시도 수
+            min_calls: 회로를 열기 위한 최소 시도 수
+            failure_ratio: 회로를 여는 실패(느린 응답 포함) 비율
+            slow_seconds: 느린 응답으로 셀 첫 응답 지연 (초)
+            open_seconds: 회로를 열어 둘 시간 (초)
+        """
+        self.model = model
+        self.enabled = enabled
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._trips = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        """
+        상태 전환 기록 (잠금 안에서 호출)
+
+        Args:
+            state: 새 상태
+        """
+        if state == self.state:
+            return
+        logger.warning(f"LLM 서킷 브레이커 {self.model}: {self.state} -> {state}")
+        metrics.increment("llm_breaker_transitions", model=self.model, state=state)
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self._trips += 1
+        elif state == CLOSED:
+            self._outcomes.clear()
+
+    def retry_after(self) -> float:
+        """
+        열린 회로가 시험 호출을 받기까지 남은 시간
+
+        Returns:
+            남은 시간 (초, 열려 있지 않으면 0)
+        """
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        """
+        호출 허용 여부 확인 (반쯤 열린 회로는 동시에 시험 호출 하나만 허용)
+
+        Raises:
+            CircuitOpen: 회로가 열려 있거나 다른 시험 호출이 진행 중인 경우
+        """
+        with self._lock:
+            if self.state == OPEN and self.retry_after() <= 0:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_after = self.retry_after()
+        metrics.increment("llm_breaker_rejected", model=self.model)
+        raise CircuitOpen(self.model, retry_after)
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        """
+        시도 결과 기록
+
+        Args:
+            ok: 성공 여부
+            latency: 첫 응답(첫 토큰)까지 걸린 시간 (초, 스트리밍으로 성공한 시도만, 없으면 느린 응답 판정 안 함)
+        """
+        slow = ok and latency is not None and latency > self.slow_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                self._transition(CLOSED if ok and not slow else OPEN)
+                return
+            self._outcomes.append((ok, slow))
+            if not self.enabled or self.state != CLOSED or len(self._outcomes) < self.min_calls:
+                return
+            bad = sum(1 for success, was_slow in self._outcomes if not success or was_slow)
+            if bad / len(self._outcomes) >= self.failure_ratio:
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """
+        결과 없이 끝난 시도(취소, 모델 상태와 무관한 오류) 정리
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 상태
+
+        Returns:
+            상태, 최근 시도 수/실패 비율, 열린 횟수, 시험 호출까지 남은 시간
+        """
+        with self._lock:
+            calls = len(self._outcomes)
+            bad = sum(1 for success, was_slow in self._outcomes if not success or was_slow)
+            return {
+                "state": self.state,
+                "recent_calls": calls,
+                "failure_ratio": round(bad / calls, 3) if calls else 0.0,
+                "trips": self._trips,
+                "retry_after": round(self.retry_after(), 2)
+            }
+
+class CircuitBreakerRegistry:
+    """
+    모델 ID별 서킷 브레이커 모음 (처음 호출한 모델에 대해 생성)
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        window: int,
+        min_calls: int,
+        failure_ratio: float,
+        slow_seconds: float,
+        open_seconds: float
+    ):
+        """
+        레지스트리 초기화
+
+        Args:
+            enabled: 회로 차단 사용 여부 (끄면 항상 호출 허용, 상태 집계만 함)
+            window: 실패 비율을 계산할 최근 시도 수
+            min_calls: 회로를 열기 위한 최소 시도 수
+            failure_ratio: 회로를 여는 실패 비율
+            slow_seconds: 느린 응답으로 셀 첫 응답 지연 (초)
+            open_seconds: 회로를 열어 둘 시간 (초)
+        """
+        self.enabled = enabled
+        self._options = (enabled, window, min_calls, failure_ratio, slow_seconds, open_seconds)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> CircuitBreaker:
+        """
+        모델의 서킷 브레이커 조회
+
+        Args:
+            model: 모델 ID
+
+        Returns:
+            서킷 브레이커
+        """
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = self._breakers[model] = CircuitBreaker(model, *self._options)
+            return breaker
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        모든 모델의 서킷 브레이커 상태
+
+        Returns:
+            사용 여부와 모델별 상태
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            "enabled": self.enabled,
+            "models": {model: breaker.snapshot() for model, breaker in breakers.items()}
+        }
+
+def merge_breaker_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 프로세스의 서킷 브레이커 상태를 모델별로 합침 (워커 프로세스 모드)
+
+    Args:
+        snapshots: 프로세스별 CircuitBreakerRegistry.snapshot() 결과
+
+    Returns:
+        모델별 상태 (상태는 가장 나쁜 프로세스 기준, 시도/열린 횟수는 합계, 닫히지 않은 프로세스 수 포함)
+    """
+    severity = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    models: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for model, breaker in snapshot.get("models", {}).items():
+            merged = models.setdefault(model, {
+                "state": CLOSED, "recent_calls": 0, "failure_ratio": 0.0, "trips": 0, "retry_after": 0.0, "open_processes": 0
+            })
+            if severity[breaker["state"]] > severity[merged["state"]]:
+                merged["state"] = breaker["state"]
+            # 실패 비율은 시도 수로 가중 평균
+            calls = merged["recent_calls"] + breaker["recent_calls"]
+            if calls:
+                bad = merged["failure_ratio"] * merged["recent_calls"] + breaker["failure_ratio"] * breaker["recent_calls"]
+                merged["failure_ratio"] = round(bad / calls, 3)
+            merged["recent_calls"] = calls
+            merged["trips"] += breaker["trips"]
+            merged["retry_after"] = max(merged["retry_after"], breaker["retry_after"])
+            merged["open_processes"] += breaker["state"] != CLOSED
+    return models
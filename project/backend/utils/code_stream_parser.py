@@ -0,0 +1,248 @@
+"""
+스트리밍 코드 블록 추출기
+LLM 토큰 델타를 받는 즉시 JSON 봉투와 ``` 코드 펜스를 인식하여 완성된 파일을 반환
+"""
+import re
+import json
+from typing import Dict, Any, List, Optional
+
+# 파서 상태
+TEXT = "text"
+FENCE = "fence"
+JSON = "json"
+
+# 설명문 줄에서 파일명/설명 힌트 추출 (한 줄 단위로만 적용되므로 선형 시간)
+FILENAME_HINT = re.compile(r'"filename"\s*:\s*"([^"]+)"|(?:filename|파일명)\s*[:：]\s*`?([\w./\\-]+)`?', re.IGNORECASE)
+DESCRIPTION_HINT = re.compile(r'"description"\s*:\s*"([^"]+)"')
+
+def strip_code_fence(code: str) -> str:
+    """
+    JSON 봉투의 code 값에 포함된 ``` 펜스 제거
+
+    Args:
+        code: 코드 문자열
+
+    Returns:
+        펜스를 제거한 코드
+    """
+    code = code.strip()
+    if code.startswith("```"):
+        newline = code.find("\n")
+        code = code[newline + 1:] if newline != -1 else ""
+    if code.endswith("```"):
+        code = code[:-3]
+    return code.strip()
+
+class StreamingCodeExtractor:
+    """
+    증분 코드 파일 추출기
+
+    문자마다 한 번만 상태를 전이하므로 전체 응답 길이에 대해 선형 시간으로 동작하고,
+    정규식 역추적이 발생하지 않는다. 펜스가 닫히거나 JSON 객체가 완성되는 즉시 파일을 반환한다.
+    """
+
+    def __init__(self):
+        """
+        추출기 초기화
+        """
+        self._mode = TEXT
+        self._line: List[str] = []
+        # 펜스 상태
+        self._fence_language = ""
+        self._fence_lines: List[str] = []
+        # JSON 상태
+        self._json_chars: List[str] = []
+        self._json_depth = 0
+        self._json_in_string = False
+        self._json_escape = False
+        # 설명문에서 얻은 다음 코드 블록용 힌트
+        self._filename_hint: Optional[str] = None
+        self._description_hint: Optional[str] = None
+        self.files: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        토큰 델타 입력
+
+        Args:
+            chunk: 새로 도착한 텍스트
+
+        Returns:
+            이번 입력으로 완성된 파일 목록
+        """
+        completed: List[Dict[str, Any]] = []
+        for char in chunk:
+            if self._mode == JSON:
+                self._feed_json(char, completed)
+            elif char == "\n":
+                self._end_line(completed)
+            elif self._mode == TEXT and char == "{":
+                self._start_json()
+            else:
+                self._line.append(char)
+        self.files.extend(completed)
+        return completed
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        입력 종료 처리 (닫히지 않은 펜스는 잘린 응답으로 보고 그대로 파일로 반환)
+
+        Returns:
+            마지막으로 완성된 파일 목록
+        """
+        completed: List[Dict[str, Any]] = []
+        if self._mode == JSON:
+            # 잘린 JSON은 파싱할 수 없으므로 버림
+            self._mode = TEXT
+            self._json_chars = []
+        if self._line:
+            self._end_line(completed)
+        if self._mode == FENCE and self._fence_lines:
+            self._emit_fence(completed)
+        self._mode = TEXT
+        self.files.extend(completed)
+        return completed
+
+    def _start_json(self) -> None:
+        """
+        JSON 객체 시작
+        """
+        self._mode = JSON
+        self._line = []
+        self._json_chars = ["{"]
+        self._json_depth = 1
+        self._json_in_string = False
+        self._json_escape = False
+
+    def _feed_json(self, char: str, completed: List[Dict[str, Any]]) -> None:
+        """
+        JSON 모드에서 문자 처리 (문자열/이스케이프를 추적하여 중괄호 깊이 계산)
+
+        Args:
+            char: 입력 문자
+            completed: 완성된 파일을 추가할 목록
+        """
+        if self._json_in_string:
+            self._json_chars.append(char)
+            if self._json_escape:
+                self._json_escape = False
+            elif char == "\\":
+                self._json_escape = True
+            elif char == '"':
+                self._json_in_string = False
+            return
+
+        if char == "`":
+            # Reason: 문자열 밖의 백틱은 JSON이 아니므로 설명문 속 중괄호였던 것으로 보고 텍스트 모드로 복귀
+            self._mode = TEXT
+            self._json_chars = []
+            self._line.append(char)
+            return
+
+        self._json_chars.append(char)
+        if char == '"':
+            self._json_in_string = True
+        elif char == "{":
+            self._json_depth += 1
+        elif char == "}":
+            self._json_depth -= 1
+            if self._json_depth == 0:
+                text = "".join(self._json_chars)
+                self._mode = TEXT
+                self._json_chars = []
+                self._handle_json(text, completed)
+
+    def _end_line(self, completed: List[Dict[str, Any]]) -> None:
+        """
+        한 줄 완성 처리 (펜스 시작/종료 인식 및 힌트 수집)
+
+        Args:
+            completed: 완성된 파일을 추가할 목록
+        """
+        line = "".join(self._line)
+        self._line = []
+        stripped = line.strip()
+
+        if self._mode == FENCE:
+            if stripped == "```":
+                self._emit_fence(completed)
+                self._mode = TEXT
+            else:
+                self._fence_lines.append(line)
+            return
+
+        if stripped.startswith("```"):
+            self._mode = FENCE
+            self._fence_language = stripped[3:].strip().lower()
+            self._fence_lines = []
+            return
+
+        filename_match = FILENAME_HINT.search(line)
+        if filename_match:
+            self._filename_hint = filename_match.group(1) or filename_match.group(2)
+        description_match = DESCRIPTION_HINT.search(line)
+        if description_match:
+            self._description_hint = description_match.group(1)
+
+    def _emit_fence(self, completed: List[Dict[str, Any]]) -> None:
+        """
+        닫힌 코드 펜스를 파일로 변환
+
+        Args:
+            completed: 완성된 파일을 추가할 목록
+        """
+        content = "\n".join(self._fence_lines)
+        language = self._fence_language
+        self._fence_lines = []
+
+        # ```json 펜스 안의 봉투 형식 처리
+        if language == "json" or (not language and content.lstrip().startswith("{")):
+            if self._handle_json(content, completed):
+                return
+
+        completed.append({
+            "filename": self._filename_hint or "",
+            "language": language or "text",
+            "code": content,
+            "description": self._description_hint or f"{language or 'text'} 파일"
+        })
+        self._filename_hint = None
+        self._description_hint = None
+
+    def _handle_json(self, text: str, completed: List[Dict[str, Any]]) -> bool:
+        """
+        완성된 JSON 텍스트를 파일 봉투로 해석
+
+        Args:
+            text: JSON 텍스트
+            completed: 완성된 파일을 추가할 목록
+
+        Returns:
+            파일이 하나 이상 추출되었는지 여부
+        """
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(data, dict):
+            return False
+
+        entries = data.get("files") if isinstance(data.get("files"), list) else [data]
+        found = False
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            if isinstance(entry.get("code"), str) and entry["code"].strip():
+                completed.append({
+                    "filename": str(entry.get("filename") or ""),
+                    "language": str(entry.get("language") or ""),
+                    "code": strip_code_fence(entry["code"]),
+                    "description": str(entry.get("description") or "")
+                })
+                found = True
+            elif entry.get("filename"):
+                # 코드 없이 메타데이터만 있으면 다음 펜스 블록의 힌트로 사용
+                self._filename_hint = str(entry["filename"])
+                if entry.get("description"):
+                    self._description_hint = str(entry["description"])
+        return found
@@ -3,13 +3,19 @@ Cursor 통합 유틸리티
 그룹 유료 구독 환경을 활용한 파일 시스템 기반 연동
 """
 import os
+import signal
 import subprocess
 from pathlib import Path
 import asyncio
 from typing import Dict, Any, List, Optional
 from loguru import logger
 
-from backend.config.settings import CURSOR_WORKSPACE_PATH
+from backend.utils.metrics import metrics
+from backend.utils.deadline import time_budget
+from backend.config.settings import CURSOR_WORKSPACE_PATH, COMMAND_TIMEOUT_SECONDS
+
+# 취소된 명령어의 프로세스 그룹에 SIGTERM을 보낸 뒤 SIGKILL까지 기다리는 시간 (초)
+PROCESS_KILL_GRACE_SECONDS = 2.0
 
 class CursorIntegration:
     """Cursor 통합 클래스"""
@@ -140,9 +146,43 @@ class CursorIntegration:
                 "message": f"파일 업데이트 중 오류 발생: {str(e)}"
             }
     
+    def command_timeout(self) -> float:
+        """
+        명령어 실행 시간 제한 (기본 제한과 요청 처리 기한까지 남은 시간 중 짧은 쪽)
+        
+        Returns:
+            시간 제한 (초)
+        """
+        budget = time_budget()
+        return COMMAND_TIMEOUT_SECONDS if budget is None else min(COMMAND_TIMEOUT_SECONDS, budget)
+    
+    def timed_out_result(self, command: str, timeout: float, stdout: str = "", stderr: str = "") -> Dict[str, Any]:
+        """
+        시간 제한 초과로 중단된 명령어 결과
+        
+        Args:
+            command: 실행한 명령어
+            timeout: 적용한 시간 제한 (초)
+            stdout: 중단 전까지의 표준 출력
+            stderr: 중단 전까지의 표준 오류
+            
+        Returns:
+            실행 결과 (timed_out 표시 포함)
+        """
+        logger.warning(f"명령어 실행 시간 제한 초과 ({timeout:.1f}초): {command}")
+        metrics.increment("command_timeouts")
+        return {
+            "status": "error",
+            "message": f"명령어 실행 시간 제한 초과 ({timeout:.1f}초)",
+            "stdout": stdout,
+            "stderr": stderr,
+            "return_code": -1,
+            "timed_out": True
+        }
+    
     def execute_code(self, command: str, working_dir: Optional[str] = None) -> Dict[str, Any]:
         """
-        코드 실행
+        코드 실행 (시간 제한을 넘기면 프로세스 그룹을 종료)
         
         Args:
             command: 실행할 명령어
@@ -153,16 +193,28 @@ class CursorIntegration:
         """
         try:
             cwd = os.path.join(self.workspace_path, working_dir) if working_dir else self.workspace_path
+            timeout = self.command_timeout()
             
             logger.info(f"명령어 실행: {command} (작업 디렉토리: {cwd})")
-            result = subprocess.run(command, shell=True, cwd=cwd, 
-                                  capture_output=True, text=True)
+            process = subprocess.Popen(command, shell=True, cwd=cwd, 
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, start_new_session=True)
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                # 셸이 띄운 하위 프로세스까지 종료해야 파이프가 닫혀 communicate가 반환됨
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                stdout, stderr = process.communicate()
+                return self.timed_out_result(command, timeout, stdout, stderr)
             
             return {
-                "status": "success" if result.returncode == 0 else "error",
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode
+                "status": "success" if process.returncode == 0 else "error",
+                "stdout": stdout,
+                "stderr": stderr,
+                "return_code": process.returncode
             }
         except Exception as e:
             logger.error(f"명령어 실행 실패: {str(e)}")
@@ -190,14 +242,25 @@ class CursorIntegration:
             
             logger.info(f"비동기 명령어 실행: {command} (작업 디렉토리: {cwd})")
             
+            # 셸이 띄운 하위 프로세스까지 한 번에 종료할 수 있도록 새 세션(프로세스 그룹)으로 실행
             process = await asyncio.create_subprocess_shell(
                 command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=cwd
+                cwd=cwd,
+                start_new_session=True
             )
             
-            stdout, stderr = await process.communicate()
+            timeout = self.command_timeout()
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await self._kill_process_group(process)
+                return self.timed_out_result(command, timeout)
+            except asyncio.CancelledError:
+                # 요청이 취소되면(클라이언트 연결 종료 등) 명령어도 중단
+                await self._kill_process_group(process)
+                raise
             
             return {
                 "status": "success" if process.returncode == 0 else "error",
@@ -213,4 +276,26 @@ class CursorIntegration:
                 "stdout": "",
                 "stderr": str(e),
                 "return_code": -1
-            } 
\ No newline at end of file
+            }
+    
+    async def _kill_process_group(self, process: asyncio.subprocess.Process) -> None:
+        """
+        취소되거나 시간 제한을 넘긴 명령어의 프로세스 그룹 종료 (SIGTERM 후 유예 시간 안에 끝나지 않으면 SIGKILL)
+        
+        Args:
+            process: 셸 프로세스 (start_new_session으로 띄워 pid가 프로세스 그룹 ID)
+        """
+        if process.returncode is not None:
+            return
+        logger.warning(f"명령어의 프로세스 그룹 종료: pid={process.pid}")
+        metrics.increment("subprocess_killed")
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                return
+            try:
+                await asyncio.wait_for(process.wait(), PROCESS_KILL_GRACE_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                continue
@@ -0,0 +1,90 @@
+"""
+요청 처리 기한 전파
+실행마다 기한(epoch 초)을 AgentState의 deadline_at과 컨텍스트 변수로 전달하여,
+에이전트와 LLM 호출/명령어 실행이 남은 시간에 맞춰 작업량을 줄이고 기한을 넘기지 않도록 함
+"""
+import time
+import asyncio
+import contextlib
+from contextvars import ContextVar
+from typing import Any, Iterator, Mapping, Optional
+
+# 현재 실행의 기한 (epoch 초, 없으면 기한 없음)
+# Reason: LLM 클라이언트/명령어 실행처럼 상태를 받지 않는 하위 호출까지 전달하기 위해 컨텍스트 변수 사용
+current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """요청 처리 기한 초과"""
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """
+    지금부터 seconds 뒤의 기한
+
+    Args:
+        seconds: 처리 시간 예산 (초, 없거나 0 이하면 기한 없음)
+
+    Returns:
+        기한 (epoch 초) 또는 None
+    """
+    if not seconds or seconds <= 0:
+        return None
+    return time.time() + seconds
+
+def remaining_seconds(state: Optional[Mapping[str, Any]] = None) -> Optional[float]:
+    """
+    기한까지 남은 시간
+
+    컨텍스트 변수의 기한을 우선 사용하고(재개한 실행은 새 기한을 받음), 없으면 상태의 deadline_at을 사용한다.
+
+    Args:
+        state: 에이전트 상태
+
+    Returns:
+        남은 시간 (초, 음수면 이미 지남) 또는 None (기한 없음)
+    """
+    deadline_at = current_deadline.get() or (state or {}).get("deadline_at")
+    if deadline_at is None:
+        return None
+    return deadline_at - time.time()
+
+def time_budget(state: Optional[Mapping[str, Any]] = None, reserve: float = 0.0) -> Optional[float]:
+    """
+    reserve만큼 남겨두고 쓸 수 있는 시간 (asyncio.timeout 등에 그대로 전달)
+
+    Args:
+        state: 에이전트 상태
+        reserve: 뒤 단계(결과 정리, 응답 전송)를 위해 남겨둘 시간 (초)
+
+    Returns:
+        사용할 수 있는 시간 (초, 0 이상) 또는 None (기한 없음)
+    """
+    remaining = remaining_seconds(state)
+    if remaining is None:
+        return None
+    return max(0.0, remaining - reserve)
+
+def loop_deadline(deadline_at: float) -> float:
+    """
+    epoch 기한을 이벤트 루프 시간으로 변환 (asyncio.timeout_at용)
+
+    Args:
+        deadline_at: 기한 (epoch 초)
+
+    Returns:
+        이벤트 루프 기준 기한
+    """
+    return asyncio.get_running_loop().time() + (deadline_at - time.time())
+
+@contextlib.contextmanager
+def deadline_scope(deadline_at: Optional[float]) -> Iterator[None]:
+    """
+    블록 안의 호출(과 블록에서 만든 태스크)에 기한 적용
+
+    Args:
+        deadline_at: 기한 (epoch 초, None이면 기한 없음)
+    """
+    token = current_deadline.set(deadline_at)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
@@ -0,0 +1,284 @@
+"""
+LLM 요청 헤징 (hedged request)
+첫 응답이 모델/에이전트별 지연 백분위수를 넘기도록 오지 않으면 같은 요청을 한 번 더 보내고,
+먼저 응답한 쪽을 쓰고 나머지는 취소하여 꼬리 지연을 줄임
+"""
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from loguru import logger
+
+from backend.utils.metrics import metrics
+
+# 델타 콜백 타입 (anthropic_client.DeltaHandler와 동일)
+DeltaHandler = Callable[[str], Awaitable[None]]
+
+# 헤지 예산으로 모아둘 수 있는 최대 크레딧 (한꺼번에 몰아서 헤징할 수 있는 횟수)
+HEDGE_BUDGET_BURST = 3.0
+
+# 헤징 키 (모델, 에이전트, 호출 방식)
+HedgeKey = Tuple[str, str, str]
+
+class LatencyTracker:
+    """
+    키별 최근 첫 응답 지연 표본 (고정 크기 창)
+    """
+
+    def __init__(self, window: int):
+        """
+        지연 추적기 초기화
+
+        Args:
+            window: 키별로 보관할 최근 표본 수
+        """
+        self.window = window
+        self._samples: Dict[Hashable, Deque[float]] = {}
+
+    def add(self, key: Hashable, seconds: float) -> None:
+        """
+        표본 추가
+
+        Args:
+            key: 헤징 키
+            seconds: 첫 응답까지 걸린 시간 (초)
+        """
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, key: Hashable, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        백분위수 조회
+
+        Args:
+            key: 헤징 키
+            q: 백분위 (0~100)
+            min_samples: 최소 표본 수 (부족하면 None)
+
+        Returns:
+            백분위수 (초) 또는 None
+        """
+        samples = self._samples.get(key)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def keys(self) -> list:
+        """
+        표본이 있는 키 목록
+
+        Returns:
+            키 목록
+        """
+        return list(self._samples)
+
+class HedgePolicy:
+    """
+    헤징 정책 (지연 기준, 예산, 통계)
+
+    호출마다 max_ratio만큼 크레딧이 쌓이고 헤지 한 번에 1을 쓰므로, 헤지 요청 수는
+    전체 호출의 max_ratio 비율(+ HEDGE_BUDGET_BURST)을 넘지 않는다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        percentile: float,
+        min_samples: int,
+        window: int,
+        max_ratio: float,
+        min_delay: float
+    ):
+        """
+        헤징 정책 초기화
+
+        Args:
+            enabled: 헤징 사용 여부 (꺼져 있어도 지연 표본은 수집)
+            percentile: 헤지를 보낼 첫 응답 지연 백분위 (0~100)
+            min_samples: 헤징을 시작할 최소 표본 수
+            window: 키별 표본 창 크기
+            max_ratio: 전체 호출 대비 최대 헤지 비율
+            min_delay: 헤지를 보내기 전 최소 대기 시간 (초)
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.min_delay = min_delay
+        self.tracker = LatencyTracker(window)
+        self._lock = threading.Lock()
+        self._credits = 0.0
+        self._stats = {"calls": 0, "hedged": 0, "primary_won": 0, "hedge_won": 0, "budget_exhausted": 0}
+
+    def hedge_delay(self, key: HedgeKey) -> Optional[float]:
+        """
+        헤지를 보낼 때까지 기다릴 시간
+
+        Args:
+            key: 헤징 키
+
+        Returns:
+            대기 시간 (초), 헤징하지 않으면 None
+        """
+        if not self.enabled:
+            return None
+        threshold = self.tracker.percentile(key, self.percentile, self.min_samples)
+        if threshold is None:
+            return None
+        return max(threshold, self.min_delay)
+
+    def _note_call(self) -> None:
+        """
+        호출 한 번을 집계하고 헤지 크레딧 적립
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            self._credits = min(HEDGE_BUDGET_BURST, self._credits + self.max_ratio)
+
+    def _spend(self) -> bool:
+        """
+        헤지 크레딧 사용
+
+        Returns:
+            헤지 가능 여부 (크레딧이 부족하면 False)
+        """
+        with self._lock:
+            if self._credits < 1.0:
+                self._stats["budget_exhausted"] += 1
+                return False
+            self._credits -= 1.0
+            self._stats["hedged"] += 1
+            return True
+
+    def _record_win(self, key: HedgeKey, winner: str) -> None:
+        """
+        헤지한 호출의 승자 집계
+
+        Args:
+            key: 헤징 키
+            winner: primary 또는 hedge
+        """
+        with self._lock:
+            self._stats[f"{winner}_won"] += 1
+        model, agent, _ = key
+        metrics.increment("llm_hedges", model=model, agent=agent, winner=winner)
+
+    @staticmethod
+    def _discard(task: asyncio.Task) -> None:
+        """
+        진 호출 태스크 정리 (취소하고, 이미 실패했으면 예외를 확인 처리)
+
+        Args:
+            task: 정리할 태스크
+        """
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
+
+    async def run(
+        self,
+        key: HedgeKey,
+        call: Callable[[Optional[DeltaHandler], bool], Awaitable[Any]],
+        on_delta: Optional[DeltaHandler] = None
+    ) -> Any:
+        """
+        헤징을 적용해 호출
+
+        스트리밍 호출은 첫 델타, 일반 호출은 응답 완료를 첫 응답으로 보며, 첫 응답을 낸 쪽만 on_delta로
+        델타를 전달하므로 두 호출의 내용이 섞이지 않는다. 헤지 전에 원래 호출이 실패하면 그 오류를 그대로 올린다.
+
+        Args:
+            key: 헤징 키 (모델, 에이전트, 호출 방식)
+            call: 호출 함수 (델타 콜백, 헤지 여부를 받아 응답 반환)
+            on_delta: 토큰 델타 콜백
+
+        Returns:
+            먼저 응답한 호출의 응답
+        """
+        loop = asyncio.get_running_loop()
+        self._note_call()
+        winner: Dict[str, Optional[str]] = {"name": None}
+        responded = asyncio.Event()
+
+        def claim(name: str, started: float) -> bool:
+            # 첫 응답을 낸 호출이 승자가 되고 지연 표본을 남김
+            if winner["name"] is None:
+                winner["name"] = name
+                self.tracker.add(key, loop.time() - started)
+                responded.set()
+            return winner["name"] == name
+
+        async def attempt(name: str) -> Any:
+            started = loop.time()
+            handler = None
+            if on_delta is not None:
+                async def handler(text: str) -> None:
+                    if claim(name, started):
+                        await on_delta(text)
+            response = await call(handler, name == "hedge")
+            claim(name, started)
+            return response
+
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return await attempt("primary")
+
+        primary = asyncio.create_task(attempt("primary"))
+        waiter = asyncio.create_task(responded.wait())
+        hedge: Optional[asyncio.Task] = None
+        try:
+            await asyncio.wait({primary, waiter}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+            if responded.is_set() or primary.done() or not self._spend():
+                return await primary
+
+            logger.info(f"LLM 요청 헤지 ({key[0]}, {key[1]}): 첫 응답이 {delay:.2f}초 안에 오지 않음")
+            hedge = asyncio.create_task(attempt("hedge"))
+            pending = {primary, hedge}
+            while True:
+                await asyncio.wait(pending | {waiter}, return_when=asyncio.FIRST_COMPLETED)
+                if responded.is_set():
+                    name = winner["name"]
+                    self._record_win(key, name)
+                    won, lost = (primary, hedge) if name == "primary" else (hedge, primary)
+                    self._discard(lost)
+                    return await won
+                # 첫 응답 없이 끝난 호출은 실패한 것이므로 남은 호출을 기다리고, 둘 다 실패하면 원래 호출의 오류를 올림
+                pending = {task for task in pending if not task.done()}
+                if not pending:
+                    self._discard(hedge)
+                    return await primary
+        finally:
+            for task in (primary, hedge, waiter):
+                if task is not None:
+                    self._discard(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        헤징 통계
+
+        Returns:
+            호출/헤지 수, 헤지 비율, 승자별 횟수, 키별 현재 헤지 기준
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            credits = self._credits
+        thresholds = {}
+        for key in self.tracker.keys():
+            threshold = self.tracker.percentile(key, self.percentile, self.min_samples)
+            if threshold is not None:
+                thresholds["/".join(key)] = round(max(threshold, self.min_delay), 3)
+        hedged = stats["hedged"]
+        return {
+            "enabled": self.enabled,
+            **stats,
+            "hedge_rate": hedged / stats["calls"] if stats["calls"] else 0.0,
+            "hedge_win_rate": stats["hedge_won"] / hedged if hedged else 0.0,
+            "budget_credits": round(credits, 3),
+            "thresholds": thresholds
+        }
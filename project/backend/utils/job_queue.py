@@ -0,0 +1,482 @@
+"""
+비동기 작업(job) 큐
+SQLite에 작업을 영속화하고 제한된 수의 워커가 큐를 비우며, 진행 이벤트를 구독자에게 전달
+"""
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import asyncio
+import threading
+import itertools
+import contextlib
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Deque, Iterator, List, Set, Tuple
+from loguru import logger
+
+from backend.utils.metrics import metrics
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+# 늦게 구독한 클라이언트에게 다시 보내는 최근 진행 이벤트 수
+EVENT_HISTORY_SIZE = 200
+
+ProgressPublisher = Callable[[Dict[str, Any]], None]
+JobHandler = Callable[[Dict[str, Any], ProgressPublisher], Awaitable[Dict[str, Any]]]
+
+class JobStore:
+    """
+    SQLite 작업 저장소 (여러 uvicorn 워커 프로세스가 공유)
+    """
+
+    def __init__(self, db_path: str):
+        """
+        작업 저장소 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # 트랜잭션을 직접 관리 (BEGIN IMMEDIATE로 프로세스 간 작업 선점 직렬화)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, "
+            "result TEXT, error TEXT, owner TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at)")
+        # 작업 큐 인스턴스(프로세스 부팅마다 새 ID)별 마지막 생존 신호
+        self._conn.execute("CREATE TABLE IF NOT EXISTS job_owners (owner TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)")
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        DB 행을 작업 사전으로 변환
+
+        Args:
+            row: DB 행
+
+        Returns:
+            작업 정보
+        """
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "payload": json.loads(row["payload"]),
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"]
+        }
+
+    def create(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        작업 등록
+
+        Args:
+            kind: 작업 종류 (process, upload 등)
+            payload: 작업 입력
+
+        Returns:
+            작업 ID
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), QUEUED, time.time())
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 조회
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 정보 또는 None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim(self, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        가장 오래된 대기 작업 하나를 선점
+
+        Args:
+            owner: 선점하는 작업 큐 인스턴스 ID
+
+        Returns:
+            선점한 작업 또는 None
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, owner = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (RUNNING, owner, time.time(), row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = self._to_dict(row)
+        job["status"] = RUNNING
+        return job
+
+    def finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """
+        작업 완료 기록
+
+        Args:
+            job_id: 작업 ID
+            status: 최종 상태 (succeeded, failed)
+            result: 실행 결과
+            error: 오류 메시지
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                 error, time.time(), job_id)
+            )
+
+    def heartbeat(self, owner: str) -> None:
+        """
+        작업 큐 인스턴스 생존 신호 기록
+
+        Args:
+            owner: 작업 큐 인스턴스 ID
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_owners (owner, heartbeat_at) VALUES (?, ?)", (owner, time.time())
+            )
+
+    def release_owner(self, owner: str) -> None:
+        """
+        작업 큐 인스턴스 등록 해제 (실행 중이던 작업은 다음 정리 때 바로 복구됨)
+
+        Args:
+            owner: 작업 큐 인스턴스 ID
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM job_owners WHERE owner = ?", (owner,))
+
+    def requeue_orphans(self, lease_seconds: float, max_attempts: int) -> Tuple[int, int]:
+        """
+        생존 신호가 끊긴 인스턴스가 실행 중이던 작업을 대기 상태로 되돌림
+
+        Reason: 컨테이너가 재시작되면 새 프로세스가 이전과 같은 PID(대개 1)를 받으므로 PID 생존 여부로는
+        고아 작업을 가려낼 수 없다. 부팅마다 새로 만든 인스턴스 ID의 생존 신호(lease)로 판단한다.
+        실행 도중 워커를 죽이는 작업이 끝없이 다시 실행되지 않도록 max_attempts번 시작한 작업은 실패 처리한다.
+
+        Args:
+            lease_seconds: 이 시간 동안 생존 신호가 없으면 인스턴스가 종료된 것으로 간주 (초)
+            max_attempts: 작업당 최대 실행 시도 횟수
+
+        Returns:
+            (대기 상태로 되돌린 작업 수, 실패 처리한 작업 수)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM job_owners WHERE heartbeat_at < ?", (now - lease_seconds,))
+                rows = self._conn.execute(
+                    "SELECT id, attempts FROM jobs WHERE status = ? "
+                    "AND (owner IS NULL OR owner NOT IN (SELECT owner FROM job_owners))",
+                    (RUNNING,)
+                ).fetchall()
+                requeued = failed = 0
+                for row in rows:
+                    if row["attempts"] >= max_attempts:
+                        self._conn.execute(
+                            "UPDATE jobs SET status = ?, owner = NULL, error = ?, finished_at = ? WHERE id = ?",
+                            (FAILED, f"작업 실행이 {row['attempts']}번 중단되어 더 이상 재시도하지 않습니다.", now, row["id"])
+                        )
+                        failed += 1
+                    else:
+                        self._conn.execute("UPDATE jobs SET status = ?, owner = NULL WHERE id = ?", (QUEUED, row["id"]))
+                        requeued += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return requeued, failed
+
+    def prune(self, max_age_seconds: float) -> int:
+        """
+        오래된 완료 작업 삭제
+
+        Args:
+            max_age_seconds: 완료 후 보존 기간 (초)
+
+        Returns:
+            삭제한 작업 수
+        """
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (*FINISHED_STATUSES, time.time() - max_age_seconds)
+            ).rowcount
+
+    def close(self) -> None:
+        """
+        DB 연결 종료
+        """
+        with self._lock:
+            self._conn.close()
+
+class JobQueue:
+    """
+    영속 작업 큐와 워커 풀
+
+    submit은 작업을 저장만 하고 즉시 반환하며, 워커가 handler로 실행한 결과를 저장소에 기록한다.
+    진행 이벤트는 같은 프로세스의 구독자에게 실시간으로 전달된다.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: JobHandler,
+        num_workers: int,
+        poll_interval: float = 1.0,
+        retention_seconds: float = 7 * 24 * 3600,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3
+    ):
+        """
+        작업 큐 초기화
+
+        Args:
+            store: 작업 저장소
+            handler: 작업 실행 함수 (작업, 진행 이벤트 발행 함수) -> 결과
+            num_workers: 동시 실행 워커 수
+            poll_interval: 다른 프로세스가 등록한 작업 확인 주기 (초)
+            retention_seconds: 완료 작업 보존 기간 (초)
+            lease_seconds: 생존 신호가 끊긴 인스턴스의 작업을 복구하기까지의 시간 (초)
+            max_attempts: 작업당 최대 실행 시도 횟수 (중단된 실행 포함)
+        """
+        self.store = store
+        self.handler = handler
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # 부팅마다 새로 만드는 인스턴스 ID (호스트:PID는 로그 확인용, PID가 재사용돼도 uuid로 구분)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._maintenance: Optional[asyncio.Task] = None
+        self._history: Dict[str, Deque[Dict[str, Any]]] = {}
+        # 작업별 진행 이벤트 일련번호 (SSE 이벤트 ID, 재연결 시 Last-Event-ID 이후부터 전송)
+        self._sequences: Dict[str, Iterator[int]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def start(self) -> None:
+        """
+        워커 풀 시작 (종료된 인스턴스가 남긴 실행 중 작업 복구)
+        """
+        if self._workers:
+            return
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self.store.heartbeat, self.owner)
+        await self._recover()
+        pruned = await asyncio.to_thread(self.store.prune, self.retention_seconds)
+        if pruned:
+            logger.info(f"작업 큐 정리: 완료 작업 {pruned}개 삭제")
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.num_workers)]
+        self._maintenance = asyncio.create_task(self._maintain())
+        logger.info(f"작업 워커 {self.num_workers}개 시작 ({self.owner})")
+
+    async def stop(self) -> None:
+        """
+        워커 풀 중지 (실행 중이던 작업은 다음 시작 시 대기 상태로 복구됨)
+        """
+        tasks = self._workers + ([self._maintenance] if self._maintenance else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._maintenance = None
+        await asyncio.to_thread(self.store.release_owner, self.owner)
+
+    async def _recover(self) -> None:
+        """
+        생존 신호가 끊긴 인스턴스의 작업 복구 (최대 시도 횟수를 넘긴 작업은 실패 처리)
+        """
+        requeued, failed = await asyncio.to_thread(self.store.requeue_orphans, self.lease_seconds, self.max_attempts)
+        if requeued:
+            metrics.increment("jobs_recovered", requeued, outcome="requeued")
+            self._wakeup.set()
+        if failed:
+            metrics.increment("jobs_recovered", failed, outcome="failed")
+        if requeued or failed:
+            logger.info(f"중단된 작업 복구: 재시도 {requeued}개, 실패 처리 {failed}개")
+
+    async def _maintain(self) -> None:
+        """
+        생존 신호를 주기적으로 기록하고 다른 인스턴스가 남긴 작업 복구
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, self.owner)
+                await self._recover()
+            except sqlite3.Error as e:
+                logger.warning(f"작업 큐 생존 신호 기록 실패: {str(e)}")
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        작업 등록 후 즉시 반환
+
+        Args:
+            kind: 작업 종류
+            payload: 작업 입력
+
+        Returns:
+            작업 ID
+        """
+        job_id = await asyncio.to_thread(self.store.create, kind, payload)
+        metrics.increment("jobs_submitted", kind=kind)
+        self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 조회
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 정보 또는 None
+        """
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _worker(self, index: int) -> None:
+        """
+        워커 루프 (대기 작업이 없으면 submit 알림 또는 poll_interval까지 대기)
+
+        Args:
+            index: 워커 번호
+        """
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim, self.owner)
+            except sqlite3.Error as e:
+                logger.warning(f"작업 선점 실패 (워커 {index}): {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                continue
+
+            await self._run_job(job)
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        """
+        작업 하나 실행 및 결과 기록
+
+        Args:
+            job: 선점한 작업
+        """
+        job_id = job["job_id"]
+        self._history[job_id] = deque(maxlen=EVENT_HISTORY_SIZE)
+        self._sequences[job_id] = itertools.count(1)
+        self.publish(job_id, {"type": "status", "status": RUNNING})
+        logger.info(f"작업 실행 시작: {job_id} ({job['kind']})")
+        started = time.perf_counter()
+
+        try:
+            result = await self.handler(job, lambda event: self.publish(job_id, event))
+            status = SUCCEEDED if result.get("status") != "error" else FAILED
+            error = result.get("message") if status == FAILED else None
+        except asyncio.CancelledError:
+            # 서버 종료로 중단된 작업은 RUNNING으로 남겨 다음 시작 시 복구
+            self._history.pop(job_id, None)
+            self._sequences.pop(job_id, None)
+            raise
+        except Exception as e:
+            logger.error(f"작업 실행 오류: {job_id}, {str(e)}")
+            result, status, error = None, FAILED, str(e)
+
+        await asyncio.to_thread(self.store.finish, job_id, status, result, error)
+        metrics.increment("jobs_finished", kind=job["kind"], status=status)
+        metrics.observe("job_duration_seconds", time.perf_counter() - started, kind=job["kind"])
+        logger.info(f"작업 실행 완료: {job_id} ({status})")
+
+        self.publish(job_id, {"type": "status", "status": status, "error": error})
+        self._history.pop(job_id, None)
+        self._sequences.pop(job_id, None)
+        for queue in self._subscribers.pop(job_id, set()):
+            queue.put_nowait(None)
+
+    def publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        """
+        진행 이벤트 발행 (최근 이벤트는 늦게 구독한 클라이언트를 위해 보관)
+
+        Args:
+            job_id: 작업 ID
+            event: 이벤트 (작업 내 일련번호 seq가 추가됨)
+        """
+        sequence = self._sequences.get(job_id)
+        if sequence is not None:
+            event = {**event, "seq": next(sequence)}
+        history = self._history.get(job_id)
+        if history is not None:
+            history.append(event)
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(event)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        작업 진행 이벤트 구독 (이미 발행된 최근 이벤트부터 전달, 작업이 끝나면 None 전달)
+
+        Args:
+            job_id: 작업 ID
+
+        Yields:
+            이벤트 큐
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self._history.get(job_id, ()):
+            queue.put_nowait(event)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    self._subscribers.pop(job_id, None)
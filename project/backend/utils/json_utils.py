@@ -0,0 +1,37 @@
+"""
+LLM 응답에서 JSON을 추출하는 유틸리티
+"""
+import json
+from typing import Dict, Any, Optional
+
+# 응답 앞부분 설명문 속 중괄호 때문에 무한히 재시도하지 않도록 시도 횟수 제한
+MAX_DECODE_ATTEMPTS = 20
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    텍스트에서 처음으로 파싱 가능한 JSON 객체 추출
+
+    ```json 코드 펜스나 앞뒤 설명문이 섞여 있어도 동작한다.
+
+    Args:
+        text: LLM 응답 텍스트
+
+    Returns:
+        JSON 객체 (없으면 None)
+    """
+    if not text:
+        return None
+
+    decoder = json.JSONDecoder()
+    index = text.find("{")
+    attempts = 0
+    while index != -1 and attempts < MAX_DECODE_ATTEMPTS:
+        try:
+            value, _ = decoder.raw_decode(text, index)
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError:
+            pass
+        attempts += 1
+        index = text.find("{", index + 1)
+    return None
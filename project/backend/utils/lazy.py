@@ -0,0 +1,63 @@
+"""
+지연 생성 객체
+모듈 수준 싱글턴을 import 시점이 아니라 처음 사용할 때 생성하여, import만 하는 쪽(워커 부팅, 테스트 수집)은
+API 클라이언트 생성이나 환경 변수 검증 비용을 치르지 않도록 함
+"""
+import threading
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+class LazyObject(Generic[T]):
+    """
+    첫 속성 접근 시 factory로 실제 객체를 만들어 모든 속성 접근/설정을 위임하는 프록시
+
+    `from module import singleton`으로 가져간 쪽도 같은 프록시를 공유하므로 사용처를 바꿀 필요가 없다.
+    프록시 자체의 이름(resolve, initialized)은 실제 객체의 같은 이름 속성을 가린다.
+    """
+
+    def __init__(self, factory: Callable[[], T], name: str):
+        """
+        프록시 초기화
+
+        Args:
+            factory: 실제 객체 생성 함수
+            name: 로그/repr에 표시할 이름
+        """
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def resolve(self) -> T:
+        """
+        실제 객체 반환 (없으면 생성, 여러 스레드가 동시에 불러도 한 번만 생성)
+
+        Returns:
+            실제 객체
+        """
+        instance: Optional[T] = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        """
+        실제 객체 생성 여부
+        """
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __repr__(self) -> str:
+        state = repr(self._instance) if self._instance is not None else "미생성"
+        return f"<LazyObject {self._name}: {state}>"
@@ -0,0 +1,320 @@
+"""
+LLM 백엔드 전송 계층
+Anthropic SDK의 httpx 전송을 바꿔 끼워 실제 API 없이 실행 (가짜 응답 생성, 실제 응답 녹화/재생)
+
+LLM_BACKEND 설정:
+    anthropic: 실제 API 호출 (기본값)
+    fake: 요청별로 결정적인 가짜 응답을 설정한 지연 분포와 토큰 속도로 생성
+    record: 실제 API를 호출하면서 요청/응답과 청크 도착 시각을 카세트 파일로 저장
+    replay: 카세트 파일의 응답을 녹화된 시간 간격대로 재생 (없는 요청은 404 오류)
+"""
+import os
+import json
+import time
+import base64
+import asyncio
+from typing import Any, Dict, Iterator, AsyncIterator, List, Optional, Tuple
+import httpx
+from loguru import logger
+
+from backend.utils.llm_cache import make_cache_key
+from backend.config.settings import (
+    LLM_BACKEND,
+    LLM_CASSETTE_DIR,
+    LLM_REPLAY_SPEED,
+)
+
+# 실제 API를 호출하지 않는 백엔드 (API 키 불필요)
+OFFLINE_BACKENDS = {"fake", "replay"}
+
+# 요청 지문 헤더로 응답/카세트를 찾는 백엔드
+REQUEST_KEY_BACKENDS = OFFLINE_BACKENDS | {"record"}
+
+# 기한 조정 전 요청 지문을 전송 계층에 넘기는 헤더
+# Reason: 기한에 맞춰 줄인 max_tokens/모델은 남은 시간마다 달라지므로 본문으로 키를 만들면 카세트가 무작위로 빗나감
+REQUEST_KEY_HEADER = "x-llm-request-key"
+
+def request_body(request: httpx.Request) -> Dict[str, Any]:
+    """
+    요청 본문 JSON 파싱
+
+    Args:
+        request: httpx 요청
+
+    Returns:
+        요청 본문 (JSON이 아니면 빈 사전)
+    """
+    try:
+        return json.loads(request.content or b"{}")
+    except ValueError:
+        return {}
+
+def request_key(request: httpx.Request, body: Dict[str, Any]) -> str:
+    """
+    요청 지문 (클라이언트가 붙인 기한 조정 전 지문 우선, 없으면 본문으로 계산)
+
+    Args:
+        request: httpx 요청
+        body: 요청 본문
+
+    Returns:
+        요청 지문
+    """
+    return request.headers.get(REQUEST_KEY_HEADER) or make_cache_key(body)
+
+def cassette_key(request: httpx.Request, body: Dict[str, Any]) -> str:
+    """
+    카세트 파일 키 (LLM 캐시와 같은 요청 지문 + 스트리밍 여부)
+
+    Args:
+        request: httpx 요청
+        body: 요청 본문
+
+    Returns:
+        파일명으로 쓸 키
+    """
+    return request_key(request, body) + ("-stream" if body.get("stream") else "")
+
+def error_response(status: int, error_type: str, message: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """
+    Anthropic 오류 형식 응답 생성
+
+    Args:
+        status: HTTP 상태
+        error_type: 오류 타입 (overloaded_error 등)
+        message: 오류 메시지
+        headers: 추가 헤더
+
+    Returns:
+        httpx 응답
+    """
+    return httpx.Response(
+        status,
+        headers=headers,
+        json={"type": "error", "error": {"type": error_type, "message": message}}
+    )
+
+class TimedStream(httpx.AsyncByteStream, httpx.SyncByteStream):
+    """
+    (지연 시간, 바이트) 목록을 시간 간격대로 내보내는 응답 스트림 (동기/비동기 공용)
+    """
+
+    def __init__(self, chunks: List[Tuple[float, bytes]]):
+        """
+        스트림 초기화
+
+        Args:
+            chunks: (이전 청크 이후 대기 시간(초), 바이트) 목록
+        """
+        self.chunks = chunks
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for delay, chunk in self.chunks:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        for delay, chunk in self.chunks:
+            if delay > 0:
+                time.sleep(delay)
+            yield chunk
+
+class _RecordingStream(httpx.AsyncByteStream, httpx.SyncByteStream):
+    """
+    원본 응답 스트림을 그대로 전달하면서 청크와 도착 간격을 기록하고, 닫힐 때 카세트 저장
+    """
+
+    def __init__(self, stream: Any, cassette: Dict[str, Any], path: str, started: float):
+        """
+        녹화 스트림 초기화
+
+        Args:
+            stream: 원본 응답 스트림
+            cassette: 저장할 카세트 (chunks는 여기서 채움)
+            path: 카세트 파일 경로
+            started: 요청 시작 시각 (time.monotonic)
+        """
+        self.stream = stream
+        self.cassette = cassette
+        self.path = path
+        self._last = started
+        self._complete = False
+
+    def _record(self, chunk: bytes) -> None:
+        now = time.monotonic()
+        self.cassette["chunks"].append([round(now - self._last, 4), base64.b64encode(chunk).decode("ascii")])
+        self._last = now
+
+    def _save(self) -> None:
+        # 중간에 끊긴 응답은 재생하면 잘린 내용이 되므로 끝까지 받은 경우만 저장
+        if not self._complete:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.cassette, f, ensure_ascii=False)
+        logger.debug(f"LLM 카세트 저장: {self.path}")
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            self._record(chunk)
+            yield chunk
+        self._complete = True
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.stream:
+            self._record(chunk)
+            yield chunk
+        self._complete = True
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+        await asyncio.to_thread(self._save)
+
+    def close(self) -> None:
+        self.stream.close()
+        self._save()
+
+class RecordingTransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """
+    실제 전송을 감싸 성공한 messages 응답을 카세트 파일로 녹화
+    """
+
+    def __init__(self, inner: Any, directory: str = LLM_CASSETTE_DIR):
+        """
+        녹화 전송 초기화
+
+        Args:
+            inner: 실제 전송 (httpx.HTTPTransport 또는 httpx.AsyncHTTPTransport)
+            directory: 카세트 디렉토리
+        """
+        self.inner = inner
+        self.directory = directory
+
+    @staticmethod
+    def _key(request: httpx.Request) -> str:
+        """
+        카세트 키 계산 후 내부용 요청 지문 헤더 제거 (실제 API로는 보내지 않음)
+
+        Args:
+            request: httpx 요청
+
+        Returns:
+            카세트 키
+        """
+        key = cassette_key(request, request_body(request))
+        if REQUEST_KEY_HEADER in request.headers:
+            del request.headers[REQUEST_KEY_HEADER]
+        return key
+
+    def _wrap(self, request: httpx.Request, response: httpx.Response, started: float, key: str) -> httpx.Response:
+        """
+        성공 응답이면 녹화 스트림으로 감쌈
+
+        Args:
+            request: httpx 요청
+            response: 실제 응답
+            started: 요청 시작 시각
+            key: 카세트 키
+
+        Returns:
+            클라이언트에 돌려줄 응답
+        """
+        if response.status_code != 200 or not request.url.path.endswith("/messages"):
+            return response
+        body = request_body(request)
+        cassette = {
+            "request": body,
+            "status": response.status_code,
+            # 원본 바이트를 그대로 재생하므로 content-encoding 등 본문 해석에 필요한 헤더도 함께 보관
+            "headers": [[k, v] for k, v in response.headers.multi_items() if k.lower() != "content-length"],
+            "chunks": []
+        }
+        path = os.path.join(self.directory, f"{key}.json")
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, cassette, path, started),
+            extensions=response.extensions
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        key = self._key(request)
+        return self._wrap(request, await self.inner.handle_async_request(request), started, key)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        key = self._key(request)
+        return self._wrap(request, self.inner.handle_request(request), started, key)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def close(self) -> None:
+        self.inner.close()
+
+class ReplayTransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """
+    녹화된 카세트를 도착 간격대로 재생 (speed로 배속 조절, 0이면 지연 없이 재생)
+    """
+
+    def __init__(self, directory: str = LLM_CASSETTE_DIR, speed: float = LLM_REPLAY_SPEED):
+        """
+        재생 전송 초기화
+
+        Args:
+            directory: 카세트 디렉토리
+            speed: 재생 배속
+        """
+        self.directory = directory
+        self.speed = speed
+
+    def _load(self, request: httpx.Request) -> httpx.Response:
+        """
+        요청에 맞는 카세트를 찾아 응답 생성
+
+        Args:
+            request: httpx 요청
+
+        Returns:
+            재생 응답 (카세트가 없으면 404 오류 응답)
+        """
+        key = cassette_key(request, request_body(request))
+        path = os.path.join(self.directory, f"{key}.json")
+        if not os.path.exists(path):
+            logger.warning(f"LLM 카세트 없음: {key}")
+            return error_response(404, "not_found_error", f"녹화된 응답이 없습니다: {key}")
+        with open(path, "r", encoding="utf-8") as f:
+            cassette = json.load(f)
+        scale = 0.0 if self.speed <= 0 else 1.0 / self.speed
+        chunks = [(delay * scale, base64.b64decode(data)) for delay, data in cassette["chunks"]]
+        return httpx.Response(cassette["status"], headers=cassette["headers"], stream=TimedStream(chunks))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await asyncio.to_thread(self._load, request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._load(request)
+
+def build_transport(http_options: Dict[str, Any], sync: bool = False) -> Optional[Any]:
+    """
+    LLM_BACKEND 설정에 맞는 httpx 전송 생성
+
+    Args:
+        http_options: 연결 풀 옵션 (http2, limits)
+        sync: 동기 클라이언트용 여부
+
+    Returns:
+        httpx 전송 (실제 API를 그대로 쓰면 None)
+    """
+    if LLM_BACKEND == "fake":
+        # Reason: 가짜 백엔드를 쓰지 않는 실행(실제 API, 녹화/재생)은 가짜 응답 생성 코드를 import하지 않음
+        from backend.utils.llm_fake_backend import FakeAnthropicTransport
+        return FakeAnthropicTransport()
+    if LLM_BACKEND == "replay":
+        return ReplayTransport()
+    if LLM_BACKEND == "record":
+        transport_class = httpx.HTTPTransport if sync else httpx.AsyncHTTPTransport
+        return RecordingTransport(transport_class(http2=http_options["http2"], limits=http_options["limits"]))
+    return None
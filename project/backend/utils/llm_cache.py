@@ -0,0 +1,282 @@
+"""
+LLM 응답 캐시
+요청 내용의 해시를 키로 하는 2단계 캐시 (메모리 LRU + 여러 워커가 공유하는 SQLite WAL)
+"""
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from loguru import logger
+
+from backend.utils.metrics import metrics
+
+# 캐시 키에 포함되는 요청 필드 (출력에 영향을 주는 값만)
+CACHE_KEY_FIELDS = ("model", "system", "messages", "temperature", "max_tokens", "tools", "tool_choice")
+
+# 디스크 용량 검사 주기 (쓰기 N회마다 한 번)
+EVICTION_INTERVAL = 64
+
+def make_cache_key(request: Dict[str, Any]) -> str:
+    """
+    요청 지문(fingerprint) 생성
+
+    Args:
+        request: messages.create 호출 인자
+
+    Returns:
+        SHA-256 해시 문자열
+    """
+    payload = {field: request.get(field) for field in CACHE_KEY_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """
+    메모리 LRU + SQLite 2단계 LLM 응답 캐시
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float, max_memory_items: int, max_disk_items: int):
+        """
+        캐시 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+            ttl_seconds: 항목 유효 시간 (초)
+            max_memory_items: 메모리 LRU 최대 항목 수
+            max_disk_items: 디스크 최대 항목 수
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+        # Reason: WAL 모드여야 여러 uvicorn 워커가 읽기를 막지 않고 동시에 캐시를 공유할 수 있음
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+        self._conn.commit()
+        logger.info(f"LLM 캐시 초기화 완료: {db_path} (TTL {ttl_seconds}s)")
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        메모리 계층 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 값 (없거나 만료되면 None)
+        """
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+
+    def _memory_set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        """
+        메모리 계층 저장 (LRU 초과 시 가장 오래된 항목 제거)
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            expires_at: 만료 시각 (epoch 초)
+        """
+        with self._memory_lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        디스크 계층 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            (만료 시각, 값) 또는 None
+        """
+        now = time.time()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[1], json.loads(row[0])
+
+    def _disk_set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        """
+        디스크 계층 저장 및 주기적 용량 초과 항목 제거
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            expires_at: 만료 시각 (epoch 초)
+        """
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= EVICTION_INTERVAL:
+                self._writes_since_eviction = 0
+                self._evict_locked(now)
+            self._conn.commit()
+
+    def _evict_locked(self, now: float) -> None:
+        """
+        만료 항목 및 용량 초과 항목 제거 (DB 잠금 보유 상태에서 호출)
+
+        Args:
+            now: 현재 시각
+        """
+        expired = self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,)).rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.max_disk_items
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+        evicted = max(expired, 0) + max(overflow, 0)
+        if evicted:
+            self._stats["evictions"] += evicted
+            metrics.increment("llm_cache_evictions", evicted)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회 (메모리 → 디스크 순)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 결과 또는 None
+        """
+        value = self._memory_get(key)
+        if value is not None:
+            self._record("memory_hits")
+            return value
+
+        try:
+            entry = self._disk_get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM 캐시 디스크 조회 실패: {str(e)}")
+            entry = None
+
+        if entry is None:
+            self._record("misses")
+            return None
+
+        expires_at, value = entry
+        self._memory_set(key, value, expires_at)
+        self._record("disk_hits")
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        캐시 저장 (메모리와 디스크 모두)
+
+        Args:
+            key: 캐시 키
+            value: 저장할 결과
+        """
+        expires_at = time.time() + self.ttl_seconds
+        self._memory_set(key, value, expires_at)
+        try:
+            self._disk_set(key, value, expires_at)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM 캐시 디스크 저장 실패: {str(e)}")
+        self._record("writes")
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        비동기 캐시 조회 (메모리 적중 시 스레드 전환 없이 반환)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 결과 또는 None
+        """
+        value = self._memory_get(key)
+        if value is not None:
+            self._record("memory_hits")
+            return value
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        비동기 캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 결과
+        """
+        await asyncio.to_thread(self.set, key, value)
+
+    def _record(self, stat: str) -> None:
+        """
+        적중/실패 통계 기록
+
+        Args:
+            stat: 통계 항목 이름
+        """
+        self._stats[stat] += 1
+        metrics.increment(f"llm_cache_{stat}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 반환
+
+        Returns:
+            적중/실패 횟수와 메모리 항목 수
+        """
+        lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        return {
+            **self._stats,
+            "memory_items": len(self._memory),
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        """
+        DB 연결 종료
+        """
+        with self._db_lock:
+            self._conn.close()
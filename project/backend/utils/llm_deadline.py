@@ -0,0 +1,90 @@
+"""
+LLM 호출 기한 맞춤
+요청 처리 기한까지 남은 시간에 맞춰 모델/max_tokens/HTTP 시간 제한을 줄이고, 기한을 넘기는 재시도를 건너뜀
+"""
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from backend.config.settings import (
+    LLM_MODELS,
+    DEADLINE_FAST_MODEL,
+    DEADLINE_FAST_MODEL_SECONDS,
+    DEADLINE_OUTPUT_TOKENS_PER_SECOND,
+    DEADLINE_MIN_OUTPUT_TOKENS,
+)
+from backend.utils.deadline import DeadlineExceeded, remaining_seconds, time_budget
+from backend.utils.metrics import metrics
+from backend.utils.streaming import current_node
+
+def fit_to_deadline(request: Dict[str, Any], agent: Optional[str] = None) -> Dict[str, Any]:
+    """
+    요청 처리 기한에 맞춰 모델과 max_tokens 조정 (기한이 없으면 그대로 반환)
+
+    남은 시간이 DEADLINE_FAST_MODEL_SECONDS보다 적으면 빠른 모델로 바꾸고,
+    max_tokens는 남은 시간 동안 생성할 수 있는 양(DEADLINE_OUTPUT_TOKENS_PER_SECOND 기준)으로 줄인다.
+
+    Args:
+        request: API 호출 인자
+        agent: 메트릭 라벨용 에이전트 이름
+
+    Returns:
+        조정된 API 호출 인자 (복사본)
+
+    Raises:
+        DeadlineExceeded: 기한이 이미 지난 경우
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return request
+    if remaining <= 0:
+        raise DeadlineExceeded("요청 처리 기한이 지났습니다.")
+
+    request = dict(request)
+    agent = agent or current_node.get() or "unknown"
+    fast_model = LLM_MODELS.get(DEADLINE_FAST_MODEL, DEADLINE_FAST_MODEL)
+    if remaining < DEADLINE_FAST_MODEL_SECONDS and request["model"] != fast_model:
+        logger.info(f"기한까지 {remaining:.1f}초 남아 빠른 모델로 전환: {request['model']} -> {fast_model}")
+        request["model"] = fast_model
+        metrics.increment("deadline_degraded", kind="model", agent=agent)
+    fit = max(DEADLINE_MIN_OUTPUT_TOKENS, int(remaining * DEADLINE_OUTPUT_TOKENS_PER_SECOND))
+    if fit < request["max_tokens"]:
+        request["max_tokens"] = fit
+        metrics.increment("deadline_degraded", kind="max_tokens", agent=agent)
+    return request
+
+def with_timeout(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    요청 처리 기한까지 남은 시간을 HTTP 요청 시간 제한으로 지정
+
+    Args:
+        request: API 호출 인자
+
+    Returns:
+        timeout이 추가된 호출 인자 (기한이 없으면 그대로)
+
+    Raises:
+        DeadlineExceeded: 기한이 이미 지난 경우
+    """
+    timeout = time_budget()
+    if timeout is None:
+        return request
+    if timeout <= 0:
+        raise DeadlineExceeded("요청 처리 기한이 지났습니다.")
+    return {**request, "timeout": timeout}
+
+def past_deadline(delay: float) -> bool:
+    """
+    재시도 대기 후에는 기한이 지나는지 확인
+
+    Args:
+        delay: 재시도 대기 시간 (초)
+
+    Returns:
+        기한 초과 여부 (기한이 없으면 False)
+    """
+    timeout = time_budget()
+    if timeout is None or delay < timeout:
+        return False
+    logger.warning(f"재시도 대기({delay:.1f}초) 중 요청 처리 기한이 지나므로 재시도하지 않음")
+    metrics.increment("deadline_retry_skipped")
+    return True
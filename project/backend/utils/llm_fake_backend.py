@@ -0,0 +1,243 @@
+"""
+가짜 LLM 백엔드
+요청별로 결정적인 가짜 Anthropic Messages 응답을 설정한 첫 토큰 지연 분포와 토큰 속도로 생성 (LLM_BACKEND=fake)
+"""
+import json
+import math
+import time
+import random
+import asyncio
+import threading
+from typing import Any, Dict, List, Tuple
+import httpx
+
+from backend.utils.llm_backends import TimedStream, error_response, request_body, request_key
+from backend.config.settings import (
+    LLM_FAKE_TTFT_MS,
+    LLM_FAKE_TTFT_SIGMA,
+    LLM_FAKE_TOKENS_PER_SECOND,
+    LLM_FAKE_OUTPUT_TOKENS,
+    LLM_FAKE_ERROR_RATE,
+    LLM_FAKE_SEED,
+)
+
+# 가짜 토큰 하나에 해당하는 문자 수 (입력/출력 토큰 수 근사에도 사용)
+CHARS_PER_TOKEN = 4
+
+# 스트리밍 시 델타를 묶어 보내는 간격 (초)
+FAKE_FLUSH_INTERVAL = 0.05
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    """
+    SSE 이벤트 인코딩
+
+    Args:
+        event: 이벤트 이름
+        data: 이벤트 데이터
+
+    Returns:
+        SSE 바이트
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+class FakeAnthropicTransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """
+    messages API를 흉내 내는 결정적 가짜 전송
+
+    같은 요청에는 항상 같은 내용을 돌려주며(요청 지문으로 난수 시드 고정), 첫 토큰 지연은 실제 서버처럼
+    시도마다 따로 뽑은 로그정규분포 값, 이후 토큰은 초당 토큰 속도에 맞춰 내보낸다. 오류 주입 비율을 주면
+    일부 요청에 529 과부하 응답을 돌려준다.
+    """
+
+    def __init__(
+        self,
+        ttft_ms: float = LLM_FAKE_TTFT_MS,
+        ttft_sigma: float = LLM_FAKE_TTFT_SIGMA,
+        tokens_per_second: float = LLM_FAKE_TOKENS_PER_SECOND,
+        output_tokens: int = LLM_FAKE_OUTPUT_TOKENS,
+        error_rate: float = LLM_FAKE_ERROR_RATE,
+        seed: int = LLM_FAKE_SEED
+    ):
+        """
+        가짜 전송 초기화
+
+        Args:
+            ttft_ms: 첫 토큰 지연 중앙값 (밀리초)
+            ttft_sigma: 첫 토큰 지연 로그정규분포 시그마
+            tokens_per_second: 출력 토큰 속도
+            output_tokens: 출력 토큰 수 중앙값 (max_tokens로 제한)
+            error_rate: 529 과부하 응답 비율 (0~1)
+            seed: 시도별 난수(오류 주입, 첫 토큰 지연) 시드
+        """
+        self.ttft_ms = ttft_ms
+        self.ttft_sigma = ttft_sigma
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        # 오류 주입과 지연은 시도마다 달라야 재시도/헤지가 의미 있으므로 요청 지문과 별개의 난수 사용
+        self._attempt_rng = random.Random(seed)
+        self._attempt_lock = threading.Lock()
+
+    def _should_fail(self) -> bool:
+        """
+        이번 요청에 오류를 주입할지 결정
+        """
+        if self.error_rate <= 0:
+            return False
+        with self._attempt_lock:
+            return self._attempt_rng.random() < self.error_rate
+
+    @staticmethod
+    def _fake_value(schema: Dict[str, Any], rng: random.Random, name: str = "value") -> Any:
+        """
+        JSON 스키마에 맞는 가짜 값 생성 (도구 입력용)
+
+        Args:
+            schema: JSON 스키마
+            rng: 난수 생성기
+            name: 속성 이름
+
+        Returns:
+            가짜 값
+        """
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+        if "anyOf" in schema:
+            options = [option for option in schema["anyOf"] if option.get("type") != "null"] or schema["anyOf"]
+            return FakeAnthropicTransport._fake_value(options[0], rng, name)
+        kind = schema.get("type")
+        if kind == "object":
+            return {
+                key: FakeAnthropicTransport._fake_value(value, rng, key)
+                for key, value in (schema.get("properties") or {}).items()
+            }
+        if kind == "array":
+            return [FakeAnthropicTransport._fake_value(schema.get("items") or {}, rng, name)]
+        if kind == "integer":
+            return rng.randint(0, 10)
+        if kind == "number":
+            return round(rng.random(), 3)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return f"fake {name}"
+
+    def _fake_text(self, body: Dict[str, Any], rng: random.Random, tokens: int) -> str:
+        """
+        코드 생성 응답 형식(JSON 봉투)의 가짜 텍스트 생성
+
+        Args:
+            body: 요청 본문
+            rng: 난수 생성기
+            tokens: 목표 출력 토큰 수
+
+        Returns:
+            가짜 응답 텍스트
+        """
+        name = f"Fake{rng.randrange(16 ** 6):06x}"
+        lines = [f"<template>\n  <div class=\"{name.lower()}\">{name}</div>\n</template>"]
+        while sum(len(line) + 1 for line in lines) < tokens * CHARS_PER_TOKEN:
+            lines.append(f"<!-- {rng.randrange(16 ** 12):012x} -->")
+        return json.dumps({
+            "filename": f"{name}.vue",
+            "language": "vue",
+            "code": "\n".join(lines),
+            "description": "가짜 LLM 백엔드가 생성한 코드"
+        }, ensure_ascii=False)
+
+    def _build(self, request: httpx.Request) -> Tuple[float, httpx.Response]:
+        """
+        요청에 대한 가짜 응답과 첫 바이트 전 대기 시간 생성
+
+        Args:
+            request: httpx 요청
+
+        Returns:
+            (첫 바이트 전 대기 시간(초), 응답)
+        """
+        body = request_body(request)
+        if not request.url.path.endswith("/messages"):
+            return 0.0, error_response(404, "not_found_error", f"가짜 백엔드가 지원하지 않는 경로: {request.url.path}")
+        if self._should_fail():
+            return 0.0, error_response(529, "overloaded_error", "가짜 백엔드 과부하 (오류 주입)", {"retry-after": "1"})
+
+        # 같은 요청은 같은 내용을 갖도록 요청 지문으로 시드 고정
+        rng = random.Random(request_key(request, body))
+        input_tokens = max(1, len(json.dumps([body.get("system"), body.get("messages")], ensure_ascii=False)) // CHARS_PER_TOKEN)
+        target_tokens = int(self.output_tokens * math.exp(rng.gauss(0, 0.3)))
+        target_tokens = max(1, min(int(body.get("max_tokens", target_tokens)), target_tokens))
+        with self._attempt_lock:
+            ttft = self.ttft_ms / 1000 * math.exp(self._attempt_rng.gauss(0, self.ttft_sigma))
+        model = body.get("model", "fake-model")
+        message_id = f"msg_fake_{rng.randrange(16 ** 12):012x}"
+
+        tools = body.get("tools") or []
+        if tools:
+            tool = tools[0]
+            tool_input = self._fake_value(tool.get("input_schema") or {}, rng)
+            content = [{"type": "tool_use", "id": f"toolu_fake_{rng.randrange(16 ** 12):012x}", "name": tool["name"], "input": tool_input}]
+            text = json.dumps(tool_input, ensure_ascii=False)
+            stop_reason = "tool_use"
+        else:
+            text = self._fake_text(body, rng, target_tokens)
+            content = [{"type": "text", "text": text}]
+            stop_reason = "end_turn"
+        output_tokens = max(1, len(text) // CHARS_PER_TOKEN)
+        usage = {"input_tokens": input_tokens, "output_tokens": output_tokens}
+        headers = {"request-id": f"req_fake_{message_id[-12:]}"}
+
+        if not body.get("stream"):
+            delay = ttft + output_tokens / self.tokens_per_second
+            return delay, httpx.Response(200, headers=headers, json={
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": content,
+                "stop_reason": stop_reason,
+                "stop_sequence": None,
+                "usage": usage
+            })
+
+        # 스트리밍: 토큰 속도에 맞춰 델타를 FAKE_FLUSH_INTERVAL 단위로 묶어 전송
+        block = dict(content[0])
+        if tools:
+            block["input"] = {}
+        chunks: List[Tuple[float, bytes]] = [
+            (ttft, _sse("message_start", {"type": "message_start", "message": {
+                "id": message_id, "type": "message", "role": "assistant", "model": model, "content": [],
+                "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": input_tokens, "output_tokens": 1}
+            }})),
+            (0.0, _sse("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {**block, "text": ""} if not tools else block}))
+        ]
+        step = max(CHARS_PER_TOKEN, int(self.tokens_per_second * FAKE_FLUSH_INTERVAL) * CHARS_PER_TOKEN)
+        for start in range(0, len(text), step):
+            piece = text[start:start + step]
+            delta = {"type": "input_json_delta", "partial_json": piece} if tools else {"type": "text_delta", "text": piece}
+            chunks.append((
+                len(piece) / CHARS_PER_TOKEN / self.tokens_per_second,
+                _sse("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": delta})
+            ))
+        chunks.append((0.0, _sse("content_block_stop", {"type": "content_block_stop", "index": 0})))
+        chunks.append((0.0, _sse("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+            "usage": {"output_tokens": output_tokens}
+        })))
+        chunks.append((0.0, _sse("message_stop", {"type": "message_stop"})))
+        return 0.0, httpx.Response(
+            200,
+            headers={**headers, "content-type": "text/event-stream"},
+            stream=TimedStream(chunks)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay, response = self._build(request)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay, response = self._build(request)
+        if delay > 0:
+            time.sleep(delay)
+        return response
@@ -0,0 +1,127 @@
+"""
+LLM 모델 대체 호출
+모델 호출 실패를 서킷 브레이커에 기록하고, 회로가 열렸거나 모델 오류가 계속되면 LLM_FALLBACK_MODELS의 대체 모델로 전환
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from loguru import logger
+from anthropic import APITimeoutError
+
+from backend.config.settings import ANTHROPIC_READ_TIMEOUT, LLM_FALLBACK_MODELS, LLM_MODELS
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpen, is_breaker_failure
+from backend.utils.metrics import metrics
+
+# 델타 콜백 타입 (anthropic_client.DeltaHandler와 동일)
+DeltaHandler = Callable[[str], Awaitable[None]]
+
+def fallback_chain(model: str) -> List[str]:
+    """
+    모델과 대체 모델 ID 목록 (LLM_FALLBACK_MODELS 기준, 모델 ID 또는 별칭 키로 조회)
+
+    Args:
+        model: 모델 ID
+
+    Returns:
+        [모델, 대체 모델...] (중복 제외)
+    """
+    fallbacks = LLM_FALLBACK_MODELS.get(model)
+    if fallbacks is None:
+        aliases = [alias for alias, model_id in LLM_MODELS.items() if model_id == model]
+        fallbacks = next((LLM_FALLBACK_MODELS[alias] for alias in aliases if alias in LLM_FALLBACK_MODELS), [])
+    chain = [model]
+    for name in fallbacks:
+        model_id = LLM_MODELS.get(name, name)
+        if model_id not in chain:
+            chain.append(model_id)
+    return chain
+
+def record_failure(breaker: CircuitBreaker, request: Dict[str, Any], error: Exception) -> None:
+    """
+    실패한 시도를 서킷 브레이커에 기록 (모델 상태와 무관한 오류는 세지 않음)
+
+    Args:
+        breaker: 호출한 모델의 서킷 브레이커
+        request: 시간 제한이 포함된 API 호출 인자
+        error: 발생한 예외
+    """
+    # 요청 처리 기한에 맞춰 줄인 시간 제한에 걸린 것은 모델이 느려서가 아니므로 제외
+    shortened = request.get("timeout", ANTHROPIC_READ_TIMEOUT) < ANTHROPIC_READ_TIMEOUT
+    if is_breaker_failure(error) and not (isinstance(error, APITimeoutError) and shortened):
+        breaker.record(False)
+    else:
+        breaker.release()
+
+def should_fall_back(error: Exception, chain: List[str], index: int) -> bool:
+    """
+    대체 모델로 넘어갈지 결정 (회로가 열렸거나 재시도 후에도 모델 오류인 경우)
+
+    Args:
+        error: 발생한 예외
+        chain: 모델 체인
+        index: 실패한 모델의 위치
+
+    Returns:
+        대체 모델 호출 여부
+    """
+    if index + 1 >= len(chain) or not (isinstance(error, CircuitOpen) or is_breaker_failure(error)):
+        return False
+    logger.warning(f"{chain[index]} 모델 호출 실패, 대체 모델 {chain[index + 1]}로 전환: {str(error)}")
+    metrics.increment("llm_fallbacks", model=chain[index], fallback=chain[index + 1])
+    return True
+
+async def acreate_with_fallback(
+    create: Callable[[Dict[str, Any], Optional[DeltaHandler], Optional[str]], Awaitable[Any]],
+    request: Dict[str, Any],
+    on_delta: Optional[DeltaHandler] = None,
+    agent: Optional[str] = None
+) -> Any:
+    """
+    모델 체인을 순서대로 호출 (앞 모델이 회로 차단/모델 오류로 실패하면 대체 모델 사용)
+
+    Args:
+        create: 모델 하나를 (재시도 포함) 호출하는 함수
+        request: API 호출 인자
+        on_delta: 토큰 델타 콜백
+        agent: 지연 시간 집계용 에이전트 이름
+
+    Returns:
+        SDK Message 객체
+    """
+    emitted = False
+
+    async def forward(text: str) -> None:
+        nonlocal emitted
+        emitted = True
+        await on_delta(text)
+
+    chain = fallback_chain(request["model"])
+    for index, model in enumerate(chain):
+        try:
+            return await create({**request, "model": model}, forward if on_delta is not None else None, agent)
+        except Exception as e:
+            # 이미 델타를 보낸 스트림은 다른 모델로 다시 생성하면 내용이 섞이므로 넘어가지 않음
+            if emitted or not should_fall_back(e, chain, index):
+                raise
+
+def create_with_fallback(
+    create: Callable[[Dict[str, Any], Optional[str]], Any],
+    request: Dict[str, Any],
+    agent: Optional[str] = None
+) -> Any:
+    """
+    동기 호출용 모델 체인 호출
+
+    Args:
+        create: 모델 하나를 (재시도 포함) 호출하는 함수
+        request: API 호출 인자
+        agent: 지연 시간 집계용 에이전트 이름
+
+    Returns:
+        SDK Message 객체
+    """
+    chain = fallback_chain(request["model"])
+    for index, model in enumerate(chain):
+        try:
+            return create({**request, "model": model}, agent)
+        except Exception as e:
+            if not should_fall_back(e, chain, index):
+                raise
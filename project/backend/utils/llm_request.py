@@ -0,0 +1,147 @@
+"""
+LLM 요청/응답 변환
+messages.create 호출 인자를 만들고 SDK 응답을 에이전트가 쓰는 공통 결과 형식으로 바꿈
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config.settings import LLM_MODELS, LLM_DEFAULT_MODEL, LLM_MODEL_ROUTES
+from backend.utils.prompt_cache import CACHE_CONTROL, apply_cache_minimum
+
+def resolve_model(agent: Optional[str] = None, step: Optional[str] = None) -> str:
+    """
+    에이전트/단계에 맞는 모델 ID 결정 (LLM_MODEL_ROUTES 라우팅 표 기준)
+
+    Args:
+        agent: 에이전트 이름 (supervisor, planning, code_generation 등)
+        step: 에이전트 내 단계 이름 (analyze, plan, generate 등)
+
+    Returns:
+        모델 ID
+    """
+    route = None
+    if agent and step:
+        route = LLM_MODEL_ROUTES.get(f"{agent}.{step}")
+    if route is None and agent:
+        route = LLM_MODEL_ROUTES.get(agent)
+    route = route or LLM_DEFAULT_MODEL
+    return LLM_MODELS.get(route, route)
+
+def split_system_message(messages: List[Dict[str, str]]) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """
+    채팅 메시지 목록에서 시스템 메시지를 분리
+
+    Args:
+        messages: 메시지 목록 (역할과 내용 포함)
+
+    Returns:
+        (시스템 메시지, 나머지 메시지 목록)
+    """
+    system_message = None
+    chat_messages = []
+
+    for msg in messages:
+        if msg["role"] == "system":
+            system_message = msg["content"]
+        else:
+            chat_messages.append({
+                "role": msg["role"],
+                "content": msg["content"]
+            })
+
+    return system_message, chat_messages
+
+def user_message(prompt: str, cache_prefix: Optional[str] = None) -> Dict[str, Any]:
+    """
+    사용자 메시지 생성 (고정 접두부는 캐시 가능 블록으로 분리)
+
+    Args:
+        prompt: 사용자 프롬프트
+        cache_prefix: 호출마다 동일한 프롬프트 앞부분 (프롬프트 캐시 대상)
+
+    Returns:
+        사용자 메시지
+    """
+    if not cache_prefix:
+        return {"role": "user", "content": prompt}
+    return {
+        "role": "user",
+        "content": [
+            {"type": "text", "text": cache_prefix, "cache_control": CACHE_CONTROL},
+            {"type": "text", "text": prompt}
+        ]
+    }
+
+def build_request(
+    model: str,
+    system_message: Optional[str],
+    messages: List[Dict[str, Any]],
+    temperature: float,
+    max_tokens: int,
+    cache_system: bool = False,
+    tool: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    messages.create 호출 인자 생성
+
+    캐시 표시는 접두부가 모델의 최소 캐시 길이 이상일 때만 남긴다 (짧은 접두부는 API가 캐시하지 않음).
+
+    Args:
+        model: 사용할 모델
+        system_message: 시스템 메시지 (없으면 생략)
+        messages: 대화 메시지 목록
+        temperature: 온도
+        max_tokens: 최대 생성 토큰 수
+        cache_system: 시스템 메시지를 프롬프트 캐시 대상으로 표시할지 여부
+        tool: 호출을 강제할 도구 정의 (있으면 tools/tool_choice 추가)
+
+    Returns:
+        API 호출 인자
+    """
+    request = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    if system_message:
+        if cache_system:
+            # Reason: 매 호출 동일한 긴 시스템 프롬프트를 캐시 읽기 토큰으로 과금/처리하도록 표시 (짧으면 아래에서 제거됨)
+            request["system"] = [{"type": "text", "text": system_message, "cache_control": CACHE_CONTROL}]
+        else:
+            request["system"] = system_message
+    if tool:
+        request["tools"] = [tool]
+        request["tool_choice"] = {"type": "tool", "name": tool["name"]}
+    return apply_cache_minimum(request)
+
+def format_response(response: Any, chat: bool = False) -> Dict[str, Any]:
+    """
+    SDK 응답을 공통 결과 형식으로 변환
+
+    Args:
+        response: SDK Message 객체
+        chat: 채팅 완성 여부 (role 필드 포함)
+
+    Returns:
+        생성 결과
+    """
+    # 텍스트 블록은 이어 붙이고, 도구 호출 블록이 있으면 첫 번째 입력을 tool_input으로 노출
+    blocks = response.content
+    result = {
+        "status": "success",
+        "content": "".join(block.text for block in blocks if getattr(block, "type", "text") == "text"),
+        "model": response.model,
+        "usage": {
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+            "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
+            "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", None) or 0,
+            "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", None) or 0
+        }
+    }
+    tool_inputs = [block.input for block in blocks if getattr(block, "type", None) == "tool_use"]
+    if tool_inputs:
+        result["tool_input"] = tool_inputs[0]
+    if chat:
+        result["role"] = "assistant"
+    return result
@@ -0,0 +1,272 @@
+"""
+LLM 호출 재시도
+속도 제한기/헤징/서킷 브레이커를 거쳐 messages.create를 호출하고, 재시도 가능한 오류는 백오프 후 재시도
+"""
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+from loguru import logger
+from anthropic import Anthropic, AsyncAnthropic
+
+from backend.config.settings import LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY
+from backend.utils.circuit_breaker import CircuitBreakerRegistry
+from backend.utils.hedging import HedgePolicy
+from backend.utils.llm_deadline import with_timeout, past_deadline
+from backend.utils.llm_fallback import record_failure
+from backend.utils.metrics import metrics
+from backend.utils.rate_limiter import (
+    AdaptiveRateLimiter,
+    is_retryable,
+    retry_after_seconds,
+    backoff_delay,
+    estimate_tokens,
+)
+from backend.utils.streaming import current_node
+
+# 델타 콜백 타입 (anthropic_client.DeltaHandler와 동일)
+DeltaHandler = Callable[[str], Awaitable[None]]
+
+# 계정 전체 호출을 멈춰야 하는 응답 상태 (속도 제한, 과부하)
+THROTTLE_STATUS_CODES = {429, 529}
+
+class RetryingCaller:
+    """
+    모델 하나에 대한 messages.create 호출 (재시도 포함)
+
+    호출마다 서킷 브레이커로 모델 상태를 확인하고, 속도 제한기에서 예상 토큰을 예약한 뒤 헤징 정책으로 실행한다.
+    """
+
+    def __init__(
+        self,
+        client: Anthropic,
+        async_client: AsyncAnthropic,
+        rate_limiter: AdaptiveRateLimiter,
+        breakers: CircuitBreakerRegistry,
+        hedging: HedgePolicy
+    ):
+        """
+        호출기 초기화
+
+        Args:
+            client: 동기 SDK 클라이언트
+            async_client: 비동기 SDK 클라이언트
+            rate_limiter: 계정 단위 속도 제한기
+            breakers: 모델별 서킷 브레이커
+            hedging: 헤징 정책
+        """
+        self.client = client
+        self.async_client = async_client
+        self.rate_limiter = rate_limiter
+        self.breakers = breakers
+        self.hedging = hedging
+
+    async def _acreate(self, request: Dict[str, Any], on_delta: Optional[DeltaHandler] = None) -> Any:
+        """
+        비동기 messages.create 호출 (on_delta가 있으면 스트리밍으로 호출)
+
+        Args:
+            request: API 호출 인자
+            on_delta: 토큰 델타 콜백
+
+        Returns:
+            SDK Message 객체
+        """
+        if on_delta is None:
+            raw = await self.async_client.messages.with_raw_response.create(**request)
+            self.rate_limiter.update_from_headers(raw.headers)
+            return raw.parse()
+
+        async with self.async_client.messages.stream(**request) as stream:
+            self.rate_limiter.update_from_headers(getattr(getattr(stream, "response", None), "headers", None))
+            async for text in stream.text_stream:
+                await on_delta(text)
+            return await stream.get_final_message()
+
+    async def _acreate_attempt(
+        self,
+        request: Dict[str, Any],
+        on_delta: Optional[DeltaHandler],
+        hedge: bool,
+        reserved: int
+    ) -> Any:
+        """
+        헤징 정책이 실행하는 호출 한 번 (헤지 요청은 속도 제한기 한도를 따로 받음)
+
+        Args:
+            request: API 호출 인자
+            on_delta: 토큰 델타 콜백
+            hedge: 헤지 요청 여부
+            reserved: 예약할 예상 토큰 수
+
+        Returns:
+            SDK Message 객체
+        """
+        if not hedge:
+            return await self._acreate(request, on_delta)
+        await self.rate_limiter.acquire(reserved)
+        used = 0
+        try:
+            response = await self._acreate(request, on_delta)
+            used = response.usage.input_tokens + response.usage.output_tokens
+            return response
+        finally:
+            self.rate_limiter.settle(reserved, used)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        재시도 대기 시간 결정 (재시도하지 않을 오류면 None)
+
+        속도 제한/과부하 응답이면 속도 제한기를 retry-after 동안 멈추므로 모든 호출이 함께 기다린다.
+
+        Args:
+            error: 발생한 예외
+            attempt: 지금까지의 재시도 횟수
+
+        Returns:
+            이 호출만 추가로 기다릴 시간 (초), 재시도하지 않으면 None
+        """
+        if attempt >= LLM_MAX_RETRIES or not is_retryable(error):
+            return None
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        self.rate_limiter.update_from_headers(headers)
+        delay = retry_after_seconds(headers)
+        if delay is None:
+            delay = backoff_delay(attempt, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY)
+        status = getattr(error, "status_code", None)
+        metrics.increment("llm_retries", status=status or "connection")
+        logger.warning(f"Anthropic API 재시도 {attempt + 1}/{LLM_MAX_RETRIES} ({delay:.1f}초 후): {str(error)}")
+        if status in THROTTLE_STATUS_CODES:
+            self.rate_limiter.penalize(delay)
+            return 0.0
+        return delay
+
+    @staticmethod
+    def _record_latency(request: Dict[str, Any], started: float, agent: Optional[str]) -> None:
+        """
+        모델별 API 호출 지연 시간 메트릭 기록 (성공한 시도 한 번의 시간, 대기/재시도 제외)
+
+        Args:
+            request: API 호출 인자
+            started: 호출 시작 시각 (time.monotonic)
+            agent: 호출한 에이전트 이름 (없으면 현재 그래프 노드)
+        """
+        metrics.observe(
+            "llm_latency_seconds",
+            time.monotonic() - started,
+            model=request["model"],
+            agent=agent or current_node.get() or "unknown"
+        )
+
+    async def acreate(
+        self,
+        request: Dict[str, Any],
+        on_delta: Optional[DeltaHandler] = None,
+        agent: Optional[str] = None
+    ) -> Any:
+        """
+        속도 제한기를 거쳐 호출하고 재시도 가능한 오류는 백오프 후 재시도
+
+        Args:
+            request: API 호출 인자
+            on_delta: 토큰 델타 콜백
+            agent: 지연 시간 집계용 에이전트 이름
+
+        Returns:
+            SDK Message 객체
+        """
+        reserved = estimate_tokens(request)
+        emitted = False
+        first_delta_at: Optional[float] = None
+
+        async def forward(text: str) -> None:
+            nonlocal emitted, first_delta_at
+            if first_delta_at is None:
+                first_delta_at = time.monotonic()
+            emitted = True
+            await on_delta(text)
+
+        mode = "stream" if on_delta is not None else "complete"
+        hedge_key = (request["model"], agent or current_node.get() or "unknown", mode)
+        breaker = self.breakers.get(request["model"])
+
+        attempt = 0
+        while True:
+            # 회로가 열려 있으면 속도 제한기 대기 없이 바로 CircuitOpen
+            breaker.before_call()
+            acquired = False
+            timed_request: Optional[Dict[str, Any]] = None
+            used = 0
+            failure: Optional[Exception] = None
+            try:
+                await self.rate_limiter.acquire(reserved)
+                acquired = True
+                timed_request = with_timeout(request)
+                started = time.monotonic()
+                response = await self.hedging.run(
+                    hedge_key,
+                    lambda handler, hedge: self._acreate_attempt(timed_request, handler, hedge, reserved),
+                    forward if on_delta is not None else None
+                )
+                used = response.usage.input_tokens + response.usage.output_tokens
+            except asyncio.CancelledError:
+                # 취소되면 SDK가 HTTP 응답(스트림)을 닫아 연결을 끊으므로 서버 쪽 생성도 중단됨
+                breaker.release()
+                if timed_request is not None:
+                    metrics.increment("llm_calls_cancelled", model=request.get("model"), agent=agent or "unknown")
+                raise
+            except Exception as e:
+                if timed_request is None:
+                    # 호출 전에 실패(기한 초과 등)한 것은 모델 상태와 무관
+                    breaker.release()
+                    raise
+                failure = e
+            finally:
+                # Reason: 취소/실패한 시도의 예약분을 돌려주지 않으면 TPM 버킷에 남아 다른 호출까지 막힘
+                if acquired:
+                    self.rate_limiter.settle(reserved, used)
+
+            if failure is None:
+                # 느린 응답 판정은 첫 응답 지연 기준이므로 첫 델타가 있는 스트리밍 호출만 지연을 넘김
+                # (일반 호출의 완료 시간은 출력 길이에 비례해 길어도 정상)
+                breaker.record(True, first_delta_at - started if first_delta_at is not None else None)
+                self._record_latency(request, started, agent)
+                return response
+
+            record_failure(breaker, timed_request, failure)
+            # 이미 델타를 보낸 스트림은 다시 호출하면 내용이 중복되므로 재시도하지 않음
+            delay = None if emitted else self._retry_delay(failure, attempt)
+            if delay is None or past_deadline(delay):
+                raise failure
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def create(self, request: Dict[str, Any], agent: Optional[str] = None) -> Any:
+        """
+        동기 messages.create 호출 (재시도 가능한 오류는 백오프 후 재시도)
+
+        Args:
+            request: API 호출 인자
+            agent: 지연 시간 집계용 에이전트 이름
+
+        Returns:
+            SDK Message 객체
+        """
+        breaker = self.breakers.get(request["model"])
+        attempt = 0
+        while True:
+            timed_request = with_timeout(request)
+            breaker.before_call()
+            started = time.monotonic()
+            try:
+                response = self.client.messages.create(**timed_request)
+                # 동기 호출은 첫 응답 시각을 알 수 없으므로 성공만 기록
+                breaker.record(True)
+                self._record_latency(request, started, agent)
+                return response
+            except Exception as e:
+                record_failure(breaker, timed_request, e)
+                delay = self._retry_delay(e, attempt)
+                if delay is None or past_deadline(delay):
+                    raise
+                time.sleep(max(delay, self.rate_limiter.snapshot()["blocked_for"]))
+                attempt += 1
@@ -0,0 +1,115 @@
+"""
+요청 단위 로그 캡처
+loguru 레코드를 contextvars로 전파되는 request_id로 구분하여 요청별 링 버퍼에 저장하고 실시간 리스너로 전달
+"""
+import asyncio
+import threading
+import contextlib
+from collections import deque
+from typing import Dict, Any, Callable, Deque, Iterator, Optional, Tuple
+from loguru import logger
+
+# 요청당 보관하는 최대 로그 항목 수 (초과 시 가장 오래된 항목부터 버림)
+MAX_RECORDS_PER_REQUEST = 100
+
+LogListener = Callable[[Dict[str, Any]], None]
+
+class LogCapture:
+    """
+    요청별 로그 캡처
+
+    레코드 하나당 사전 조회와 deque 추가만 수행하므로 비용이 요청 수나 버퍼 크기와 무관하게 일정하다.
+    """
+
+    def __init__(self, max_records: int = MAX_RECORDS_PER_REQUEST):
+        """
+        로그 캡처 초기화
+
+        Args:
+            max_records: 요청당 최대 로그 항목 수
+        """
+        self.max_records = max_records
+        self._buffers: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._listeners: Dict[str, Tuple[asyncio.AbstractEventLoop, int, LogListener]] = {}
+        self._handler_id: Optional[int] = None
+
+    def install(self) -> None:
+        """
+        loguru 싱크 등록 (logger.remove() 이후 다시 호출해도 중복 등록되지 않음)
+        """
+        if self._handler_id is not None:
+            with contextlib.suppress(ValueError):
+                logger.remove(self._handler_id)
+        # request_id가 없는 레코드는 포맷팅 전에 걸러냄
+        self._handler_id = logger.add(
+            self.sink,
+            filter=lambda record: "request_id" in record["extra"],
+            format="{message}"
+        )
+
+    def sink(self, message: Any) -> None:
+        """
+        loguru 싱크 (레코드를 해당 요청의 버퍼와 리스너로 전달)
+
+        Args:
+            message: loguru 메시지 (레코드 사전은 message.record)
+        """
+        record = message.record
+        request_id = record["extra"].get("request_id")
+        buffer = self._buffers.get(request_id)
+        if buffer is None:
+            return
+
+        entry = {
+            "time": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
+            "level": record["level"].name,
+            "message": record["message"],
+            "name": record["name"],
+            "function": record["function"],
+            "line": record["line"]
+        }
+        buffer.append(entry)
+
+        listener = self._listeners.get(request_id)
+        if listener is None:
+            return
+        loop, loop_thread, callback = listener
+        # Reason: 이벤트 루프 스레드에서는 바로 호출해야 다른 프레임과 순서가 유지되고,
+        # asyncio.to_thread 등 다른 스레드의 레코드는 루프로 넘겨야 스레드 안전함
+        try:
+            if threading.get_ident() == loop_thread:
+                callback(entry)
+            else:
+                loop.call_soon_threadsafe(callback, entry)
+        except Exception:
+            # 싱크 안에서 로그를 남기면 재귀 호출되므로 무시
+            pass
+
+    @contextlib.contextmanager
+    def capture(self, request_id: str, listener: Optional[LogListener] = None) -> Iterator[Deque[Dict[str, Any]]]:
+        """
+        블록 안(하위 태스크 포함)에서 발생한 로그를 request_id로 캡처
+
+        Args:
+            request_id: 요청 ID
+            listener: 레코드마다 이벤트 루프 스레드에서 호출할 콜백 (실시간 전송용)
+
+        Yields:
+            이 요청의 로그 링 버퍼
+        """
+        if self._handler_id is None:
+            self.install()
+
+        buffer: Deque[Dict[str, Any]] = deque(maxlen=self.max_records)
+        self._buffers[request_id] = buffer
+        if listener is not None:
+            self._listeners[request_id] = (asyncio.get_running_loop(), threading.get_ident(), listener)
+        try:
+            with logger.contextualize(request_id=request_id):
+                yield buffer
+        finally:
+            self._buffers.pop(request_id, None)
+            self._listeners.pop(request_id, None)
+
+# 싱글턴 인스턴스
+log_capture = LogCapture()
@@ -0,0 +1,219 @@
+"""
+프로세스 내 메트릭 수집 유틸리티
+카운터, 게이지, 요약(횟수/합계/최대값)을 라벨별로 집계하여 /metrics 엔드포인트로 노출
+"""
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+
+def _metric_key(name: str, labels: Dict[str, Any]) -> str:
+    """
+    메트릭 이름과 라벨로 키 생성
+
+    Args:
+        name: 메트릭 이름
+        labels: 라벨 사전
+
+    Returns:
+        예: llm_calls{agent=planning,model=claude-3-opus-20240229}
+    """
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+    return f"{name}{{{label_str}}}"
+
+class MetricsRegistry:
+    """
+    스레드 안전한 메트릭 레지스트리
+    """
+
+    def __init__(self):
+        """
+        메트릭 레지스트리 초기화
+        """
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._summaries: Dict[str, Dict[str, float]] = {}
+        # 마지막 take_delta 시점의 값 (다른 프로세스로 변화량만 전달)
+        self._sent_counters: Dict[str, float] = {}
+        self._sent_summaries: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """
+        카운터 증가
+
+        Args:
+            name: 메트릭 이름
+            value: 증가량
+            **labels: 라벨
+        """
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """
+        게이지 값 설정
+
+        Args:
+            name: 메트릭 이름
+            value: 현재 값
+            **labels: 라벨
+        """
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        관측값 기록 (횟수, 합계, 최대값 집계)
+
+        Args:
+            name: 메트릭 이름
+            value: 관측값
+            **labels: 라벨
+        """
+        key = _metric_key(name, labels)
+        with self._lock:
+            summary = self._summaries.setdefault(key, {"count": 0, "sum": 0.0, "max": 0.0})
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+
+    def take_delta(self) -> Dict[str, Any]:
+        """
+        마지막 호출 이후의 카운터/요약 변화량 반환 (워커 프로세스가 API 프로세스로 전달)
+
+        게이지는 프로세스별 현재 값이라 더할 수 없으므로 제외한다.
+
+        Returns:
+            counters, summaries 변화량 사전 (요약의 max는 누적 최대값)
+        """
+        with self._lock:
+            counters = {}
+            for key, value in self._counters.items():
+                change = value - self._sent_counters.get(key, 0.0)
+                if change:
+                    counters[key] = change
+            summaries = {}
+            for key, summary in self._summaries.items():
+                sent = self._sent_summaries.get(key, {"count": 0, "sum": 0.0})
+                if summary["count"] != sent["count"]:
+                    summaries[key] = {
+                        "count": summary["count"] - sent["count"],
+                        "sum": summary["sum"] - sent["sum"],
+                        "max": summary["max"]
+                    }
+            self._sent_counters = dict(self._counters)
+            self._sent_summaries = {key: dict(summary) for key, summary in self._summaries.items()}
+        return {"counters": counters, "summaries": summaries}
+
+    def merge(self, delta: Dict[str, Any]) -> None:
+        """
+        다른 프로세스의 변화량 합산
+
+        Args:
+            delta: take_delta() 결과
+        """
+        with self._lock:
+            for key, value in delta.get("counters", {}).items():
+                self._counters[key] += value
+            for key, change in delta.get("summaries", {}).items():
+                summary = self._summaries.setdefault(key, {"count": 0, "sum": 0.0, "max": 0.0})
+                summary["count"] += change["count"]
+                summary["sum"] += change["sum"]
+                summary["max"] = max(summary["max"], change["max"])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 메트릭 스냅샷 반환
+
+        Returns:
+            counters, gauges, summaries 사전
+        """
+        with self._lock:
+            summaries = {}
+            for key, summary in self._summaries.items():
+                summaries[key] = {
+                    **summary,
+                    "avg": summary["sum"] / summary["count"] if summary["count"] else 0.0
+                }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": summaries
+            }
+
+# 싱글턴 인스턴스
+metrics = MetricsRegistry()
+
+class RequestStats:
+    """
+    요청 단위 실행 통계 (LLM 호출 횟수 등)
+    """
+
+    def __init__(self):
+        """
+        요청 통계 초기화
+        """
+        self.llm_calls = 0
+        self.cache_hits = 0
+        self.coalesced_calls = 0
+        self.speculative_llm_calls = 0
+
+    def merge(self, other: "RequestStats", wasted: bool = False) -> None:
+        """
+        다른 통계(추측 실행 등)를 현재 요청 통계에 합산
+
+        Args:
+            other: 합산할 통계
+            wasted: 결과가 폐기된 실행인지 여부 (폐기되면 speculative_llm_calls에만 합산)
+        """
+        if wasted:
+            self.speculative_llm_calls += other.llm_calls
+            return
+        self.llm_calls += other.llm_calls
+        self.cache_hits += other.cache_hits
+        self.coalesced_calls += other.coalesced_calls
+
+    def to_dict(self) -> Dict[str, int]:
+        """
+        통계 사전 반환
+
+        Returns:
+            통계 값
+        """
+        return {
+            "llm_calls": self.llm_calls,
+            "cache_hits": self.cache_hits,
+            "coalesced_calls": self.coalesced_calls,
+            "speculative_llm_calls": self.speculative_llm_calls,
+        }
+
+# 현재 요청의 통계 객체 (AgentGraph.run에서 설정, 하위 태스크에 전파)
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+def record_llm_call(cached: bool = False, coalesced: bool = False) -> None:
+    """
+    LLM 호출 1회 기록 (전역 카운터와 현재 요청 통계 모두)
+
+    Args:
+        cached: 응답 캐시 적중 여부 (적중 시 실제 API 호출로 세지 않음)
+        coalesced: 진행 중인 동일 호출을 공유했는지 여부 (실제 API 호출로 세지 않음)
+    """
+    stats = current_request_stats.get()
+    if coalesced:
+        metrics.increment("llm_calls_coalesced")
+        if stats is not None:
+            stats.coalesced_calls += 1
+        return
+    if cached:
+        metrics.increment("llm_cache_served_calls")
+        if stats is not None:
+            stats.cache_hits += 1
+        return
+    metrics.increment("llm_api_calls")
+    if stats is not None:
+        stats.llm_calls += 1
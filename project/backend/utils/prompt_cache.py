@@ -0,0 +1,92 @@
+"""
+Anthropic 프롬프트 캐시 표시
+모델별 최소 캐시 길이에 못 미치는 접두부의 cache_control 표시를 빼서, 실제로 캐시되는 접두부에만 표시가 남도록 함
+"""
+import json
+from typing import Any, Dict, Iterator
+
+from backend.utils.metrics import metrics
+
+# Anthropic 프롬프트 캐시 표시 (5분 TTL ephemeral 캐시)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# 캐시할 수 있는 최소 접두부 길이 (토큰), 이보다 짧은 접두부의 cache_control은 API가 무시함
+MIN_CACHEABLE_TOKENS = 1024
+MIN_CACHEABLE_TOKENS_HAIKU = 2048
+
+def min_cacheable_tokens(model: str) -> int:
+    """
+    모델의 최소 캐시 접두부 길이
+
+    Args:
+        model: 모델 ID
+
+    Returns:
+        최소 토큰 수
+    """
+    return MIN_CACHEABLE_TOKENS_HAIKU if "haiku" in model else MIN_CACHEABLE_TOKENS
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    텍스트 토큰 수 근사
+
+    Reason: 영문은 문자 4개당 약 1토큰이지만 한글은 글자 하나가 1토큰 안팎이므로,
+    비ASCII 문자를 1토큰으로 세어 한글 프롬프트를 과소평가하지 않도록 한다.
+
+    Args:
+        text: 텍스트
+
+    Returns:
+        예상 토큰 수
+    """
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return (len(text) - non_ascii) // 4 + non_ascii
+
+def _blocks(request: Dict[str, Any]) -> Iterator[Any]:
+    """
+    캐시 접두부 순서(tools -> system -> messages)대로 요청 구성 요소 나열
+
+    Args:
+        request: API 호출 인자
+
+    Yields:
+        도구 정의, 시스템 블록, 메시지 내용 블록 (문자열 또는 사전)
+    """
+    yield from request.get("tools") or []
+    system = request.get("system")
+    if isinstance(system, list):
+        yield from system
+    elif system:
+        yield system
+    for message in request.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, list):
+            yield from content
+        else:
+            yield content
+
+def apply_cache_minimum(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    최소 캐시 길이에 못 미치는 접두부의 cache_control 표시 제거 (요청을 직접 수정)
+
+    캐시 표시는 그 블록까지의 접두부 전체(도구, 시스템 메시지, 앞선 메시지 포함)를 캐시하므로,
+    앞에서부터 누적한 토큰 수로 각 표시의 효과를 판단한다.
+
+    Args:
+        request: API 호출 인자
+
+    Returns:
+        같은 요청
+    """
+    minimum = min_cacheable_tokens(request["model"])
+    prefix_tokens = 0
+    for block in _blocks(request):
+        if isinstance(block, str):
+            prefix_tokens += estimate_text_tokens(block)
+            continue
+        text = block["text"] if block.get("type") == "text" else json.dumps(block, ensure_ascii=False)
+        prefix_tokens += estimate_text_tokens(text)
+        if "cache_control" in block and prefix_tokens < minimum:
+            del block["cache_control"]
+            metrics.increment("llm_prompt_cache_skipped", model=request["model"])
+    return request
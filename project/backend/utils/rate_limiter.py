@@ -0,0 +1,266 @@
+"""
+LLM 호출 속도 제한
+분당 요청(RPM)/토큰(TPM) 토큰 버킷으로 호출을 한도 안에서 내보내고, 응답의 rate-limit/retry-after 헤더에 맞춰 조정
+"""
+import json
+import time
+import random
+import asyncio
+from typing import Any, Dict, Mapping, Optional
+from loguru import logger
+import httpx
+from anthropic import APIConnectionError, APIStatusError
+
+from backend.utils.metrics import metrics
+
+# 재시도 대상 HTTP 상태 (요청 시간 초과, 충돌, 속도 제한, 서버 오류, 과부하)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+def is_retryable(error: Exception) -> bool:
+    """
+    재시도해도 되는 오류인지 판별 (인증/잘못된 요청 등은 재시도하지 않음)
+
+    Args:
+        error: 발생한 예외
+
+    Returns:
+        재시도 가능 여부
+    """
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (APIConnectionError, httpx.TransportError))
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    retry-after 헤더 해석
+
+    Args:
+        headers: 응답 헤더
+
+    Returns:
+        대기 시간 (초, 헤더가 없으면 None)
+    """
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    지수 백오프 대기 시간 (full jitter)
+
+    Args:
+        attempt: 재시도 횟수 (0부터)
+        base: 기본 대기 시간 (초)
+        cap: 최대 대기 시간 (초)
+
+    Returns:
+        대기 시간 (초)
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def estimate_tokens(request: Dict[str, Any]) -> int:
+    """
+    요청이 소비할 토큰 수 추정 (입력은 문자 4개당 1토큰으로 근사, 출력은 max_tokens)
+
+    Args:
+        request: messages.create 호출 인자
+
+    Returns:
+        예상 토큰 수
+    """
+    text = json.dumps([request.get("system"), request.get("messages")], ensure_ascii=False)
+    return len(text) // 4 + int(request.get("max_tokens", 0))
+
+class TokenBucket:
+    """
+    분당 한도 토큰 버킷 (연속 충전, 잔량은 음수가 될 수 있어 큰 요청도 순서대로 통과)
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        토큰 버킷 초기화
+
+        Args:
+            per_minute: 분당 한도 (버킷 용량)
+        """
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """
+        초당 충전량
+        """
+        return self.capacity / 60.0
+
+    def _refill(self) -> None:
+        """
+        경과 시간만큼 충전
+        """
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        amount만큼 꺼내려면 기다려야 하는 시간
+
+        Args:
+            amount: 필요한 양 (용량보다 크면 가득 찰 때까지만 기다림)
+
+        Returns:
+            대기 시간 (초)
+        """
+        self._refill()
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def take(self, amount: float) -> None:
+        """
+        amount만큼 차감
+
+        Args:
+            amount: 차감량 (음수면 환불)
+        """
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+    def sync(self, remaining: float, limit: Optional[float] = None) -> None:
+        """
+        서버가 알려준 잔량으로 보정 (다른 클라이언트와 한도를 나눠 쓰는 경우 서버 쪽 잔량이 더 적음)
+
+        Args:
+            remaining: 서버 기준 잔량
+            limit: 서버 기준 분당 한도
+        """
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+        self.level = min(self.level, remaining, self.capacity)
+
+class AdaptiveRateLimiter:
+    """
+    RPM/TPM 버킷을 함께 적용하는 비동기 속도 제한기
+
+    대기는 잠금으로 직렬화하여 먼저 온 호출이 먼저 나가며, 429/과부하 응답의 retry-after 동안은
+    모든 호출을 멈춰 한도 근처에서 과부하와 실패를 오가지 않도록 한다.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        속도 제한기 초기화
+
+        Args:
+            requests_per_minute: 분당 요청 한도
+            tokens_per_minute: 분당 토큰 한도 (입력+출력)
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._blocked_until = 0.0
+        self._share = 1.0
+        self._lock = asyncio.Lock()
+
+    def scale(self, factor: float) -> None:
+        """
+        한도를 비율로 조정 (여러 프로세스가 같은 계정 한도를 나눠 쓸 때)
+
+        Args:
+            factor: 비율
+        """
+        self._share *= factor
+        for bucket in (self.requests, self.tokens):
+            bucket.capacity *= factor
+            bucket.level = min(bucket.level, bucket.capacity)
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        요청 1건과 예상 토큰만큼 한도가 생길 때까지 대기 후 차감
+
+        Args:
+            tokens: 예상 토큰 수 (입력 추정치 + max_tokens)
+        """
+        async with self._lock:
+            started = time.monotonic()
+            while True:
+                delay = max(
+                    self._blocked_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens)
+                )
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            waited = time.monotonic() - started
+            if waited > 0:
+                metrics.observe("llm_rate_limit_wait_seconds", waited)
+
+    def settle(self, reserved: int, used: int) -> None:
+        """
+        예상 토큰과 실제 사용량 차이 정산
+
+        Args:
+            reserved: acquire에서 차감한 토큰 수
+            used: 실제 사용한 토큰 수
+        """
+        self.tokens.take(used - reserved)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        anthropic-ratelimit-* 응답 헤더로 버킷 보정
+
+        Args:
+            headers: 응답 헤더
+        """
+        if not headers:
+            return
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            remaining = headers.get(f"anthropic-ratelimit-{kind}-remaining")
+            if remaining is None:
+                continue
+            try:
+                limit = headers.get(f"anthropic-ratelimit-{kind}-limit")
+                # 헤더 값은 계정 전체 기준이므로 이 프로세스 몫으로 환산
+                bucket.sync(float(remaining) * self._share, float(limit) * self._share if limit else None)
+            except ValueError:
+                continue
+
+    def penalize(self, delay: float) -> None:
+        """
+        속도 제한/과부하 응답 후 delay 동안 모든 호출 중단
+
+        Args:
+            delay: 중단 시간 (초)
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        metrics.increment("llm_rate_limited")
+        logger.warning(f"LLM 속도 제한 응답, {delay:.1f}초 동안 호출 중단")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 버킷 상태
+
+        Returns:
+            요청/토큰 잔량과 한도
+        """
+        self.requests._refill()
+        self.tokens._refill()
+        return {
+            "requests": {"remaining": round(self.requests.level, 1), "limit": self.requests.capacity},
+            "tokens": {"remaining": round(self.tokens.level, 1), "limit": self.tokens.capacity},
+            "blocked_for": max(0.0, round(self._blocked_until - time.monotonic(), 2))
+        }
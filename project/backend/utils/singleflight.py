@@ -0,0 +1,145 @@
+"""
+동일 요청 합치기 (singleflight)
+같은 키로 동시에 들어온 호출은 하나의 실행을 공유하고 모두 같은 결과를 받음
+"""
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# 델타 콜백 타입 (anthropic_client.DeltaHandler와 동일)
+DeltaHandler = Callable[[str], Awaitable[None]]
+
+class _Flight:
+    """
+    진행 중인 공유 실행 하나
+    """
+
+    def __init__(self):
+        """
+        공유 실행 초기화
+        """
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.deltas: List[str] = []
+        self.subscribers: List[asyncio.Queue] = []
+
+    async def publish(self, text: str) -> None:
+        """
+        델타를 기록하고 모든 구독자 큐에 전달
+
+        Args:
+            text: 토큰 델타
+        """
+        self.deltas.append(text)
+        for queue in self.subscribers:
+            queue.put_nowait(text)
+
+    def finish(self, _task: asyncio.Task) -> None:
+        """
+        실행 종료를 구독자에게 알림 (task done 콜백)
+        """
+        for queue in self.subscribers:
+            queue.put_nowait(None)
+
+class SingleFlight:
+    """
+    키별 진행 중 실행 공유
+
+    공유 실행은 별도 태스크로 돌기 때문에 대기자 하나가 취소되어도 나머지는 계속 기다릴 수 있고,
+    마지막 대기자가 떠나면 실행도 취소한다. 델타는 대기자마다 자기 태스크(자기 컨텍스트)에서
+    콜백하므로 호출자별 스트리밍 대상이 섞이지 않는다.
+
+    공유 실행은 빈 컨텍스트에서 돌기 때문에 처음 호출한 쪽의 요청 처리 기한, 요청 통계, 현재 노드 같은
+    컨텍스트 변수가 다른 대기자에게 적용되지 않는다. 기한은 대기자마다 timeout으로 따로 적용한다.
+    """
+
+    def __init__(self):
+        """
+        singleflight 초기화
+        """
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """
+        키가 같은 실행이 진행 중인지 확인 (바로 이어서 do를 부르면 합류 여부와 같음)
+
+        Args:
+            key: 요청 키
+
+        Returns:
+            진행 중 여부
+        """
+        return key in self._flights
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        """
+        끝났거나 취소된 실행을 목록에서 제거
+
+        Args:
+            key: 요청 키
+            flight: 제거할 실행
+        """
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[Optional[DeltaHandler]], Awaitable[Any]],
+        on_delta: Optional[DeltaHandler] = None,
+        timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        키가 같은 실행이 진행 중이면 합류하고, 없으면 새로 시작
+
+        Args:
+            key: 요청 키 (스트리밍 여부가 다르면 다른 키를 써야 함)
+            fn: 실행 함수 (델타 콜백을 받아 결과 반환, 빈 컨텍스트에서 실행됨)
+            on_delta: 이 호출자의 델타 콜백 (합류 시 이전 델타부터 재생)
+            timeout: 이 호출자가 기다릴 최대 시간 (초, 넘기면 이 호출자만 빠지고 실행은 다른 대기자를 위해 계속)
+
+        Returns:
+            (결과, 다른 호출자의 실행을 공유했는지 여부)
+
+        Raises:
+            TimeoutError: timeout 안에 결과를 받지 못한 경우
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            # Reason: 호출자 컨텍스트에서 띄우면 첫 호출자의 기한/통계/노드가 모든 대기자의 실행에 적용됨
+            flight.task = asyncio.create_task(
+                fn(flight.publish if on_delta is not None else None), context=contextvars.Context()
+            )
+            flight.task.add_done_callback(flight.finish)
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        queue: Optional[asyncio.Queue] = None
+        if on_delta is not None:
+            queue = asyncio.Queue()
+            for text in flight.deltas:
+                queue.put_nowait(text)
+            if flight.task.done():
+                queue.put_nowait(None)
+            flight.subscribers.append(queue)
+
+        try:
+            async with asyncio.timeout(timeout):
+                if queue is None:
+                    return await asyncio.shield(flight.task), shared
+                while True:
+                    text = await queue.get()
+                    if text is None:
+                        break
+                    await on_delta(text)
+            return flight.task.result(), shared
+        finally:
+            if queue is not None:
+                flight.subscribers.remove(queue)
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
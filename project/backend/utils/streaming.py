@@ -0,0 +1,147 @@
+"""
+스트리밍 이벤트 전달 유틸리티
+LLM 토큰 델타와 노드 진행 상황을 타입이 지정된 프레임으로 클라이언트에 전달
+"""
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator
+from loguru import logger
+
+SendFunc = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class StreamEmitter:
+    """
+    요청 단위 스트림 프레임 송신기
+
+    모든 프레임에 단조 증가하는 시퀀스 번호를 붙여 클라이언트가 순서를 복원할 수 있게 한다.
+    """
+
+    def __init__(
+        self,
+        send: SendFunc,
+        stream_tokens: bool = True,
+        send_nowait: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        스트림 송신기 초기화
+
+        Args:
+            send: 프레임(dict)을 전송하는 코루틴 함수 (예: websocket.send_json)
+            stream_tokens: LLM 토큰 델타 프레임 전송 여부 (False면 노드 진행 프레임만 전송)
+            send_nowait: 프레임을 동기적으로 전송하는 함수 (예: asyncio.Queue.put_nowait, emit_nowait용)
+        """
+        self._send = send
+        self._send_nowait = send_nowait
+        self._seq = 0
+        self.stream_tokens = stream_tokens
+
+    async def emit(self, frame_type: str, node: Optional[str] = None, **payload: Any) -> None:
+        """
+        프레임 전송
+
+        Args:
+            frame_type: 프레임 타입 (token, node_start, node_end, result 등)
+            node: 프레임을 발생시킨 그래프 노드 이름
+            **payload: 프레임 본문
+        """
+        self._seq += 1
+        frame = {"type": frame_type, "node": node, "seq": self._seq, **payload}
+        try:
+            await self._send(frame)
+        except Exception as e:
+            # Reason: 클라이언트 전송 실패가 에이전트 실행 자체를 중단시키지 않도록 로그만 남김
+            logger.warning(f"스트림 프레임 전송 실패 ({frame_type}): {str(e)}")
+
+    def emit_nowait(self, frame_type: str, node: Optional[str] = None, **payload: Any) -> None:
+        """
+        await할 수 없는 곳(로그 싱크 등)에서 이벤트 루프 스레드로 프레임 전송
+
+        Args:
+            frame_type: 프레임 타입
+            node: 프레임을 발생시킨 그래프 노드 이름
+            **payload: 프레임 본문
+        """
+        if self._send_nowait is None:
+            return
+        self._seq += 1
+        frame = {"type": frame_type, "node": node, "seq": self._seq, **payload}
+        try:
+            self._send_nowait(frame)
+        except Exception:
+            # 로그 프레임 전송 중 로그를 남기면 재귀 호출되므로 무시
+            pass
+
+    async def forward(self, frame: Dict[str, Any]) -> None:
+        """
+        다른 송신기가 만든 프레임을 이 송신기의 시퀀스 번호로 다시 전송
+
+        Args:
+            frame: 원본 프레임
+        """
+        payload = {k: v for k, v in frame.items() if k not in ("type", "node", "seq")}
+        await self.emit(frame["type"], node=frame.get("node"), **payload)
+
+# 현재 요청의 송신기와 실행 중인 노드 이름 (asyncio 태스크 단위로 격리)
+current_emitter: ContextVar[Optional[StreamEmitter]] = ContextVar("current_emitter", default=None)
+current_node: ContextVar[Optional[str]] = ContextVar("current_node", default=None)
+
+def is_streaming() -> bool:
+    """
+    현재 컨텍스트에서 토큰 스트리밍 모드가 활성화되어 있는지 확인
+
+    Returns:
+        스트리밍 여부
+    """
+    emitter = current_emitter.get()
+    return emitter is not None and emitter.stream_tokens
+
+async def emit_event(frame_type: str, node: Optional[str] = None, **payload: Any) -> None:
+    """
+    현재 노드 이름을 붙여 프레임 전송 (스트리밍 모드가 아니면 무시)
+
+    Args:
+        frame_type: 프레임 타입
+        node: 노드 이름 (없으면 현재 실행 중인 노드)
+        **payload: 프레임 본문
+    """
+    emitter = current_emitter.get()
+    if emitter is not None:
+        await emitter.emit(frame_type, node=node or current_node.get(), **payload)
+
+async def emit_token(text: str) -> None:
+    """
+    LLM 토큰 델타 전송
+
+    Args:
+        text: 토큰 델타 텍스트
+    """
+    await emit_event("token", text=text)
+
+def get_token_handler() -> Optional[Callable[[str], Awaitable[None]]]:
+    """
+    LLM 클라이언트에 넘길 토큰 콜백 반환
+
+    Returns:
+        스트리밍 모드이면 emit_token, 아니면 None
+    """
+    return emit_token if is_streaming() else None
+
+@asynccontextmanager
+async def node_scope(node: str) -> AsyncIterator[None]:
+    """
+    그래프 노드 실행 구간 표시 (node_start/node_end/node_error 프레임 전송 및 토큰 태깅)
+
+    Args:
+        node: 그래프 노드 이름
+    """
+    token = current_node.set(node)
+    try:
+        await emit_event("node_start")
+        try:
+            yield
+        except Exception as e:
+            await emit_event("node_error", message=str(e))
+            raise
+        await emit_event("node_end")
+    finally:
+        current_node.reset(token)
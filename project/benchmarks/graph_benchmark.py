@@ -0,0 +1,188 @@
+"""
+에이전트 그래프 오프라인 벤치마크 스크립트
+가짜 LLM 백엔드(또는 녹화 재생)로 그래프/엔드포인트를 동시 실행하여 지연 시간과 처리량 측정
+
+사용 예:
+    python benchmarks/graph_benchmark.py --runs 20 --concurrency 5
+    python benchmarks/graph_benchmark.py --mode http --ttft-ms 200 --tokens-per-second 150
+    python benchmarks/graph_benchmark.py --backend replay --replay-speed 0
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 프로젝트 루트 디렉토리를 파이썬 패스에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+def parse_args() -> argparse.Namespace:
+    """
+    명령행 인자 파싱
+    """
+    parser = argparse.ArgumentParser(description="에이전트 그래프 오프라인 벤치마크")
+    parser.add_argument("--runs", type=int, default=10, help="전체 실행 횟수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 실행 수")
+    parser.add_argument("--mode", choices=["graph", "http"], default="graph", help="graph: AgentGraph 직접 실행, http: /api/v1/process 호출")
+    parser.add_argument("--backend", choices=["fake", "replay", "record", "anthropic"], default="fake", help="LLM 백엔드")
+    parser.add_argument("--request", default="'Hello World {i}' alert를 표시하는 버튼 Vue 컴포넌트를 만들어주세요.", help="요청 문장 ({i}는 실행 번호)")
+    parser.add_argument("--ttft-ms", type=float, help="가짜 백엔드 첫 토큰 지연 중앙값 (밀리초)")
+    parser.add_argument("--ttft-sigma", type=float, help="가짜 백엔드 첫 토큰 지연 로그정규 시그마 (클수록 꼬리가 김)")
+    parser.add_argument("--tokens-per-second", type=float, help="가짜 백엔드 초당 출력 토큰")
+    parser.add_argument("--output-tokens", type=int, help="가짜 백엔드 출력 토큰 수 중앙값")
+    parser.add_argument("--error-rate", type=float, help="가짜 백엔드 529 오류 비율")
+    parser.add_argument("--replay-speed", type=float, help="재생 배속 (0이면 지연 없이 재생)")
+    parser.add_argument("--hedge", action="store_true", help="LLM 요청 헤징 사용")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    return parser.parse_args()
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """
+    백엔드 모듈을 가져오기 전에 설정 환경 변수 지정 (설정은 import 시점에 읽힘)
+
+    Args:
+        args: 명령행 인자
+    """
+    os.environ["LLM_BACKEND"] = args.backend
+    # 같은 요청 결과를 재사용하면 측정이 왜곡되므로 응답 캐시는 끔
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "warning")
+    overrides = {
+        "LLM_FAKE_TTFT_MS": args.ttft_ms,
+        "LLM_FAKE_TTFT_SIGMA": args.ttft_sigma,
+        "LLM_FAKE_TOKENS_PER_SECOND": args.tokens_per_second,
+        "LLM_FAKE_OUTPUT_TOKENS": args.output_tokens,
+        "LLM_FAKE_ERROR_RATE": args.error_rate,
+        "LLM_REPLAY_SPEED": args.replay_speed,
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            os.environ[name] = str(value)
+    if args.hedge:
+        os.environ["LLM_HEDGE_ENABLED"] = "true"
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    백분위수 계산 (최근접 순위)
+
+    Args:
+        values: 값 목록
+        pct: 백분위 (0~100)
+
+    Returns:
+        백분위수 (값이 없으면 0)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    벤치마크 실행
+
+    Args:
+        args: 명령행 인자
+
+    Returns:
+        측정 결과
+    """
+    from loguru import logger
+    logger.remove()
+    logger.add(sys.stderr, level=os.environ["LOG_LEVEL"].upper())
+
+    from backend.utils.metrics import metrics
+    from backend.utils.anthropic_client import anthropic_client
+
+    save_dir = tempfile.mkdtemp(prefix="graph_benchmark_")
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    llm_calls: List[int] = []
+
+    if args.mode == "http":
+        import httpx
+        from backend.main import app
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None)
+
+        async def execute(request: str) -> Dict[str, Any]:
+            response = await client.post("/api/v1/process", json={"request": request})
+            if response.status_code != 200:
+                return {"status": f"http_{response.status_code}"}
+            return response.json()
+    else:
+        from backend.agents.agent_graph import AgentGraph
+        graph = AgentGraph()
+
+        async def execute(request: str) -> Dict[str, Any]:
+            return await graph.run(request, save_path=save_dir)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.monotonic()
+            result = await execute(args.request.format(i=index))
+            latencies.append(time.monotonic() - started)
+            status = result.get("status", "unknown")
+            statuses[status] = statuses.get(status, 0) + 1
+            if result.get("stats"):
+                llm_calls.append(result["stats"].get("llm_calls", 0))
+
+    started = time.monotonic()
+    try:
+        await asyncio.gather(*(one(i) for i in range(args.runs)))
+    finally:
+        if args.mode == "http":
+            await client.aclose()
+            await lifespan.__aexit__(None, None, None)
+    elapsed = time.monotonic() - started
+
+    counters = metrics.snapshot()["counters"]
+    return {
+        "backend": args.backend,
+        "mode": args.mode,
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_runs_per_second": round(args.runs / elapsed, 3) if elapsed else 0.0,
+        "latency_seconds": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "max": round(max(latencies, default=0.0), 3),
+            "mean": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        },
+        "statuses": statuses,
+        "llm_calls_per_run": round(statistics.fmean(llm_calls), 2) if llm_calls else None,
+        "llm_retries": sum(v for k, v in counters.items() if k.startswith("llm_retries")),
+        "llm_hedging": anthropic_client.hedging.stats(),
+    }
+
+def main() -> None:
+    """
+    벤치마크 진입점
+    """
+    args = parse_args()
+    configure_environment(args)
+    result = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    latency = result["latency_seconds"]
+    print(f"백엔드={result['backend']} 방식={result['mode']} 실행={result['runs']} 동시={result['concurrency']}")
+    print(f"소요 시간: {result['elapsed_seconds']}초, 처리량: {result['throughput_runs_per_second']}회/초")
+    print(f"지연 시간: p50={latency['p50']}초 p95={latency['p95']}초 max={latency['max']}초")
+    print(f"상태: {result['statuses']}, 실행당 LLM 호출: {result['llm_calls_per_run']}, 재시도: {result['llm_retries']}")
+    hedging = result["llm_hedging"]
+    if hedging["enabled"]:
+        print(f"헤징: {hedging['hedged']}/{hedging['calls']}회 (비율 {hedging['hedge_rate']:.3f}), 헤지 승리 {hedging['hedge_won']}회")
+
+if __name__ == "__main__":
+    main()
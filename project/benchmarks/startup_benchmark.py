@@ -0,0 +1,204 @@
+"""
+애플리케이션 기동 벤치마크 스크립트
+새 프로세스에서 모듈 import 시간, lifespan 시작 시간, 첫 /health 응답, 에이전트 그래프 준비 완료까지의 시간을 측정
+
+사용 예:
+    python benchmarks/startup_benchmark.py --runs 5
+    python benchmarks/startup_benchmark.py --warmup eager lazy --importtime 15
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 프로젝트 루트 디렉토리
+project_root = Path(__file__).parent.parent
+
+# 새 프로세스에서 실행할 측정 코드 (결과를 JSON 한 줄로 출력)
+PROBE = r"""
+import json
+import time
+import asyncio
+started = time.perf_counter()
+import backend.api.routes
+routes_imported = time.perf_counter()
+from backend.main import app
+from backend.api.routes import container
+imported = time.perf_counter()
+
+async def main():
+    import httpx
+    lifespan = app.router.lifespan_context(app)
+    begin = time.perf_counter()
+    await lifespan.__aenter__()
+    lifespan_done = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        response = await client.get("/api/v1/health")
+        response.raise_for_status()
+        health_done = time.perf_counter()
+        # lazy 모드는 첫 요청처럼 직접 생성, 그 외에는 준비가 끝나기를 기다림
+        if {warmup!r} == "lazy":
+            container.agent_graph
+            container.llm_client.resolve()
+        while not container.ready:
+            await asyncio.sleep(0.005)
+        ready_done = time.perf_counter()
+    await lifespan.__aexit__(None, None, None)
+    print(json.dumps({{
+        "import_routes": routes_imported - started,
+        "import_main": imported - started,
+        "lifespan_startup": lifespan_done - begin,
+        "first_health": health_done - begin,
+        "graph_ready": ready_done - begin,
+        "ready_from_import": ready_done - started,
+    }}))
+
+asyncio.run(main())
+"""
+
+# 요약에 표시할 측정 항목 순서
+PHASES = ["import_routes", "import_main", "lifespan_startup", "first_health", "graph_ready", "ready_from_import", "process"]
+
+def build_env(warmup: str, workdir: str) -> Dict[str, str]:
+    """
+    측정 프로세스 환경 변수 구성 (가짜 LLM 백엔드, 임시 작업 공간/DB)
+
+    Args:
+        warmup: STARTUP_WARMUP 방식
+        workdir: 임시 디렉토리
+
+    Returns:
+        환경 변수
+    """
+    env = dict(os.environ)
+    env.setdefault("ANTHROPIC_API_KEY", "benchmark")
+    env.setdefault("LLM_BACKEND", "fake")
+    env["STARTUP_WARMUP"] = warmup
+    env["CURSOR_WORKSPACE_PATH"] = os.path.join(workdir, "workspace")
+    env["CHECKPOINT_PATH"] = os.path.join(workdir, "checkpoints", "checkpoints.sqlite3")
+    env["JOB_DB_PATH"] = os.path.join(workdir, "checkpoints", "jobs.sqlite3")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(project_root), env.get("PYTHONPATH")]))
+    return env
+
+def run_once(warmup: str) -> Dict[str, float]:
+    """
+    새 프로세스에서 기동 과정을 한 번 측정
+
+    Args:
+        warmup: STARTUP_WARMUP 방식
+
+    Returns:
+        단계별 소요 시간 (초)
+    """
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as workdir:
+        env = build_env(warmup, workdir)
+        os.makedirs(env["CURSOR_WORKSPACE_PATH"], exist_ok=True)
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", PROBE.format(warmup=warmup)],
+            cwd=str(project_root),
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"측정 프로세스 실패 ({warmup}):\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process"] = elapsed
+    return result
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """
+    단계별 측정값 요약
+
+    Args:
+        samples: 실행별 측정값
+
+    Returns:
+        단계별 중앙값/최소/최대 (밀리초)
+    """
+    summary = {}
+    for phase in PHASES:
+        values = [sample[phase] * 1000 for sample in samples]
+        summary[phase] = {
+            "median_ms": round(statistics.median(values), 1),
+            "min_ms": round(min(values), 1),
+            "max_ms": round(max(values), 1)
+        }
+    return summary
+
+def import_profile(module: str, top: int) -> List[Dict[str, Any]]:
+    """
+    -X importtime으로 모듈 import 비용을 최상위 패키지별 누적 시간으로 집계
+
+    Args:
+        module: import할 모듈
+        top: 표시할 항목 수
+
+    Returns:
+        누적 시간이 큰 순서의 (패키지, 누적 시간) 목록
+    """
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as workdir:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(project_root),
+            env=build_env("lazy", workdir),
+            capture_output=True,
+            text=True
+        )
+    packages: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 패키지가 처음 import될 때의 누적 시간이 그 패키지의 비용 (하위 모듈은 그 안에 포함됨)
+        package = name.strip().split(".")[0]
+        if package != module.split(".")[0]:
+            packages[package] = max(packages.get(package, 0), int(cumulative))
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return [{"package": package, "cumulative_ms": round(micros / 1000, 1)} for package, micros in ranked[:top]]
+
+def main() -> None:
+    """
+    벤치마크 실행
+    """
+    parser = argparse.ArgumentParser(description="애플리케이션 기동 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="방식별 측정 횟수")
+    parser.add_argument(
+        "--warmup", nargs="+", default=["background", "eager", "lazy"],
+        choices=["background", "eager", "lazy"], help="측정할 STARTUP_WARMUP 방식"
+    )
+    parser.add_argument("--importtime", type=int, default=0, help="backend.main import 비용 상위 N개 패키지 표시")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {"runs": args.runs, "modes": {}}
+    for warmup in args.warmup:
+        samples = [run_once(warmup) for _ in range(args.runs)]
+        report["modes"][warmup] = summarize(samples)
+    if args.importtime:
+        report["importtime"] = import_profile("backend.main", args.importtime)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    for warmup, summary in report["modes"].items():
+        print(f"[STARTUP_WARMUP={warmup}] {args.runs}회")
+        for phase, stats in summary.items():
+            print(f"  {phase:<18} 중앙값 {stats['median_ms']:>8.1f}ms  (최소 {stats['min_ms']:.1f}, 최대 {stats['max_ms']:.1f})")
+    if args.importtime:
+        print("backend.main import 누적 시간 상위 패키지")
+        for entry in report["importtime"]:
+            print(f"  {entry['cumulative_ms']:>8.1f}ms  {entry['package']}")
+
+if __name__ == "__main__":
+    main()
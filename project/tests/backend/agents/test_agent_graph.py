@@ -0,0 +1,91 @@
+"""
+에이전트 그래프 테스트 (슈퍼바이저 라우팅별 실행 경로와 결과 메시지)
+"""
+import asyncio
+
+import pytest
+
+import backend.agents.agent_graph as agent_graph_module
+import backend.agents.code_generation_agent as code_generation_module
+import backend.agents.planning_agent as planning_module
+import backend.agents.supervisor_agent as supervisor_module
+from backend.agents.agent_graph import AgentGraph
+from backend.utils.anthropic_client import AnthropicClient
+from backend.utils.lazy import LazyObject
+from backend.utils.metrics import record_llm_call
+
+SUPERVISOR_ANSWER = "슈퍼바이저 답변"
+
+class RoutingClient:
+    """
+    정해진 라우팅 결정을 돌려주는 슈퍼바이저용 LLM 클라이언트
+    """
+
+    def __init__(self, route: str, delay: float = 0.0):
+        self.route = route
+        self.delay = delay
+
+    async def aget_tool_call(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        record_llm_call()
+        # 모델이 direct_answer가 아닌 라우팅에도 answer를 채우는 경우를 재현
+        return {"status": "success", "tool_input": {"route": self.route, "reason": "테스트", "answer": SUPERVISOR_ANSWER}}
+
+@pytest.fixture
+def run_graph(monkeypatch, tmp_path):
+    def run(route: str, user_request: str = "Vue 버튼 컴포넌트를 만들어주세요.", supervisor_delay: float = 0.0):
+        # Reason: 공유 클라이언트는 이벤트 루프를 넘나들면 안 되므로 실행마다 새 클라이언트 사용
+        client = LazyObject(AnthropicClient, "anthropic_client")
+        monkeypatch.setattr(planning_module, "anthropic_client", client)
+        monkeypatch.setattr(code_generation_module, "anthropic_client", client)
+        monkeypatch.setattr(supervisor_module, "anthropic_client", RoutingClient(route, supervisor_delay))
+
+        async def main():
+            graph = AgentGraph()
+            try:
+                return await graph.run(user_request, save_path=str(tmp_path))
+            finally:
+                if client.initialized:
+                    await client.aclose()
+
+        return asyncio.run(main())
+
+    return run
+
+def test_direct_answer_returns_supervisor_answer_without_sub_agents(run_graph):
+    result = run_graph("direct_answer", "LangGraph가 무엇인가요?")
+
+    assert result["status"] == "success"
+    assert result["message"] == SUPERVISOR_ANSWER
+    assert not result["state"].get("agent_results")
+
+@pytest.mark.parametrize("route, agents", [
+    ("code_only", ["code_generation"]),
+    ("plan_and_code", ["planning", "code_generation"]),
+])
+def test_code_routes_ignore_supervisor_answer(run_graph, route, agents):
+    result = run_graph(route)
+
+    assert result["status"] == "success"
+    assert result["message"] != SUPERVISOR_ANSWER
+    assert result["state"]["answer"] is None
+    assert sorted(result["state"]["agent_results"]) == sorted(agents)
+    assert result["state"]["generated_code"]
+
+@pytest.mark.parametrize("route, llm_calls", [("direct_answer", 1), ("code_only", 2), ("plan_and_code", 3)])
+def test_llm_calls_per_route(run_graph, route, llm_calls):
+    result = run_graph(route)
+
+    assert result["stats"]["llm_calls"] == llm_calls
+    assert result["stats"]["speculative_llm_calls"] == 0
+
+@pytest.mark.parametrize("route, llm_calls, wasted", [("direct_answer", 1, 1), ("code_only", 2, 1), ("plan_and_code", 3, 0)])
+def test_aborted_speculation_is_not_counted_as_llm_call(run_graph, monkeypatch, route, llm_calls, wasted):
+    monkeypatch.setattr(agent_graph_module, "SPECULATIVE_PLANNING", True)
+
+    # 추측 실행한 계획 수립이 끝난 뒤에 라우팅이 결정되도록 슈퍼바이저 응답 지연
+    result = run_graph(route, supervisor_delay=0.5)
+
+    assert result["status"] == "success"
+    assert result["stats"]["llm_calls"] == llm_calls
+    assert result["stats"]["speculative_llm_calls"] == wasted
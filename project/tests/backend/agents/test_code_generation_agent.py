@@ -0,0 +1,56 @@
+"""
+코드 생성 에이전트 테스트 (파일별 동시 생성 결과 병합)
+"""
+import asyncio
+
+import pytest
+
+from backend.agents.code_generation_agent import CodeGenerationAgent
+
+TARGET_FILES = [{"filename": "src/A.vue"}, {"filename": "src/B.vue"}, {"filename": "src/C.vue"}]
+
+def _agent(monkeypatch, generate_file) -> CodeGenerationAgent:
+    agent = CodeGenerationAgent()
+    monkeypatch.setattr(agent, "generate_file", generate_file)
+    return agent
+
+def _saved(filename):
+    file = {"filename": filename, "content": "<template />"}
+    return {
+        "status": "success",
+        "generated_code": {"status": "success", "generated_code": "<template />"},
+        "files": [file],
+        "save_results": [{"filename": filename, "status": "success"}]
+    }
+
+def test_cancelled_and_failed_branches_do_not_break_merge(monkeypatch):
+    async def generate_file(task, plan, save_path, target_file, all_files):
+        if target_file["filename"] == "src/B.vue":
+            raise asyncio.CancelledError()
+        if target_file["filename"] == "src/C.vue":
+            raise RuntimeError("API 오류")
+        return _saved(target_file["filename"])
+
+    agent = _agent(monkeypatch, generate_file)
+    result = asyncio.run(agent.generate_files("버튼 만들기", None, None, TARGET_FILES))
+
+    assert result["status"] == "partial_success"
+    assert result["failed_files"] == ["src/B.vue", "src/C.vue"]
+    # 취소된 분기는 기한 초과로 처리됨
+    assert result["timed_out"] is True
+    assert list(result["generated_code"]["files"]) == ["src/A.vue"]
+
+def test_cancelling_the_node_propagates(monkeypatch):
+    async def generate_file(task, plan, save_path, target_file, all_files):
+        await asyncio.sleep(10)
+
+    agent = _agent(monkeypatch, generate_file)
+
+    async def main():
+        task = asyncio.create_task(agent.generate_files("버튼 만들기", None, None, TARGET_FILES))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+워커 프로세스 풀 테스트 (워커 상태와 메트릭 중계)
+"""
+import asyncio
+
+import pytest
+
+from backend.agents.worker_pool import ProcessPoolAgentGraph, ProcessWorkerPool
+from backend.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, merge_breaker_snapshots
+from backend.utils.metrics import MetricsRegistry, metrics
+
+def _api_calls() -> float:
+    return metrics.snapshot()["counters"].get("llm_api_calls", 0)
+
+@pytest.fixture(scope="module")
+def pool_run():
+    """
+    워커 프로세스 하나에서 그래프를 한 번 실행한 뒤의 풀 (프로세스 기동이 느려 모듈 단위로 공유)
+    """
+    pool = ProcessWorkerPool(num_workers=1, concurrency=1)
+
+    async def main():
+        await pool.start()
+        try:
+            graph = ProcessPoolAgentGraph(pool)
+            before = _api_calls()
+            result = await graph.run("Vue 버튼 컴포넌트를 만들어주세요.")
+            return result, pool.breakers_snapshot(), _api_calls() - before, pool.llm_stats()
+        finally:
+            await pool.stop()
+
+    return asyncio.run(main())
+
+def test_breakers_are_reported_by_workers(pool_run):
+    result, breakers, _, _ = pool_run
+
+    assert result["status"] == "success"
+    assert breakers["mode"] == "process"
+    assert list(breakers["workers"]) == ["0"]
+    # 실행이 끝날 때 워커가 보고하므로 API 프로세스에서도 호출 기록이 보임
+    calls = sum(model["recent_calls"] for model in breakers["models"].values())
+    assert calls == result["stats"]["llm_calls"] > 0
+
+def test_worker_metrics_reach_api_process(pool_run):
+    result, _, api_calls, llm_stats = pool_run
+
+    # LLM 호출은 워커에서만 일어나지만 API 프로세스의 카운터에 합산됨
+    assert api_calls == result["stats"]["llm_calls"] > 0
+    assert set(llm_stats["0"]) >= {"rate_limit", "llm_cache", "llm_hedging"}
+
+def test_take_delta_returns_changes_since_last_call():
+    registry = MetricsRegistry()
+    registry.increment("calls", 2)
+    registry.observe("latency", 0.5)
+
+    first = registry.take_delta()
+    registry.increment("calls")
+    second = registry.take_delta()
+
+    assert first == {"counters": {"calls": 2}, "summaries": {"latency": {"count": 1, "sum": 0.5, "max": 0.5}}}
+    assert second == {"counters": {"calls": 1}, "summaries": {}}
+    assert registry.take_delta() == {"counters": {}, "summaries": {}}
+
+    merged = MetricsRegistry()
+    merged.merge(first)
+    merged.merge(second)
+    assert merged.snapshot()["counters"] == {"calls": 3}
+    assert merged.snapshot()["summaries"]["latency"]["count"] == 1
+
+def test_merge_breaker_snapshots_uses_worst_state():
+    def snapshot(state, calls, ratio, trips):
+        return {"enabled": True, "models": {"claude": {
+            "state": state, "recent_calls": calls, "failure_ratio": ratio, "trips": trips, "retry_after": 0.0
+        }}}
+
+    merged = merge_breaker_snapshots([snapshot(CLOSED, 10, 0.1, 0), snapshot(OPEN, 10, 0.5, 1), snapshot(HALF_OPEN, 0, 0.0, 2)])
+
+    assert merged["claude"]["state"] == OPEN
+    assert merged["claude"]["recent_calls"] == 20
+    assert merged["claude"]["failure_ratio"] == 0.3
+    assert merged["claude"]["trips"] == 3
+    assert merged["claude"]["open_processes"] == 2
@@ -0,0 +1,74 @@
+"""
+애플리케이션 구성 요소 컨테이너 테스트 (지연 생성, 시작 방식, 종료)
+"""
+import asyncio
+
+import pytest
+
+import backend.api.container as container_module
+import backend.utils.anthropic_client as anthropic_module
+from backend.api.container import AppContainer
+from backend.utils.anthropic_client import AnthropicClient
+from backend.utils.lazy import LazyObject
+
+async def _handler(job, publish):
+    return {"status": "success"}
+
+@pytest.fixture
+def llm_client(monkeypatch):
+    # Reason: 종료 시 공유 클라이언트를 닫으므로 테스트마다 새 싱글턴을 써서 다른 테스트에 영향을 주지 않음
+    client = LazyObject(AnthropicClient, "anthropic_client")
+    monkeypatch.setattr(anthropic_module, "anthropic_client", client)
+    return client
+
+def test_components_are_created_on_first_use(llm_client):
+    container = AppContainer(_handler)
+
+    assert not container.ready
+    graph = container.agent_graph
+
+    assert container.ready
+    assert container.agent_graph is graph
+    assert not llm_client.initialized
+
+@pytest.mark.parametrize("mode, ready", [("eager", True), ("lazy", False)])
+def test_startup_follows_warmup_mode(monkeypatch, llm_client, mode, ready):
+    monkeypatch.setattr(container_module, "STARTUP_WARMUP", mode)
+    container = AppContainer(_handler)
+
+    async def main():
+        await container.startup()
+        try:
+            return container.ready, llm_client.initialized
+        finally:
+            await container.shutdown()
+
+    assert asyncio.run(main()) == (ready, ready)
+
+def test_background_warmup_failure_keeps_app_running(monkeypatch, llm_client):
+    monkeypatch.setattr(container_module, "STARTUP_WARMUP", "background")
+    container = AppContainer(_handler)
+
+    async def broken_warmup():
+        raise RuntimeError("준비 실패")
+
+    monkeypatch.setattr(container, "warmup", broken_warmup)
+
+    async def main():
+        await container.startup()
+        try:
+            await container._warmup_task
+            return container.ready
+        finally:
+            await container.shutdown()
+
+    assert asyncio.run(main()) is False
+
+def test_shutdown_does_not_create_unused_components(llm_client):
+    container = AppContainer(_handler)
+
+    asyncio.run(container.shutdown())
+
+    assert container._job_queue is None
+    assert not container.ready
+    assert not llm_client.initialized
@@ -0,0 +1,82 @@
+"""
+작업 진행 이벤트 SSE 스트림 테스트 (이벤트 ID, Last-Event-ID 재연결, 작업 정리)
+"""
+import asyncio
+import contextlib
+import json
+
+import pytest
+
+import backend.api.routes as routes_module
+from backend.utils.job_queue import RUNNING, SUCCEEDED
+
+JOB_ID = "job-1"
+
+class FakeJobQueue:
+    """
+    정해진 작업 상태와 진행 이벤트를 돌려주는 작업 큐
+    """
+
+    def __init__(self, jobs, events):
+        self.jobs = list(jobs)
+        self.events = events
+
+    async def get(self, job_id):
+        return self.jobs.pop(0) if len(self.jobs) > 1 else self.jobs[0]
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, job_id):
+        queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        yield queue
+
+class FakeContainer:
+    def __init__(self, job_queue):
+        self.job_queue = job_queue
+
+def _events(count):
+    return [{"type": "node_end", "node": f"node{seq}", "seq": seq} for seq in range(1, count + 1)]
+
+@pytest.fixture
+def stream(monkeypatch):
+    def run(jobs, events, last_event_id=None):
+        monkeypatch.setattr(routes_module, "container", FakeContainer(FakeJobQueue(jobs, events)))
+
+        async def main():
+            response = await routes_module.stream_job_events(JOB_ID, last_event_id=last_event_id)
+            return [event async for event in response.body_iterator]
+
+        return asyncio.run(main())
+
+    return run
+
+def test_events_carry_ids_and_end_with_result(stream):
+    running = {"job_id": JOB_ID, "status": RUNNING}
+    finished = {"job_id": JOB_ID, "status": SUCCEEDED}
+
+    frames = stream([running, running, finished], _events(3) + [None])
+
+    assert [frame.get("id") for frame in frames] == ["1", "2", "3", None]
+    assert [frame["event"] for frame in frames] == ["node_end"] * 3 + ["result"]
+    assert json.loads(frames[-1]["data"])["status"] == SUCCEEDED
+
+def test_reconnect_skips_events_up_to_last_event_id(stream):
+    running = {"job_id": JOB_ID, "status": RUNNING}
+    finished = {"job_id": JOB_ID, "status": SUCCEEDED}
+
+    frames = stream([running, running, finished], _events(3) + [None], last_event_id="2")
+
+    assert [frame.get("id") for frame in frames] == ["3", None]
+
+def test_pruned_job_ends_stream_with_not_found_result(stream):
+    running = {"job_id": JOB_ID, "status": RUNNING}
+
+    frames = stream([running, running, None], _events(1) + [None])
+
+    assert frames[-1]["event"] == "result"
+    assert json.loads(frames[-1]["data"])["status"] == "not_found"
+
+@pytest.mark.parametrize("header, seq", [(None, 0), ("7", 7), ("abc", 0), ("-3", 0)])
+def test_parse_last_event_id(header, seq):
+    assert routes_module._parse_last_event_id(header) == seq
@@ -0,0 +1,95 @@
+"""
+에이전트 실행 승인 제어 테스트
+"""
+import asyncio
+
+import pytest
+
+from backend.utils.admission import AdmissionController, AdmissionRejected
+
+def test_waiters_are_admitted_in_fifo_order():
+    controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=5)
+    order = []
+
+    async def run(name: str):
+        async with controller.slot():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(run(name) for name in "abcd"))
+
+    asyncio.run(main())
+
+    assert order == list("abcd")
+    assert controller.in_flight == 0
+    assert controller.queue_depth == 0
+
+def test_full_queue_is_rejected_with_retry_after():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+
+    async def main():
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(AdmissionRejected) as rejected:
+                await controller.acquire()
+            with pytest.raises(AdmissionRejected):
+                controller.check()
+        finally:
+            controller.release()
+            await waiter
+            controller.release()
+        return rejected.value
+
+    rejected = asyncio.run(main())
+
+    assert rejected.reason == "queue_full"
+    assert int(rejected.retry_after_header) >= 1
+
+def test_unbounded_waiters_do_not_count_against_queue_limit():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+
+    async def main():
+        await controller.acquire()
+        workers = [asyncio.create_task(controller.acquire(timeout=None)) for _ in range(3)]
+        await asyncio.sleep(0)
+        # 기한 없는 대기자가 3개 있어도 일반 요청 하나는 대기열에 들어갈 수 있음
+        controller.check()
+        for _ in workers:
+            controller.release()
+        await asyncio.gather(*workers)
+        controller.release()
+        return controller.in_flight
+
+    assert asyncio.run(main()) == 0
+
+def test_queue_timeout_rejects_and_frees_the_queue():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.02)
+
+    async def main():
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        depth = controller.queue_depth
+        controller.release()
+        return rejected.value.reason, depth
+
+    assert asyncio.run(main()) == ("timeout", 0)
+
+def test_cancelled_waiter_leaves_the_queue():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+
+    async def main():
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        depth = controller.queue_depth
+        controller.release()
+        return depth, controller.in_flight
+
+    assert asyncio.run(main()) == (0, 0)
@@ -0,0 +1,82 @@
+"""
+Anthropic 클라이언트 테스트 (비동기 호출, 공유 연결 풀 설정)
+"""
+import asyncio
+
+import pytest
+
+import backend.utils.anthropic_client as anthropic_module
+from backend.utils.anthropic_client import AnthropicClient, _build_http_options
+from backend.config.settings import (
+    ANTHROPIC_HTTP2,
+    ANTHROPIC_MAX_CONNECTIONS,
+    ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+    ANTHROPIC_CONNECT_TIMEOUT,
+    ANTHROPIC_READ_TIMEOUT,
+)
+
+def test_http_options_follow_pool_settings():
+    options = _build_http_options()
+
+    assert options["http2"] == ANTHROPIC_HTTP2
+    assert options["limits"].max_connections == ANTHROPIC_MAX_CONNECTIONS
+    assert options["limits"].max_keepalive_connections == ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS
+    assert options["timeout"].connect == ANTHROPIC_CONNECT_TIMEOUT
+    assert options["timeout"].read == ANTHROPIC_READ_TIMEOUT
+
+def test_aget_completion_returns_text_and_usage():
+    async def main():
+        client = AnthropicClient()
+        try:
+            return await client.aget_completion("버튼 컴포넌트를 만들어줘", max_tokens=200)
+        finally:
+            await client.aclose()
+
+    result = asyncio.run(main())
+
+    assert result["status"] == "success"
+    assert result["content"]
+    usage = result["usage"]
+    assert usage["total_tokens"] == usage["input_tokens"] + usage["output_tokens"]
+
+def test_concurrent_calls_share_one_async_client():
+    async def main():
+        client = AnthropicClient()
+        pool = client.async_client
+        try:
+            results = await asyncio.gather(*(
+                client.aget_completion(f"요청 {i}", max_tokens=100) for i in range(5)
+            ))
+        finally:
+            await client.aclose()
+        return client, pool, results
+
+    client, pool, results = asyncio.run(main())
+
+    assert client.async_client is pool
+    assert [r["status"] for r in results] == ["success"] * 5
+
+def test_streaming_deltas_add_up_to_content():
+    deltas = []
+
+    async def on_delta(text: str) -> None:
+        deltas.append(text)
+
+    async def main():
+        client = AnthropicClient()
+        try:
+            return await client.aget_completion("스트리밍 요청", max_tokens=200, on_delta=on_delta)
+        finally:
+            await client.aclose()
+
+    result = asyncio.run(main())
+
+    assert len(deltas) > 1
+    assert "".join(deltas) == result["content"]
+
+def test_missing_api_key_is_rejected_for_real_backend(monkeypatch):
+    monkeypatch.setattr(anthropic_module, "ANTHROPIC_API_KEY", None)
+    monkeypatch.setattr(anthropic_module, "LLM_BACKEND", "anthropic")
+
+    with pytest.raises(ValueError):
+        AnthropicClient()
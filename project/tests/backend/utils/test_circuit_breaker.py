@@ -0,0 +1,90 @@
+"""
+LLM 모델별 서킷 브레이커 테스트
+"""
+import httpx
+import pytest
+from anthropic import APIStatusError
+
+from backend.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpen,
+    is_breaker_failure,
+)
+
+def _breaker(**overrides) -> CircuitBreaker:
+    options = {"enabled": True, "window": 4, "min_calls": 4, "failure_ratio": 0.5, "slow_seconds": 1.0, "open_seconds": 30}
+    options.update(overrides)
+    return CircuitBreaker("claude-test", **options)
+
+def _status_error(status_code: int) -> APIStatusError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return APIStatusError("오류", response=httpx.Response(status_code, request=request), body=None)
+
+def test_failures_and_slow_responses_open_the_circuit():
+    breaker = _breaker()
+    breaker.record(True, latency=0.1)
+    breaker.record(True, latency=5.0)
+    breaker.record(True)
+    assert breaker.state == CLOSED
+
+    breaker.record(False)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen) as rejected:
+        breaker.before_call()
+    assert 0 < rejected.value.retry_after <= 30
+
+def test_half_open_allows_one_probe_and_closes_on_success():
+    breaker = _breaker(open_seconds=0)
+    for _ in range(4):
+        breaker.record(False)
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    breaker.record(True, latency=0.1)
+
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["recent_calls"] == 0
+
+def test_released_probe_lets_another_probe_through():
+    breaker = _breaker(open_seconds=0)
+    for _ in range(4):
+        breaker.record(False)
+    breaker.before_call()
+
+    breaker.release()
+    breaker.before_call()
+    breaker.record(False)
+
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["trips"] == 2
+
+def test_disabled_breaker_only_counts_outcomes():
+    breaker = _breaker(enabled=False)
+    for _ in range(4):
+        breaker.record(False)
+
+    breaker.before_call()
+
+    assert breaker.snapshot()["failure_ratio"] == 1.0
+    assert breaker.state == CLOSED
+
+def test_only_model_health_errors_count_as_failures():
+    assert is_breaker_failure(_status_error(529))
+    assert is_breaker_failure(httpx.ReadTimeout("시간 초과"))
+    assert not is_breaker_failure(_status_error(429))
+    assert not is_breaker_failure(_status_error(400))
+
+def test_registry_creates_one_breaker_per_model():
+    registry = CircuitBreakerRegistry(True, 4, 4, 0.5, 1.0, 30)
+
+    assert registry.get("a") is registry.get("a")
+    assert registry.get("a") is not registry.get("b")
+    assert set(registry.snapshot()["models"]) == {"a", "b"}
@@ -0,0 +1,60 @@
+"""
+스트리밍 코드 블록 추출기 테스트
+"""
+import json
+
+from backend.utils.code_stream_parser import StreamingCodeExtractor, strip_code_fence
+
+def _feed_in_chunks(text: str, size: int = 7):
+    extractor = StreamingCodeExtractor()
+    files = []
+    for start in range(0, len(text), size):
+        files.extend(extractor.feed(text[start:start + size]))
+    files.extend(extractor.close())
+    return extractor, files
+
+def test_fenced_block_uses_filename_hint():
+    text = "파일명: `Button.vue`\n```vue\n<template>\n  <button>OK</button>\n</template>\n```\n"
+
+    _, files = _feed_in_chunks(text)
+
+    assert len(files) == 1
+    assert files[0]["filename"] == "Button.vue"
+    assert files[0]["language"] == "vue"
+    assert files[0]["code"] == "<template>\n  <button>OK</button>\n</template>"
+
+def test_json_envelope_is_emitted_as_soon_as_it_closes():
+    envelope = json.dumps({"filename": "app.py", "language": "python", "code": "```python\nprint('hi')\n```"})
+    extractor = StreamingCodeExtractor()
+
+    completed = extractor.feed("설명입니다 " + envelope)
+
+    assert completed == [{"filename": "app.py", "language": "python", "code": "print('hi')", "description": ""}]
+
+def test_files_list_envelope_yields_every_file():
+    envelope = json.dumps({"files": [
+        {"filename": "a.js", "language": "javascript", "code": "let a = 1;"},
+        {"filename": "b.js", "language": "javascript", "code": "let b = '{';"},
+    ]})
+
+    _, files = _feed_in_chunks(envelope, size=3)
+
+    assert [f["filename"] for f in files] == ["a.js", "b.js"]
+    assert files[1]["code"] == "let b = '{';"
+
+def test_unclosed_fence_is_returned_on_close():
+    _, files = _feed_in_chunks("```css\nbody { color: red; }\n")
+
+    assert len(files) == 1
+    assert files[0]["language"] == "css"
+    assert files[0]["code"] == "body { color: red; }"
+
+def test_truncated_json_and_plain_text_yield_nothing():
+    _, files = _feed_in_chunks('설명만 있는 응답\n{"filename": "x.py", "code": "print(')
+
+    assert files == []
+
+def test_strip_code_fence_handles_bare_and_fenced_code():
+    assert strip_code_fence("```js\nlet x;\n```") == "let x;"
+    assert strip_code_fence("  let y;  ") == "let y;"
+    assert strip_code_fence("```") == ""
@@ -0,0 +1,50 @@
+"""
+요청 처리 기한 전파 테스트
+"""
+import time
+import asyncio
+
+from backend.utils.deadline import (
+    current_deadline,
+    deadline_after,
+    deadline_scope,
+    remaining_seconds,
+    time_budget,
+)
+
+def test_deadline_after_ignores_empty_budget():
+    assert deadline_after(0) is None
+    assert deadline_after(None) is None
+    assert deadline_after(-5) is None
+    assert abs(deadline_after(10) - (time.time() + 10)) < 0.1
+
+def test_scope_reaches_tasks_created_inside_it():
+    async def child():
+        return remaining_seconds()
+
+    async def main():
+        with deadline_scope(time.time() + 30):
+            task = asyncio.create_task(child())
+        outside = remaining_seconds()
+        return await task, outside
+
+    inside, outside = asyncio.run(main())
+
+    assert 29 < inside <= 30
+    assert outside is None
+    assert current_deadline.get() is None
+
+def test_context_deadline_takes_priority_over_state():
+    state = {"deadline_at": time.time() + 100}
+
+    assert 99 < remaining_seconds(state) <= 100
+    with deadline_scope(time.time() + 5):
+        assert remaining_seconds(state) <= 5
+
+def test_time_budget_keeps_reserve_and_never_goes_negative():
+    with deadline_scope(time.time() + 10):
+        assert 7.9 < time_budget(reserve=2) <= 8
+    with deadline_scope(time.time() - 1):
+        assert remaining_seconds() < 0
+        assert time_budget() == 0.0
+    assert time_budget() is None
@@ -0,0 +1,87 @@
+"""
+LLM 요청 헤징 테스트
+"""
+import asyncio
+
+import pytest
+
+from backend.utils.hedging import HEDGE_BUDGET_BURST, HedgePolicy, LatencyTracker
+
+KEY = ("claude-test", "code_generation", "stream")
+
+def _policy(**overrides) -> HedgePolicy:
+    options = {"enabled": True, "percentile": 95, "min_samples": 3, "window": 10, "max_ratio": 1.0, "min_delay": 0.01}
+    options.update(overrides)
+    policy = HedgePolicy(**options)
+    for _ in range(options["min_samples"]):
+        policy.tracker.add(KEY, 0.02)
+    return policy
+
+def test_percentile_needs_minimum_samples():
+    tracker = LatencyTracker(window=5)
+    for seconds in (0.1, 0.2, 0.3, 0.4, 0.5, 0.6):
+        tracker.add("key", seconds)
+
+    # 창 크기가 5이므로 첫 표본(0.1)은 밀려남
+    assert tracker.percentile("key", 60) == 0.4
+    assert tracker.percentile("key", 100) == 0.6
+    assert tracker.percentile("key", 0) == 0.2
+    assert tracker.percentile("key", 60, min_samples=6) is None
+    assert tracker.percentile("other", 50) is None
+
+def test_slow_primary_is_hedged_and_hedge_wins():
+    policy = _policy()
+    deltas = []
+
+    async def call(on_delta, hedged):
+        await asyncio.sleep(0.01 if hedged else 1.0)
+        await on_delta("hedge" if hedged else "primary")
+        return "hedge" if hedged else "primary"
+
+    async def on_delta(text):
+        deltas.append(text)
+
+    result = asyncio.run(policy.run(KEY, call, on_delta))
+    stats = policy.stats()
+
+    assert result == "hedge"
+    assert deltas == ["hedge"]
+    assert (stats["hedged"], stats["hedge_won"]) == (1, 1)
+
+def test_fast_primary_is_not_hedged():
+    policy = _policy()
+    calls = []
+
+    async def call(on_delta, hedged):
+        calls.append(hedged)
+        return "primary"
+
+    assert asyncio.run(policy.run(KEY, call)) == "primary"
+    assert calls == [False]
+
+def test_disabled_or_unsampled_policy_never_hedges():
+    assert _policy(enabled=False).hedge_delay(KEY) is None
+    assert HedgePolicy(True, 95, 3, 10, 1.0, 0.01).hedge_delay(KEY) is None
+
+def test_hedge_budget_limits_extra_requests():
+    policy = _policy(max_ratio=0.1)
+
+    async def call(on_delta, hedged):
+        await asyncio.sleep(0.1)
+        return hedged
+
+    # 호출 한 번에 0.1 크레딧만 쌓이므로 헤지를 보내지 못하고 원래 호출을 기다림
+    assert asyncio.run(policy.run(KEY, call)) is False
+    stats = policy.stats()
+    assert (stats["hedged"], stats["budget_exhausted"]) == (0, 1)
+    assert stats["budget_credits"] <= HEDGE_BUDGET_BURST
+
+def test_primary_error_is_raised_when_both_attempts_fail():
+    policy = _policy()
+
+    async def call(on_delta, hedged):
+        await asyncio.sleep(0.03)
+        raise RuntimeError("hedge" if hedged else "primary")
+
+    with pytest.raises(RuntimeError, match="primary"):
+        asyncio.run(policy.run(KEY, call))
@@ -0,0 +1,116 @@
+"""
+비동기 작업 큐 테스트 (SQLite 저장소, 워커 풀, 진행 이벤트)
+"""
+import asyncio
+
+from backend.utils.job_queue import FAILED, JobQueue, JobStore, QUEUED, RUNNING, SUCCEEDED
+
+def _store(tmp_path) -> JobStore:
+    return JobStore(str(tmp_path / "jobs" / "jobs.sqlite3"))
+
+async def _wait_finished(queue: JobQueue, job_id: str) -> dict:
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] in (SUCCEEDED, FAILED):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"작업이 끝나지 않음: {job_id}")
+
+def test_claim_takes_oldest_queued_job_once(tmp_path):
+    store = _store(tmp_path)
+    try:
+        first = store.create("process", {"n": 1})
+        store.create("process", {"n": 2})
+
+        job = store.claim("owner-a")
+
+        assert job["job_id"] == first
+        assert job["status"] == RUNNING
+        assert store.get(first)["attempts"] == 1
+        assert store.claim("owner-b")["payload"] == {"n": 2}
+        assert store.claim("owner-b") is None
+    finally:
+        store.close()
+
+def test_orphaned_jobs_are_requeued_until_max_attempts(tmp_path):
+    store = _store(tmp_path)
+    try:
+        job_id = store.create("process", {})
+        store.claim("dead-owner")
+
+        assert store.requeue_orphans(lease_seconds=60, max_attempts=2) == (1, 0)
+        assert store.get(job_id)["status"] == QUEUED
+
+        store.claim("dead-owner")
+
+        assert store.requeue_orphans(lease_seconds=60, max_attempts=2) == (0, 1)
+        assert store.get(job_id)["status"] == FAILED
+    finally:
+        store.close()
+
+def test_jobs_of_live_owner_are_not_requeued(tmp_path):
+    store = _store(tmp_path)
+    try:
+        job_id = store.create("process", {})
+        store.heartbeat("live-owner")
+        store.claim("live-owner")
+
+        assert store.requeue_orphans(lease_seconds=60, max_attempts=3) == (0, 0)
+        assert store.get(job_id)["status"] == RUNNING
+    finally:
+        store.close()
+
+def test_queue_runs_handler_and_streams_progress(tmp_path):
+    store = _store(tmp_path)
+
+    async def handler(job, publish):
+        publish({"type": "progress", "step": job["payload"]["step"]})
+        await asyncio.sleep(0.01)
+        return {"status": "success", "value": 42}
+
+    async def main():
+        queue = JobQueue(store, handler, num_workers=2, poll_interval=0.05)
+        await queue.start()
+        try:
+            job_id = await queue.submit("process", {"step": "plan"})
+            async with queue.subscribe(job_id) as events:
+                received = []
+                while (event := await asyncio.wait_for(events.get(), timeout=5)) is not None:
+                    received.append(event)
+            return received, await _wait_finished(queue, job_id)
+        finally:
+            await queue.stop()
+
+    try:
+        received, job = asyncio.run(main())
+    finally:
+        store.close()
+
+    # 진행 이벤트마다 작업 내 일련번호(SSE 이벤트 ID)가 붙음
+    assert [event.pop("seq") for event in received] == list(range(1, len(received) + 1))
+    assert {"type": "progress", "step": "plan"} in received
+    assert received[-1] == {"type": "status", "status": SUCCEEDED, "error": None}
+    assert job["result"] == {"status": "success", "value": 42}
+
+def test_handler_exception_marks_job_failed(tmp_path):
+    store = _store(tmp_path)
+
+    async def handler(job, publish):
+        raise RuntimeError("처리 실패")
+
+    async def main():
+        queue = JobQueue(store, handler, num_workers=1, poll_interval=0.05)
+        await queue.start()
+        try:
+            job_id = await queue.submit("process", {})
+            return await _wait_finished(queue, job_id)
+        finally:
+            await queue.stop()
+
+    try:
+        job = asyncio.run(main())
+    finally:
+        store.close()
+
+    assert job["status"] == FAILED
+    assert job["error"] == "처리 실패"
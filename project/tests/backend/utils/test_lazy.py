@@ -0,0 +1,63 @@
+"""
+지연 생성 객체 테스트
+"""
+import threading
+
+import pytest
+
+from backend.utils.lazy import LazyObject
+
+class Counter:
+    created = 0
+
+    def __init__(self):
+        Counter.created += 1
+        self.value = 0
+
+def test_object_is_created_on_first_attribute_access():
+    Counter.created = 0
+    lazy = LazyObject(Counter, "counter")
+
+    assert not lazy.initialized
+    assert "미생성" in repr(lazy)
+
+    lazy.value = 3
+
+    assert lazy.initialized
+    assert lazy.value == 3
+    assert lazy.resolve().value == 3
+
+def test_concurrent_resolve_creates_one_instance():
+    Counter.created = 0
+    lazy = LazyObject(Counter, "counter")
+    barrier = threading.Barrier(8)
+    instances = []
+
+    def worker():
+        barrier.wait()
+        instances.append(lazy.resolve())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert Counter.created == 1
+    assert all(instance is instances[0] for instance in instances)
+
+def test_factory_error_is_retried_on_next_access():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError("환경 변수 누락")
+        return Counter()
+
+    lazy = LazyObject(factory, "flaky")
+
+    with pytest.raises(ValueError):
+        lazy.value
+    assert not lazy.initialized
+    assert lazy.value == 0
@@ -0,0 +1,75 @@
+"""
+LLM 응답 캐시 테스트 (메모리 LRU + SQLite 2단계)
+"""
+import asyncio
+import sqlite3
+
+from backend.utils.llm_cache import LLMCache, make_cache_key
+
+REQUEST = {"model": "claude-test", "messages": [{"role": "user", "content": "안녕"}], "max_tokens": 100}
+
+def _cache(tmp_path, **overrides) -> LLMCache:
+    options = {"ttl_seconds": 60, "max_memory_items": 10, "max_disk_items": 100}
+    options.update(overrides)
+    return LLMCache(str(tmp_path / "cache" / "llm.sqlite3"), **options)
+
+def test_cache_key_ignores_fields_that_do_not_change_output():
+    with_extra = {**REQUEST, "timeout": 3.0, "stream": True}
+
+    assert make_cache_key(REQUEST) == make_cache_key(with_extra)
+    assert make_cache_key(REQUEST) != make_cache_key({**REQUEST, "max_tokens": 200})
+
+def test_set_then_get_hits_memory(tmp_path):
+    cache = _cache(tmp_path)
+    key = make_cache_key(REQUEST)
+    try:
+        cache.set(key, {"content": "응답"})
+        assert cache.get(key) == {"content": "응답"}
+        assert cache.get_stats()["memory_hits"] == 1
+    finally:
+        cache.close()
+
+def test_disk_layer_is_shared_between_instances(tmp_path):
+    writer = _cache(tmp_path)
+    reader = _cache(tmp_path)
+    try:
+        writer.set("key", {"content": "공유"})
+        assert asyncio.run(reader.aget("key")) == {"content": "공유"}
+        assert reader.get_stats()["disk_hits"] == 1
+    finally:
+        writer.close()
+        reader.close()
+
+def test_memory_lru_keeps_most_recent_items(tmp_path):
+    cache = _cache(tmp_path, max_memory_items=2)
+    try:
+        for key in ("a", "b", "c"):
+            cache.set(key, {"content": key})
+        assert cache.get_stats()["memory_items"] == 2
+        # 메모리에서 밀려난 항목도 디스크에서 찾음
+        assert cache.get("a") == {"content": "a"}
+        assert cache.get_stats()["disk_hits"] == 1
+    finally:
+        cache.close()
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = _cache(tmp_path, ttl_seconds=-1)
+    try:
+        cache.set("key", {"content": "만료"})
+        assert cache.get("key") is None
+        assert cache.get_stats()["misses"] == 1
+    finally:
+        cache.close()
+
+def test_disk_error_degrades_to_miss(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+
+    def broken(key):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "_disk_get", broken)
+    try:
+        assert cache.get("unknown") is None
+        assert cache.get_stats()["hit_rate"] == 0.0
+    finally:
+        cache.close()
@@ -0,0 +1,51 @@
+"""
+LLM 호출 기한 맞춤 테스트
+"""
+import time
+
+import pytest
+
+from backend.config.settings import (
+    DEADLINE_FAST_MODEL,
+    DEADLINE_MIN_OUTPUT_TOKENS,
+    DEADLINE_OUTPUT_TOKENS_PER_SECOND,
+    LLM_MODELS,
+)
+from backend.utils.deadline import DeadlineExceeded, deadline_scope
+from backend.utils.llm_deadline import fit_to_deadline, past_deadline, with_timeout
+
+REQUEST = {"model": LLM_MODELS["opus"], "max_tokens": 4000, "messages": []}
+
+def test_request_is_unchanged_without_deadline():
+    assert fit_to_deadline(REQUEST) is REQUEST
+    assert with_timeout(REQUEST) is REQUEST
+    assert not past_deadline(100)
+
+def test_short_deadline_switches_model_and_shrinks_output():
+    with deadline_scope(time.time() + 10):
+        fitted = fit_to_deadline(REQUEST, agent="code_generation")
+        timed = with_timeout(fitted)
+
+    assert fitted["model"] == LLM_MODELS.get(DEADLINE_FAST_MODEL, DEADLINE_FAST_MODEL)
+    expected = max(DEADLINE_MIN_OUTPUT_TOKENS, int(10 * DEADLINE_OUTPUT_TOKENS_PER_SECOND))
+    assert expected - DEADLINE_OUTPUT_TOKENS_PER_SECOND < fitted["max_tokens"] <= expected
+    assert 9 < timed["timeout"] <= 10
+    assert REQUEST["max_tokens"] == 4000
+
+def test_long_deadline_keeps_model_and_max_tokens():
+    with deadline_scope(time.time() + 600):
+        fitted = fit_to_deadline(REQUEST)
+
+    assert fitted == REQUEST
+
+def test_retry_past_deadline_is_skipped():
+    with deadline_scope(time.time() + 1):
+        assert past_deadline(5)
+        assert not past_deadline(0.1)
+
+def test_expired_deadline_raises():
+    with deadline_scope(time.time() - 1):
+        with pytest.raises(DeadlineExceeded):
+            fit_to_deadline(REQUEST)
+        with pytest.raises(DeadlineExceeded):
+            with_timeout(REQUEST)
@@ -0,0 +1,56 @@
+"""
+LLM 모델 대체 호출 테스트
+"""
+import asyncio
+
+import pytest
+
+import backend.utils.llm_fallback as fallback_module
+from backend.config.settings import LLM_MODELS
+from backend.utils.circuit_breaker import CircuitOpen
+from backend.utils.llm_fallback import acreate_with_fallback, create_with_fallback, fallback_chain
+
+@pytest.fixture
+def opus_falls_back_to_sonnet(monkeypatch):
+    monkeypatch.setattr(fallback_module, "LLM_FALLBACK_MODELS", {"opus": ["sonnet", "opus"]})
+    return [LLM_MODELS["opus"], LLM_MODELS["sonnet"]]
+
+def test_chain_resolves_aliases_without_duplicates(opus_falls_back_to_sonnet):
+    assert fallback_chain(LLM_MODELS["opus"]) == opus_falls_back_to_sonnet
+    assert fallback_chain("unknown-model") == ["unknown-model"]
+
+def test_open_circuit_falls_back_to_next_model(opus_falls_back_to_sonnet):
+    called = []
+
+    def create(request, agent):
+        called.append(request["model"])
+        if request["model"] == LLM_MODELS["opus"]:
+            raise CircuitOpen(request["model"], 10)
+        return request["model"]
+
+    result = create_with_fallback(create, {"model": LLM_MODELS["opus"]})
+
+    assert result == LLM_MODELS["sonnet"]
+    assert called == opus_falls_back_to_sonnet
+
+def test_request_errors_do_not_fall_back(opus_falls_back_to_sonnet):
+    def create(request, agent):
+        raise ValueError("잘못된 요청")
+
+    with pytest.raises(ValueError):
+        create_with_fallback(create, {"model": LLM_MODELS["opus"]})
+
+def test_stream_does_not_fall_back_after_emitting_deltas(opus_falls_back_to_sonnet):
+    called = []
+
+    async def create(request, on_delta, agent):
+        called.append(request["model"])
+        await on_delta("부분 응답")
+        raise CircuitOpen(request["model"], 10)
+
+    async def on_delta(text):
+        pass
+
+    with pytest.raises(CircuitOpen):
+        asyncio.run(acreate_with_fallback(create, {"model": LLM_MODELS["opus"]}, on_delta))
+    assert called == [LLM_MODELS["opus"]]
@@ -0,0 +1,76 @@
+"""
+요청 단위 로그 캡처 테스트
+"""
+import asyncio
+
+from loguru import logger
+
+from backend.utils.log_capture import LogCapture
+
+def test_records_are_split_by_request_id():
+    capture = LogCapture()
+
+    async def run(request_id: str):
+        with capture.capture(request_id) as buffer:
+            logger.info(f"{request_id} 시작")
+            await asyncio.sleep(0)
+            logger.info(f"{request_id} 종료")
+            return [entry["message"] for entry in buffer]
+
+    async def main():
+        return await asyncio.gather(run("a"), run("b"))
+
+    first, second = asyncio.run(main())
+
+    assert first == ["a 시작", "a 종료"]
+    assert second == ["b 시작", "b 종료"]
+
+def test_listener_receives_records_from_worker_threads():
+    capture = LogCapture()
+    received = []
+
+    async def main():
+        with capture.capture("thread", listener=received.append):
+            logger.info("루프 스레드")
+            await asyncio.to_thread(logger.info, "작업 스레드")
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+
+    assert [entry["message"] for entry in received] == ["루프 스레드", "작업 스레드"]
+
+def test_buffer_keeps_only_latest_records():
+    capture = LogCapture(max_records=3)
+
+    async def main():
+        with capture.capture("ring") as buffer:
+            for i in range(5):
+                logger.info(f"로그 {i}")
+            return [entry["message"] for entry in buffer]
+
+    assert asyncio.run(main()) == ["로그 2", "로그 3", "로그 4"]
+
+def test_records_outside_capture_are_dropped():
+    capture = LogCapture()
+
+    async def main():
+        with capture.capture("done") as buffer:
+            pass
+        logger.info("캡처 종료 후 로그")
+        return buffer
+
+    assert list(asyncio.run(main())) == []
+    assert capture._buffers == {}
+
+def test_failing_listener_does_not_break_logging():
+    capture = LogCapture()
+
+    def broken(entry):
+        raise RuntimeError("리스너 오류")
+
+    async def main():
+        with capture.capture("broken", listener=broken) as buffer:
+            logger.info("계속 기록됨")
+            return len(buffer)
+
+    assert asyncio.run(main()) == 1
@@ -0,0 +1,84 @@
+"""
+LLM 호출 속도 제한 테스트 (토큰 버킷, 헤더 보정, 재시도 판별)
+"""
+import time
+import asyncio
+
+import httpx
+from anthropic import APIStatusError
+
+from backend.utils.rate_limiter import (
+    AdaptiveRateLimiter,
+    TokenBucket,
+    backoff_delay,
+    is_retryable,
+    retry_after_seconds,
+)
+
+def _status_error(status_code: int) -> APIStatusError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return APIStatusError("오류", response=httpx.Response(status_code, request=request), body=None)
+
+def test_retryable_errors_are_classified_by_status():
+    assert is_retryable(_status_error(429))
+    assert is_retryable(_status_error(529))
+    assert is_retryable(httpx.ConnectError("연결 실패"))
+    assert not is_retryable(_status_error(400))
+    assert not is_retryable(ValueError("잘못된 값"))
+
+def test_retry_after_prefers_milliseconds_header():
+    assert retry_after_seconds({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+    assert retry_after_seconds({"retry-after": "2"}) == 2.0
+    assert retry_after_seconds({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}) is None
+    assert retry_after_seconds(None) is None
+
+def test_backoff_delay_stays_within_cap():
+    delays = [backoff_delay(attempt, base=0.5, cap=2.0) for attempt in range(10)]
+
+    assert all(0 <= delay <= 2.0 for delay in delays)
+
+def test_bucket_wait_time_reflects_refill_rate():
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+
+    # 초당 1개씩 충전되므로 3개를 꺼내려면 약 3초 대기
+    assert 2.9 < bucket.wait_time(3) <= 3.0
+    # 용량보다 큰 요청은 가득 찰 때까지만 기다림
+    assert bucket.wait_time(1000) <= 60.0
+
+def test_acquire_waits_for_request_budget():
+    limiter = AdaptiveRateLimiter(requests_per_minute=600, tokens_per_minute=100000)
+    limiter.requests.take(600)
+
+    async def main():
+        started = time.monotonic()
+        await limiter.acquire(10)
+        return time.monotonic() - started
+
+    # 분당 600건 = 0.1초마다 1건
+    assert 0.05 < asyncio.run(main()) < 1.0
+
+def test_headers_and_penalty_adjust_the_limiter():
+    limiter = AdaptiveRateLimiter(requests_per_minute=100, tokens_per_minute=10000)
+    limiter.scale(0.5)
+
+    limiter.update_from_headers({
+        "anthropic-ratelimit-tokens-remaining": "2000",
+        "anthropic-ratelimit-tokens-limit": "8000",
+        "anthropic-ratelimit-requests-remaining": "invalid",
+    })
+    limiter.penalize(5)
+    snapshot = limiter.snapshot()
+
+    assert snapshot["tokens"]["limit"] == 4000
+    assert snapshot["tokens"]["remaining"] <= 1001
+    assert snapshot["requests"]["limit"] == 50
+    assert 4 < snapshot["blocked_for"] <= 5
+
+def test_settle_refunds_unused_reservation():
+    limiter = AdaptiveRateLimiter(requests_per_minute=100, tokens_per_minute=6000)
+    limiter.tokens.take(1000)
+
+    limiter.settle(reserved=1000, used=200)
+
+    assert limiter.tokens.level >= 5200
@@ -0,0 +1,116 @@
+"""
+동일 요청 합치기(singleflight) 테스트
+"""
+import asyncio
+import contextvars
+
+import pytest
+
+from backend.utils.singleflight import SingleFlight
+
+request_id: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn(on_delta):
+        calls.append(request_id.get())
+        await asyncio.sleep(0.02)
+        return "결과"
+
+    async def caller(name: str):
+        request_id.set(name)
+        return await flight.do("key", fn)
+
+    async def main():
+        return await asyncio.gather(caller("a"), caller("b"), caller("c"))
+
+    results = asyncio.run(main())
+
+    assert [result for result, _ in results] == ["결과"] * 3
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    # 공유 실행은 빈 컨텍스트에서 돌므로 첫 호출자의 컨텍스트 변수가 보이지 않음
+    assert calls == [None]
+    assert not flight.in_flight("key")
+
+def test_late_joiner_replays_earlier_deltas():
+    flight = SingleFlight()
+    first_deltas, second_deltas = [], []
+
+    async def fn(on_delta):
+        for text in ("가", "나", "다"):
+            await on_delta(text)
+            await asyncio.sleep(0.01)
+        return "가나다"
+
+    def collect(target):
+        async def on_delta(text):
+            target.append(text)
+        return on_delta
+
+    async def main():
+        first = asyncio.create_task(flight.do("key", fn, on_delta=collect(first_deltas)))
+        await asyncio.sleep(0.015)
+        second = await flight.do("key", fn, on_delta=collect(second_deltas))
+        return await first, second
+
+    first, second = asyncio.run(main())
+
+    assert first == ("가나다", False)
+    assert second == ("가나다", True)
+    assert first_deltas == second_deltas == ["가", "나", "다"]
+
+def test_waiter_timeout_does_not_cancel_shared_execution():
+    flight = SingleFlight()
+
+    async def fn(on_delta):
+        await asyncio.sleep(0.05)
+        return "완료"
+
+    async def main():
+        patient = asyncio.create_task(flight.do("key", fn))
+        await asyncio.sleep(0)
+        with pytest.raises(TimeoutError):
+            await flight.do("key", fn, timeout=0.01)
+        return await patient
+
+    assert asyncio.run(main()) == ("완료", False)
+
+def test_last_waiter_leaving_cancels_execution():
+    flight = SingleFlight()
+
+    async def main():
+        state = {"cancelled": False}
+
+        async def fn(on_delta):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        waiter = asyncio.create_task(flight.do("key", fn))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+        return state["cancelled"]
+
+    assert asyncio.run(main())
+    assert not flight.in_flight("key")
+
+def test_execution_error_reaches_every_waiter():
+    flight = SingleFlight()
+
+    async def fn(on_delta):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("호출 실패")
+
+    async def main():
+        return await asyncio.gather(flight.do("key", fn), flight.do("key", fn), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
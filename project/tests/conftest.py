@@ -0,0 +1,30 @@
+"""
+pytest 공통 설정
+설정 모듈이 import되기 전에 환경 변수를 지정하여 테스트가 실제 API, 작업 공간, 체크포인트 DB를 건드리지 않도록 함
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# backend 패키지를 import할 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Reason: 설정 값은 import 시점에 읽히고 .env는 이미 지정된 변수를 덮어쓰지 않으므로, 여기서 먼저 지정하면 개발자 .env와 무관하게 동작
+_workdir = tempfile.mkdtemp(prefix="agent-tests-")
+os.environ.update({
+    "ANTHROPIC_API_KEY": "test",
+    "LLM_BACKEND": "fake",
+    "LLM_FAKE_TTFT_MS": "5",
+    "LLM_FAKE_TTFT_SIGMA": "0",
+    "LLM_FAKE_OUTPUT_TOKENS": "40",
+    "LLM_FAKE_TOKENS_PER_SECOND": "400",
+    "LLM_CACHE_ENABLED": "false",
+    "LLM_MAX_RETRIES": "1",
+    "LLM_RETRY_BASE_DELAY": "0.01",
+    "CURSOR_WORKSPACE_PATH": os.path.join(_workdir, "workspace"),
+    "CHECKPOINT_PATH": os.path.join(_workdir, "checkpoints", "checkpoints.sqlite3"),
+    "JOB_DB_PATH": os.path.join(_workdir, "checkpoints", "jobs.sqlite3"),
+    "LLM_CASSETTE_DIR": os.path.join(_workdir, "cassettes"),
+})
+os.makedirs(os.environ["CURSOR_WORKSPACE_PATH"], exist_ok=True)